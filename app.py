@@ -1,7 +1,23 @@
 import streamlit as st
-import pandas as pd
+import numpy as np
 import plotly.express as px
 import os
+from functools import partial
+
+import chart_data
+import mission_analytics
+import mission_data
+import mission_mmap
+import mission_timing
+import space_missions
+from dashboard_aggregates import DashboardAggregates, aggregate
+from filter_engine import FilterEngine, page_bounds, page_count
+from mission_cube import LiveCube
+
+# Per-stage timing of this rerun; a no-op unless SPACE_MISSIONS_TIMING is set.
+timing = mission_timing.start_run("app")
+plotly_chart = mission_timing.timed("st.plotly_chart")(st.plotly_chart)
+dataframe = mission_timing.timed("st.dataframe")(st.dataframe)
 
 # ---------------------------------------------------------------------------
 # Page configuration
@@ -16,18 +32,151 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "space_missions.csv")
+# A missions CSV, or a directory or glob of CSVs in the same schema.
+DATA_PATH = os.environ.get(
+    "SPACE_MISSIONS_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "space_missions.csv")
+)
+# When set, aggregates are built from the CSV in chunks of this many rows.
+CHUNK_SIZE = int(os.environ.get("SPACE_MISSIONS_CHUNK_SIZE", 0)) or None
+# Processes used to ingest multi-file sources; every core when unset.
+WORKERS = int(os.environ.get("SPACE_MISSIONS_WORKERS", 0)) or None
+# When set, the table is attached from a memory-mapped export shared by every replica on the host.
+SHARED = os.environ.get("SPACE_MISSIONS_MMAP", "") not in ("", "0")
+# Most points drawn per chart trace; longer series are binned or downsampled.
+POINT_BUDGET = int(os.environ.get("SPACE_MISSIONS_CHART_POINTS", 0)) or chart_data.POINT_BUDGET
+# Traces with more points than this are drawn with WebGL instead of SVG.
+WEBGL_THRESHOLD = int(os.environ.get("SPACE_MISSIONS_WEBGL_THRESHOLD", 0)) or chart_data.WEBGL_THRESHOLD
+
+
+@st.cache_resource(max_entries=1)
+def load_filter_engine(version: int) -> FilterEngine:
+    # Keyed on the dataset version, so appended rows are picked up without reparsing the CSV.
+    if CHUNK_SIZE:
+        load = mission_mmap.load_table if SHARED else mission_data.load_sources
+        return FilterEngine(load(DATA_PATH, WORKERS))
+    return FilterEngine(space_missions.get_dataset().frame)
+
+
+@st.cache_resource
+def load_mission_cube() -> LiveCube:
+    return LiveCube(DATA_PATH, CHUNK_SIZE, WORKERS)
+
+
+@st.cache_data(max_entries=256)
+def load_aggregates(filter_key: tuple, version: int) -> DashboardAggregates:
+    # KPIs and charts come from the pre-aggregated cube; raw rows only feed the table.
+    return load_mission_cube().current(space_missions.get_dataset()).aggregates(*filter_key)
+
+
+def selected_rows(engine: FilterEngine, filter_key: tuple, query: str) -> np.ndarray:
+    # The search index and the filter engine number rows the same way, in source order.
+    rows = engine.rows(*filter_key)
+    if query:
+        rows = np.intersect1d(rows, space_missions.searchMissions(query), assume_unique=True)
+    return rows
+
+
+@st.cache_data(max_entries=256)
+def load_search_aggregates(filter_key: tuple, query: str, version: int) -> DashboardAggregates:
+    # The cube has no text dimension, so a search is aggregated from the matching rows.
+    engine = load_filter_engine(version)
+    return aggregate(engine.frame.iloc[selected_rows(engine, filter_key, query)])
+
+
+@st.cache_data(max_entries=256)
+def load_chart_data(filter_key: tuple, query: str, version: int, binning: str) -> tuple:
+    # Per-launch charts need the filtered rows, so they are cached separately from the cube aggregates.
+    engine = load_filter_engine(version)
+    selected = engine.frame.iloc[selected_rows(engine, filter_key, query)]
+    failed = (selected["MissionStatus"] != "Success").to_numpy()
+    timeline = chart_data.timeline(selected["Date"], failed, filter_key[0], binning, POINT_BUDGET)
+    points = chart_data.launch_points(selected[["Date", "Price", "Company", "Rocket", "Mission"]], POINT_BUDGET)
+    return timeline, points
+
+
+@st.cache_resource
+def figure_cache() -> chart_data.FigureCache:
+    # Shared by every session: a figure is only rebuilt when the data it plots changes.
+    return chart_data.FigureCache()
+
+
+def missions_per_year_figure(data):
+    fig = px.line(data, x="Year", y="Missions", markers=True)
+    fig.update_layout(height=400, margin=dict(t=10))
+    return fig
+
+
+def status_figure(data):
+    fig = px.pie(data, values="Count", names="Status", hole=0.4)
+    fig.update_layout(height=400, margin=dict(t=10))
+    return fig
+
+
+def top_companies_figure(data):
+    fig = px.bar(data, x="Missions", y="Company", orientation="h")
+    fig.update_layout(height=400, margin=dict(t=10), yaxis=dict(autorange="reversed"))
+    return fig
 
 
-@st.cache_data
-def load_data() -> pd.DataFrame:
-    df = pd.read_csv(DATA_PATH)
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-    df["Year"] = df["Date"].dt.year.astype("Int64")
-    return df
+def success_rates_figure(data):
+    fig = px.bar(
+        data.rename(columns={"Missions": "Total Missions"}), x="Company", y="Success Rate (%)",
+        hover_data=["Total Missions"],
+        color="Success Rate (%)",
+        color_continuous_scale="greens",
+    )
+    fig.update_layout(height=400, margin=dict(t=10))
+    return fig
+
+
+def top_rockets_figure(data):
+    fig = px.bar(data, x="Launches", y="Rocket", orientation="h")
+    fig.update_layout(height=400, margin=dict(t=10), yaxis=dict(autorange="reversed"))
+    return fig
+
+
+def timeline_figure(data):
+    fig = px.line(data, x="Date", y=["Launches", "Failures"],
+                  render_mode=chart_data.render_mode(len(data), WEBGL_THRESHOLD))
+    fig.update_layout(height=400, margin=dict(t=10), legend_title_text="", yaxis_title="Launches")
+    return fig
+
+
+def launch_points_figure(data):
+    fig = px.scatter(data, x="Date", y="Price", hover_data=["Company", "Rocket", "Mission"],
+                     render_mode=chart_data.render_mode(len(data), WEBGL_THRESHOLD))
+    fig.update_layout(height=400, margin=dict(t=10), yaxis_title="Price (million USD)")
+    return fig
+
+
+def rolling_rates_figure(data):
+    fig = px.line(data, x="Year", y="Success Rate (%)", color="Company")
+    fig.update_layout(height=400, margin=dict(t=10), yaxis=dict(range=[0, 105]))
+    return fig
 
 
-df = load_data()
+def family_launches_figure(data):
+    fig = px.line(data, x="Year", y="Launches", color="Family")
+    fig.update_layout(height=400, margin=dict(t=10), yaxis_title="Launches to date")
+    return fig
+
+
+def site_utilization_figure(data):
+    fig = px.imshow(data, aspect="auto", color_continuous_scale="blues", labels=dict(x="Year", y="", color="Launches"))
+    fig.update_layout(height=500, margin=dict(t=10))
+    return fig
+
+
+def export_csv(rows, sort_column: str, ascending: bool, columns: list, version: int) -> bytes:
+    engine = load_filter_engine(version)
+    return engine.frame.iloc[engine.sorted_rows(rows, sort_column, ascending)][columns].to_csv(index=False).encode()
+
+
+timing.stage("load")
+# Touching the index ingests any rows appended to the CSV since the last rerun.
+index = space_missions.get_index()
+version = space_missions.get_dataset().version
+engine = load_filter_engine(version)
 
 # ---------------------------------------------------------------------------
 # Title
@@ -38,49 +187,46 @@ st.markdown("Interactive exploration of every orbital launch from **1957** onwar
 # ---------------------------------------------------------------------------
 # Sidebar – interactive filters
 # ---------------------------------------------------------------------------
+timing.stage("sidebar")
 st.sidebar.header("Filters")
 
+# Free-text search, answered from the prebuilt index (space_missions.searchMissions)
+search = st.sidebar.text_input("Search", placeholder="Mission, rocket or location")
+query = " ".join(search.lower().split())
+
 # Year range
-min_year = int(df["Year"].min())
-max_year = int(df["Year"].max())
+min_year = index.first_year
+max_year = index.last_year
 year_range = st.sidebar.slider("Year Range", min_year, max_year, (min_year, max_year))
 
 # Company
-all_companies = sorted(df["Company"].unique().tolist())
+all_companies = sorted(index.company_counts)
 selected_companies = st.sidebar.multiselect("Company", all_companies, default=[])
 
 # Mission status
-all_statuses = sorted(df["MissionStatus"].dropna().unique().tolist())
+all_statuses = sorted(index.status_counts)
 selected_statuses = st.sidebar.multiselect("Mission Status", all_statuses, default=[])
 
 # Rocket status
-all_rocket_statuses = sorted(df["RocketStatus"].dropna().unique().tolist())
+all_rocket_statuses = engine.values("RocketStatus")
 selected_rocket_status = st.sidebar.multiselect("Rocket Status", all_rocket_statuses, default=[])
 
-# Apply filters
-filtered = df.copy()
-filtered = filtered[(filtered["Year"] >= year_range[0]) & (filtered["Year"] <= year_range[1])]
-if selected_companies:
-    filtered = filtered[filtered["Company"].isin(selected_companies)]
-if selected_statuses:
-    filtered = filtered[filtered["MissionStatus"].isin(selected_statuses)]
-if selected_rocket_status:
-    filtered = filtered[filtered["RocketStatus"].isin(selected_rocket_status)]
+# Apply filters (memoized row-index intersection, no full-frame copy)
+timing.stage("filter")
+filter_key = FilterEngine.key(year_range, selected_companies, selected_statuses, selected_rocket_status)
+rows = selected_rows(engine, filter_key, query)
+timing.stage("aggregate")
+agg = load_search_aggregates(filter_key, query, version) if query else load_aggregates(filter_key, version)
 
 # ---------------------------------------------------------------------------
 # Summary statistics (KPIs)
 # ---------------------------------------------------------------------------
+timing.stage("kpis")
 col1, col2, col3, col4 = st.columns(4)
-total = len(filtered)
-successes = int((filtered["MissionStatus"] == "Success").sum())
-rate = round(successes / total * 100, 2) if total > 0 else 0.0
-unique_companies = filtered["Company"].nunique()
-unique_rockets = filtered["Rocket"].nunique()
-
-col1.metric("Total Missions", f"{total:,}")
-col2.metric("Success Rate", f"{rate}%")
-col3.metric("Unique Companies", unique_companies)
-col4.metric("Unique Rockets", unique_rockets)
+col1.metric("Total Missions", f"{agg.total:,}")
+col2.metric("Success Rate", f"{agg.success_rate}%")
+col3.metric("Unique Companies", agg.unique_companies)
+col4.metric("Unique Rockets", agg.unique_rockets)
 
 st.divider()
 
@@ -93,6 +239,8 @@ st.divider()
 # commercial launch providers like SpaceX. Markers on each data point make
 # individual years easy to inspect via hover.
 # ---------------------------------------------------------------------------
+timing.stage("charts")
+figures = figure_cache()
 chart1, chart2 = st.columns(2)
 
 with chart1:
@@ -101,10 +249,7 @@ with chart1:
         "**Line chart** — ideal for time-series data. It reveals the Cold War peak, "
         "the 1990s decline, and the recent commercial-space surge."
     )
-    yearly = filtered.groupby("Year").size().reset_index(name="Missions")
-    fig1 = px.line(yearly, x="Year", y="Missions", markers=True)
-    fig1.update_layout(height=400, margin=dict(t=10))
-    st.plotly_chart(fig1, use_container_width=True)
+    plotly_chart(figures.figure("missions_per_year", agg.yearly, missions_per_year_figure), use_container_width=True)
 
 # ---------------------------------------------------------------------------
 # Visualization 2 – Mission Status Distribution  (Donut Chart)
@@ -119,11 +264,7 @@ with chart2:
         "**Donut chart** — shows proportions of a whole at a glance. With only 4 "
         "status categories the chart stays readable and highlights overall success dominance."
     )
-    status_counts = filtered["MissionStatus"].value_counts().reset_index()
-    status_counts.columns = ["Status", "Count"]
-    fig2 = px.pie(status_counts, values="Count", names="Status", hole=0.4)
-    fig2.update_layout(height=400, margin=dict(t=10))
-    st.plotly_chart(fig2, use_container_width=True)
+    plotly_chart(figures.figure("status", agg.status_counts, status_figure), use_container_width=True)
 
 # ---------------------------------------------------------------------------
 # Visualization 3 – Top 10 Companies  (Horizontal Bar Chart)
@@ -140,11 +281,7 @@ with chart3:
         "**Horizontal bar chart** — perfect for ranking categories with long labels. "
         "Sorted bars make comparisons instant."
     )
-    top_companies = filtered["Company"].value_counts().head(10).reset_index()
-    top_companies.columns = ["Company", "Missions"]
-    fig3 = px.bar(top_companies, x="Missions", y="Company", orientation="h")
-    fig3.update_layout(height=400, margin=dict(t=10), yaxis=dict(autorange="reversed"))
-    st.plotly_chart(fig3, use_container_width=True)
+    plotly_chart(figures.figure("top_companies", agg.top_companies, top_companies_figure), use_container_width=True)
 
 # ---------------------------------------------------------------------------
 # Visualization 4 – Success Rate by Top Companies  (Bar Chart with Color)
@@ -161,25 +298,7 @@ with chart4:
         "**Bar chart with color scale** — compares reliability across companies. "
         "Hover shows mission count for statistical context."
     )
-    top10_names = filtered["Company"].value_counts().head(10).index.tolist()
-    rates = []
-    for c in top10_names:
-        c_df = filtered[filtered["Company"] == c]
-        s = int((c_df["MissionStatus"] == "Success").sum())
-        rates.append({
-            "Company": c,
-            "Success Rate (%)": round(s / len(c_df) * 100, 2),
-            "Total Missions": len(c_df),
-        })
-    rates_df = pd.DataFrame(rates)
-    fig4 = px.bar(
-        rates_df, x="Company", y="Success Rate (%)",
-        hover_data=["Total Missions"],
-        color="Success Rate (%)",
-        color_continuous_scale="greens",
-    )
-    fig4.update_layout(height=400, margin=dict(t=10))
-    st.plotly_chart(fig4, use_container_width=True)
+    plotly_chart(figures.figure("success_rates", agg.top_companies, success_rates_figure), use_container_width=True)
 
 # ---------------------------------------------------------------------------
 # Visualization 5 – Top 10 Rockets  (Horizontal Bar Chart)
@@ -193,18 +312,147 @@ st.caption(
     "**Horizontal bar chart** — highlights the workhorses of space exploration. "
     "Long rocket model names stay readable with horizontal orientation."
 )
-top_rockets = filtered["Rocket"].value_counts().head(10).reset_index()
-top_rockets.columns = ["Rocket", "Launches"]
-fig5 = px.bar(top_rockets, x="Launches", y="Rocket", orientation="h")
-fig5.update_layout(height=400, margin=dict(t=10), yaxis=dict(autorange="reversed"))
-st.plotly_chart(fig5, use_container_width=True)
+plotly_chart(figures.figure("top_rockets", agg.top_rockets, top_rockets_figure), use_container_width=True)
+
+# ---------------------------------------------------------------------------
+# Visualization 6 – Launch Timeline  (Line Chart, binned)
+# ---------------------------------------------------------------------------
+# WHY: Yearly totals hide seasonality and launch campaigns. Binning by day,
+# month or year — the finest that fits the point budget for the selected
+# range — shows them without sending one point per launch to the browser.
+# ---------------------------------------------------------------------------
+chart6, chart7 = st.columns(2)
+
+with chart6:
+    st.subheader("Launch Timeline")
+    st.caption(
+        "**Binned line chart** — launches and failures per day, month or year. "
+        "Auto picks the finest bin that fits the selected year range."
+    )
+    bin_choice = st.selectbox("Bin", ["auto", "day", "month", "year"], key="timeline_bin")
+    timeline_df, points_df = load_chart_data(filter_key, query, version, None if bin_choice == "auto" else bin_choice)
+    plotly_chart(figures.figure("timeline", timeline_df, timeline_figure), use_container_width=True)
+
+# ---------------------------------------------------------------------------
+# Visualization 7 – Cost per Launch  (Scatter Plot, downsampled)
+# ---------------------------------------------------------------------------
+# WHY: A scatter of individual launches shows how launch prices spread and
+# fall over time, which averages would flatten. Above the point budget the
+# series is downsampled (LTTB) so outliers and trends survive, and large
+# traces switch to WebGL to stay responsive.
+# ---------------------------------------------------------------------------
+with chart7:
+    st.subheader("Cost per Launch")
+    st.caption(
+        "**Scatter plot** — one point per priced launch (million USD), "
+        f"downsampled to at most {POINT_BUDGET:,} points."
+    )
+    plotly_chart(figures.figure("launch_points", points_df, launch_points_figure), use_container_width=True)
 
 st.divider()
 
 # ---------------------------------------------------------------------------
-# Data Table – sortable by clicking column headers
+# Trends – rolling success rates, rocket families and launch sites
+# ---------------------------------------------------------------------------
+# These panels follow the year range and company filters only; they are
+# read from the year x company, family and site matrices of
+# mission_analytics.py, so no rows are regrouped on a rerun.
+# ---------------------------------------------------------------------------
+timing.stage("trends")
+analytics = space_missions.get_analytics()
+first_year, last_year = year_range
+
+# ---------------------------------------------------------------------------
+# Visualization 8 – Rolling Success Rate  (Multi-line Chart)
 # ---------------------------------------------------------------------------
+# WHY: A company's lifetime success rate hides how it got there. A rolling
+# window shows reliability improving (or slipping) over a program's life,
+# and one line per company makes the comparison direct.
+# ---------------------------------------------------------------------------
+chart8, chart9 = st.columns(2)
+
+with chart8:
+    st.subheader("Rolling Success Rate")
+    st.caption(
+        "**Multi-line chart** — success rate over the trailing window, for the selected "
+        "companies or the five busiest in the year range."
+    )
+    window = st.slider("Window (years)", 1, 10, 5, key="rolling_window")
+    rate_companies = selected_companies or mission_analytics.top_labels(analytics.company_launches, 5, year_range)
+    rates = analytics.rolling_success_rates(window, rate_companies).loc[first_year:last_year]
+    rates_long = rates.reset_index().melt("Year", var_name="Company", value_name="Success Rate (%)").dropna()
+    plotly_chart(figures.figure("rolling_rates", rates_long, rolling_rates_figure), use_container_width=True)
+
+# ---------------------------------------------------------------------------
+# Visualization 9 – Cumulative Launches by Rocket Family  (Multi-line Chart)
+# ---------------------------------------------------------------------------
+# WHY: Grouping variants into families (every Falcon 9 block, every Soyuz
+# upper stage) shows which launcher lines carried the most missions and when
+# each one took over; cumulative curves make the crossover points visible.
+# ---------------------------------------------------------------------------
+with chart9:
+    st.subheader("Cumulative Launches by Rocket Family")
+    st.caption(
+        "**Multi-line chart** — launches to date of the eight busiest rocket families in the "
+        "year range, counting every variant of each family."
+    )
+    families = mission_analytics.top_labels(analytics.family_launches, 8, year_range)
+    cumulative = analytics.cumulative_family_launches(families).loc[first_year:last_year]
+    cumulative_long = cumulative.reset_index().melt("Year", var_name="Family", value_name="Launches")
+    plotly_chart(figures.figure("family_launches", cumulative_long, family_launches_figure), use_container_width=True)
+
+# ---------------------------------------------------------------------------
+# Visualization 10 – Launch-Site Utilization  (Heatmap)
+# ---------------------------------------------------------------------------
+# WHY: A site x year heatmap shows at a glance which pads were busy in which
+# era — Baikonur and Plesetsk during the Cold War, Cape Canaveral and
+# Jiuquan today — which a ranked bar chart of totals cannot.
+# ---------------------------------------------------------------------------
+st.subheader("Launch-Site Utilization")
+st.caption("**Heatmap** — launches per year at the fifteen busiest sites in the year range.")
+sites = mission_analytics.top_labels(analytics.site_launches, 15, year_range)
+utilization = analytics.site_utilization()[sites].loc[first_year:last_year].T
+plotly_chart(figures.figure("site_utilization", utilization, site_utilization_figure), use_container_width=True)
+
+st.divider()
+
+# ---------------------------------------------------------------------------
+# Data Table – server-side sorted and paginated
+# ---------------------------------------------------------------------------
+# Only the visible page is sent to the browser; the full filtered export is
+# generated on demand when the download button is clicked.
+# ---------------------------------------------------------------------------
+timing.stage("table")
 st.subheader("Mission Data")
-st.caption("Click any column header to sort. Use the sidebar filters to narrow down results.")
+st.caption("Choose a sort column and page through the results. Use the sidebar filters to narrow down results.")
 display_cols = ["Company", "Location", "Date", "Rocket", "Mission", "RocketStatus", "Price", "MissionStatus"]
-st.dataframe(filtered[display_cols], use_container_width=True, height=500)
+
+ctl1, ctl2, ctl3, ctl4 = st.columns(4)
+sort_column = ctl1.selectbox("Sort by", display_cols, index=display_cols.index("Date"))
+ascending = ctl2.radio("Order", ["Ascending", "Descending"], horizontal=True) == "Ascending"
+page_size = ctl3.selectbox("Rows per page", [25, 50, 100, 250, 500], index=2)
+page = ctl4.number_input("Page", min_value=1, max_value=page_count(len(rows), page_size), value=1, step=1)
+
+start, stop = page_bounds(len(rows), page, page_size)
+st.caption(f"Showing rows {min(start + 1, stop):,}–{stop:,} of {len(rows):,}")
+dataframe(
+    engine.page(rows, page, page_size, sort_column, ascending)[display_cols],
+    use_container_width=True, hide_index=True,
+)
+st.download_button(
+    "Download filtered data (CSV)",
+    data=partial(export_csv, rows, sort_column, ascending, display_cols, version),
+    file_name="space_missions_filtered.csv",
+    mime="text/csv",
+    on_click="ignore",
+)
+
+# ---------------------------------------------------------------------------
+# Debug panel – per-stage latency of the last reruns (SPACE_MISSIONS_TIMING=1)
+# ---------------------------------------------------------------------------
+record = timing.finish()
+if record is not None:
+    with st.sidebar.expander(f"Timings (ms), last {mission_timing.RUNS} reruns"):
+        st.dataframe(mission_timing.stage_table(), use_container_width=True, hide_index=True)
+        st.caption("Calls in this rerun, by stage")
+        st.dataframe(mission_timing.span_table(record), use_container_width=True, hide_index=True)
@@ -0,0 +1,98 @@
+"""
+Startup benchmark: interpreter start, imports and first answer of space_missions.py.
+
+    python benchmarks/bench_import.py [--scale N] [--repeat R]
+
+Each scenario runs in a fresh ``python -X importtime`` process against a
+temporary copy of the data (``--scale`` times the shipped CSV, see
+synthetic_missions.py) and reports the median wall time of the whole
+process, the import time reported by ``-X importtime`` and whether pandas
+was imported. A count with a fresh snapshot is answered from
+``<name>.snapshot.json`` without pandas; without one (deleted before every
+run) the table is loaded from its Parquet sidecar, as is always the case for
+a date-range query.
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import ROOT, SOURCE, write_scaled
+
+import mission_snapshot
+import space_missions
+
+_REPORT = "import sys; print('pandas' in sys.modules)"
+
+SCENARIOS = {
+    "python only": ("", False),
+    "import pandas": ("import pandas", False),
+    "import space_missions": ("import space_missions", False),
+    "count, fresh snapshot": ("import space_missions; space_missions.getMissionCountByCompany('NASA')", False),
+    "count, no snapshot": ("import space_missions; space_missions.getMissionCountByCompany('NASA')", True),
+    "date range": ("import space_missions; space_missions.getMissionsByDateRange('1969-07-01', '1969-07-31')", False),
+}
+
+
+def _import_time(stderr: str) -> float:
+    """Total cumulative microseconds of the top-level imports in ``-X importtime`` output."""
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.endswith("imported package"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # nested imports are indented by two spaces per level
+            total += int(cumulative)
+    return total
+
+
+def run_scenario(code: str, csv_path: str, drop_snapshot: bool, repeat: int) -> dict:
+    env = dict(os.environ, SPACE_MISSIONS_PATH=csv_path, SPACE_MISSIONS_BACKEND="pandas")
+    walls, imports = [], []
+    for _ in range(repeat):
+        if drop_snapshot:
+            mission_snapshot.discard(csv_path)
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"{code}\n{_REPORT}"],
+                                cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+        walls.append(time.perf_counter() - start)
+        imports.append(_import_time(result.stderr))
+    return {
+        "wall": statistics.median(walls),
+        "imports": statistics.median(imports) / 1e6,
+        "pandas": result.stdout.strip() == "True",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(workdir, "missions.csv")
+        if args.scale == 1:
+            shutil.copy(SOURCE, csv_path)
+        else:
+            write_scaled(csv_path, args.scale)
+        # Writes the Parquet sidecar and the snapshot, as any earlier load would have.
+        space_missions.MissionDataset(csv_path).index
+
+        print(f"{'scenario':<24}{'wall':>10}{'imports':>10}  pandas")
+        for name, (code, drop_snapshot) in SCENARIOS.items():
+            result = run_scenario(code, csv_path, drop_snapshot, args.repeat)
+            print(f"{name:<24}{result['wall'] * 1000:>7.1f} ms{result['imports'] * 1000:>7.1f} ms  "
+                  f"{'yes' if result['pandas'] else 'no'}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
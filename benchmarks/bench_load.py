@@ -0,0 +1,51 @@
+"""
+Cold-load benchmark: parsing space_missions.csv vs reading the columnar sidecar.
+
+    python benchmarks/bench_load.py [--scale N] [--repeat R]
+
+The default ``--scale 1`` times a copy of the shipped CSV; larger scales write
+a synthetic dataset N times its size (see synthetic_missions.py) to
+approximate larger feeds.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+
+from common import SOURCE, best_of, write_scaled
+
+import mission_data
+import mission_paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(workdir, "space_missions.csv")
+        if args.scale == 1:
+            shutil.copyfile(SOURCE, csv_path)
+        else:
+            write_scaled(csv_path, args.scale)
+        mission_data.write_sidecar(csv_path)
+
+        csv_time = best_of(lambda: mission_data.read_csv(csv_path), args.repeat)
+        sidecar_time = best_of(lambda: mission_data.read_sidecar(csv_path), args.repeat)
+        rows = len(mission_data.read_sidecar(csv_path))
+        print(f"rows:            {rows:,}")
+        print(f"csv size:        {os.path.getsize(csv_path) / 1e6:.2f} MB")
+        print(f"sidecar size:    {os.path.getsize(mission_paths.sidecar_path(csv_path)) / 1e6:.2f} MB")
+        print(f"csv parse:       {csv_time * 1000:.1f} ms")
+        print(f"sidecar read:    {sidecar_time * 1000:.1f} ms")
+        print(f"speedup:         {csv_time / sidecar_time:.1f}x")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
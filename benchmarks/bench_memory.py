@@ -0,0 +1,29 @@
+"""
+In-memory footprint of the missions table: raw CSV strings vs the typed schema.
+
+    python benchmarks/bench_memory.py
+"""
+
+import pandas as pd
+
+from common import SOURCE
+
+import mission_data
+
+
+def main() -> None:
+    raw = pd.read_csv(SOURCE)
+    raw["Date"] = pd.to_datetime(raw["Date"], errors="coerce")
+    typed = mission_data.read_csv(SOURCE)
+
+    before = raw.memory_usage(deep=True)
+    after = typed.memory_usage(deep=True)
+    print(f"{'column':<15}{'before':>12}{'after':>12}")
+    for col in before.index:
+        print(f"{col:<15}{before[col]:>12,}{after[col]:>12,}")
+    print(f"{'total':<15}{before.sum():>12,}{after.sum():>12,}")
+    print(f"reduction: {before.sum() / after.sum():.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Multi-file ingestion benchmark: serial vs process-pool loading of a directory of CSVs.
+
+    python benchmarks/bench_parallel.py [--scale N] [--split year|company] [--workers 1,2,4,8] [--repeat R]
+
+Writes a synthetic dataset ``--scale`` times the size of the shipped CSV (see
+synthetic_missions.py) as one CSV per launch year or per company, then times a
+cold ``MissionDataset`` load of the directory (parse, pre-aggregate, merge,
+index) for each worker count. Sidecars are deleted before every run, so each
+run parses every CSV. Speedups are relative to one worker, which reads the
+files serially in this process.
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+
+from common import SOURCE, row_count, time_call
+
+import space_missions
+import synthetic_missions
+
+
+def write_split(directory: str, scale: int, split: str, seed: int = 0) -> int:
+    """Write ``scale`` times the shipped row count as one CSV per year or company; return the file count."""
+    model = synthetic_missions.MissionModel.fit(SOURCE)
+    paths = set()
+    for chunk in model.generate(row_count(SOURCE) * scale, seed):
+        keys = chunk["Date"].str[:4] if split == "year" else chunk["Company"].str.replace(r"\W+", "_", regex=True)
+        for key, group in chunk.groupby(keys, sort=False):
+            path = os.path.join(directory, f"missions_{key}.csv")
+            new = path not in paths
+            paths.add(path)
+            group.to_csv(path, mode="w" if new else "a", header=new, index=False)
+    return len(paths)
+
+
+def _cold_load(directory: str, workers: int):
+    def run():
+        for sidecar in glob.glob(os.path.join(directory, "*.parquet")):
+            os.remove(sidecar)
+        space_missions.MissionDataset(directory, workers=workers).index
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=20)
+    parser.add_argument("--split", choices=["year", "company"], default="year")
+    parser.add_argument("--workers", help="comma-separated worker counts (default: powers of two up to the core count)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.workers:
+        counts = [int(w) for w in args.workers.split(",") if w.strip()]
+    else:
+        cores = os.cpu_count() or 1
+        counts = sorted({1, cores} | {2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores})
+
+    workdir = tempfile.mkdtemp()
+    try:
+        files = write_split(workdir, args.scale, args.split)
+        rows = row_count(SOURCE) * args.scale
+        print(f"rows:     {rows:,} in {files} files (one per {args.split}), {os.cpu_count()} cores")
+        baseline = None
+        for workers in counts:
+            median = time_call(_cold_load(workdir, workers), args.repeat)["median"]
+            baseline = baseline or median
+            print(f"workers {workers:>3}: {median * 1000:9.1f} ms   speedup {baseline / median:4.2f}x")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
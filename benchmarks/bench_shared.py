@@ -0,0 +1,106 @@
+"""
+Shared-table benchmark: private Parquet/CSV loads vs attaching the memory-mapped export.
+
+    python benchmarks/bench_shared.py [--scale N] [--processes P] [--repeat R]
+
+Writes a synthetic dataset ``--scale`` times the size of the shipped CSV (see
+synthetic_missions.py), then
+
+- times a warm start of each loader in this process: parsing the CSV,
+  reading the Parquet sidecar, and attaching the mapped export;
+- starts ``--processes`` processes that each load the table and touch every
+  column, and reports their memory from ``/proc/<pid>/smaps_rollup``. PSS
+  splits shared pages between the processes mapping them, so its total is
+  the physical memory the replicas use between them. Linux only.
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from common import time_call, write_scaled
+
+import mission_data
+import mission_mmap
+
+LOADERS = {
+    "csv": mission_data.read_csv,
+    "parquet": mission_data.load_table,
+    "mmap": mission_mmap.load_table,
+}
+
+
+def _memory() -> dict:
+    """Rss, Pss and private bytes of this process, from smaps_rollup."""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as fh:
+        for line in fh:
+            key, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[key] = int(value.split()[0]) * 1024
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "private": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def _replica(loader: str, csv_path: str, barrier, results) -> None:
+    df = LOADERS[loader](csv_path)
+    pd.util.hash_pandas_object(df)  # read every column, as a dashboard rerun would
+    barrier.wait()  # measure while every replica holds its table
+    results.put(_memory())
+    barrier.wait()
+
+
+def measure_replicas(loader: str, csv_path: str, processes: int) -> dict:
+    """Total memory of ``processes`` concurrent replicas using ``loader``."""
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(processes)
+    results = context.Queue()
+    workers = [context.Process(target=_replica, args=(loader, csv_path, barrier, results)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    samples = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    return {key: sum(sample[key] for sample in samples) for key in samples[0]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=20)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(workdir, "missions.csv")
+        write_scaled(csv_path, args.scale)
+        mission_data.write_sidecar(csv_path)
+        mission_mmap.write_mapped(csv_path)
+        print(f"rows:     {len(mission_data.load_table(csv_path)):,}")
+
+        print(f"{'loader':<10}{'warm start':>14}")
+        for name, load in LOADERS.items():
+            median = time_call(lambda: load(csv_path), args.repeat)["median"]
+            print(f"{name:<10}{median * 1000:>11.1f} ms")
+
+        if not os.path.exists("/proc/self/smaps_rollup"):
+            print("memory:   skipped (needs /proc/<pid>/smaps_rollup)")
+            return
+        print(f"\n{args.processes} replicas{'rss':>14}{'pss':>12}{'private':>12}   (MiB, summed)")
+        for name in ("parquet", "mmap"):
+            total = measure_replicas(name, csv_path, args.processes)
+            print(f"{name:<10}  " + "".join(f"{total[key] / 2 ** 20:>12.1f}" for key in ("rss", "pss", "private")))
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Shared helpers for the standalone benchmark scripts.
+"""
+
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(ROOT, "space_missions.csv")
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import synthetic_missions  # noqa: E402
+
+
+def time_call(fn, repeat: int = 1) -> dict:
+    """Run ``fn`` ``repeat`` times and summarize the wall-clock timings in seconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {"median": statistics.median(samples), "min": min(samples), "repeat": repeat}
+
+
+def best_of(fn, repeat: int) -> float:
+    return time_call(fn, repeat)["min"]
+
+
+def row_count(csv_path: str) -> int:
+    with open(csv_path) as fh:
+        return sum(1 for line in fh if line.strip()) - 1
+
+
+def write_scaled(path: str, scale: int, seed: int = 0) -> None:
+    """Write a synthetic dataset ``scale`` times the size of the shipped CSV into ``path``."""
+    model = synthetic_missions.MissionModel.fit(SOURCE)
+    synthetic_missions.write_csv(path, row_count(SOURCE) * scale, seed=seed, model=model)
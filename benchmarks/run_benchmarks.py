@@ -0,0 +1,224 @@
+"""
+Benchmark suite for space_missions.py and the dashboard data path.
+
+Times each of the eight query functions cold (right after ``clear_cache()``
+with the count snapshot deleted, so including the dataset load and index
+build), snapshot-cold (the same with the snapshot kept, as in a fresh
+process after an earlier load) and warm, the table loaders behind the
+dashboard, and every stage of the dashboard's rerun path.
+``load_data.append`` times ingesting ten rows appended to an already loaded
+CSV. Each benchmark runs against the shipped CSV and against synthetic datasets
+scaled up from it with synthetic_missions.py (fixed seed, so runs compare).
+
+    python benchmarks/run_benchmarks.py --scales 1,10,100 --output run.json
+    python benchmarks/run_benchmarks.py --compare baseline.json --output new.json
+    python benchmarks/run_benchmarks.py --backend sqlite --output sqlite.json
+
+Results are written as JSON so runs can be diffed; ``--compare`` reports
+every benchmark whose median got slower than ``--threshold`` times the
+baseline and exits non-zero if there are any.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from common import ROOT, SOURCE, time_call, write_scaled
+
+import numpy as np
+import pandas as pd
+
+import mission_data
+import mission_snapshot
+import space_missions
+from dashboard_aggregates import aggregate
+from filter_engine import FilterEngine
+from mission_cube import MissionCube, build_cube
+
+QUERIES = {
+    "getMissionCountByCompany": lambda: space_missions.getMissionCountByCompany("SpaceX"),
+    "getSuccessRate": lambda: space_missions.getSuccessRate("NASA"),
+    "getMissionsByDateRange": lambda: space_missions.getMissionsByDateRange("1990-01-01", "1999-12-31"),
+    "getTopCompaniesByMissionCount": lambda: space_missions.getTopCompaniesByMissionCount(10),
+    "getMissionStatusCount": lambda: space_missions.getMissionStatusCount(),
+    "getMissionsByYear": lambda: space_missions.getMissionsByYear(2020),
+    "getMostUsedRocket": lambda: space_missions.getMostUsedRocket(),
+    "getAverageMissionsPerYear": lambda: space_missions.getAverageMissionsPerYear(1990, 2020),
+}
+
+FILTERS = ((1990, 2020), ("CASC", "NASA", "SpaceX"), ("Success",), ())
+
+
+def _cold(fn, csv_path: str, keep_snapshot: bool = False):
+    """``fn`` after ``clear_cache()`` and, unless ``keep_snapshot``, without the count snapshot."""
+    def run():
+        space_missions.clear_cache()
+        if not keep_snapshot:
+            mission_snapshot.discard(csv_path)
+        fn()
+    return run
+
+
+def _append(csv_path: str, rows: int = 10):
+    """Append ``rows`` copies of the CSV's last line to a copy of it; return (timed fn, cleanup)."""
+    path = csv_path + ".append.csv"
+    shutil.copyfile(csv_path, path)
+    with open(path, "rb") as fh:
+        fh.seek(max(os.path.getsize(path) - 4096, 0))
+        last = fh.read().rstrip(b"\r\n").splitlines()[-1]
+    dataset = space_missions.MissionDataset(path)
+    dataset.index
+
+    def run():
+        with open(path, "ab") as fh:
+            fh.write(b"\n" + b"\n".join([last] * rows))
+        dataset.index
+    return run, lambda: os.remove(path)
+
+
+def bench_dataset(csv_path: str, cold_repeat: int, warm_repeat: int) -> list:
+    """All benchmarks for one CSV; returns result records without the dataset label."""
+    results = []
+
+    def record(name, mode, fn, repeat):
+        results.append({"name": name, "mode": mode, **time_call(fn, repeat)})
+
+    mission_data.write_sidecar(csv_path)
+    record("load_data.csv", "cold", lambda: mission_data.read_csv(csv_path), cold_repeat)
+    record("load_data.sidecar", "cold", lambda: mission_data.load_table(csv_path), cold_repeat)
+    append, cleanup = _append(csv_path)
+    record("load_data.append", "warm", append, cold_repeat)
+    cleanup()
+
+    space_missions.set_data_path(csv_path)
+    for name, query in QUERIES.items():
+        record(name, "cold", _cold(query, csv_path), cold_repeat)
+        record(name, "snapshot", _cold(query, csv_path, keep_snapshot=True), cold_repeat)
+        query()
+        record(name, "warm", query, warm_repeat)
+
+    frame = mission_data.load_table(csv_path)
+    record("dashboard.filter_engine_build", "cold", lambda: FilterEngine(frame), cold_repeat)
+    record("dashboard.cube_build", "cold", lambda: build_cube(frame), cold_repeat)
+
+    engine = FilterEngine(frame, cache_size=0)
+    cube = MissionCube(build_cube(frame))
+    rows = engine.rows(*FILTERS)
+    record("dashboard.filter_rows", "warm", lambda: engine.rows(*FILTERS), warm_repeat)
+    record("dashboard.aggregate_rows", "warm", lambda: aggregate(engine.view(*FILTERS)), warm_repeat)
+    record("dashboard.aggregate_cube", "warm", lambda: cube.aggregates(*FILTERS), warm_repeat)
+    record("dashboard.table_page", "warm", lambda: engine.page(rows, 1, 100, "Date"), warm_repeat)
+
+    def rerun():
+        page_rows = engine.rows(*FILTERS)
+        cube.aggregates(*FILTERS)
+        engine.page(page_rows, 1, 100, "Date")
+
+    record("dashboard.rerun", "warm", rerun, warm_repeat)
+    return results
+
+
+def _git_revision() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return out.stdout.strip()
+
+
+def run(scales, cold_repeat: int, warm_repeat: int) -> dict:
+    workdir = tempfile.mkdtemp()
+    results = []
+    try:
+        for scale in scales:
+            csv_path = os.path.join(workdir, f"space_missions_x{scale}.csv")
+            if scale == 1:
+                shutil.copyfile(SOURCE, csv_path)
+            else:
+                write_scaled(csv_path, scale)
+            rows = len(mission_data.read_csv(csv_path))
+            dataset = "shipped" if scale == 1 else f"x{scale}"
+            print(f"[{dataset}] {rows:,} rows", file=sys.stderr)
+            for record in bench_dataset(csv_path, cold_repeat, warm_repeat):
+                results.append({"dataset": dataset, "rows": rows, **record})
+    finally:
+        space_missions.set_data_path(space_missions._DATA_PATH)
+        shutil.rmtree(workdir)
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "backend": space_missions._BACKEND,
+        },
+        "results": results,
+    }
+
+
+def _key(record: dict) -> tuple:
+    return record["dataset"], record["name"], record["mode"]
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """Records whose median is more than ``threshold`` times the baseline's."""
+    before = {_key(r): r for r in baseline["results"]}
+    regressions = []
+    for record in current["results"]:
+        old = before.get(_key(record))
+        if old and old["median"] > 0 and record["median"] / old["median"] > threshold:
+            regressions.append((record, record["median"] / old["median"]))
+    return regressions
+
+
+def _print_summary(report: dict) -> None:
+    print(f"{'dataset':<9}{'benchmark':<34}{'mode':<10}{'median':>12}", file=sys.stderr)
+    for r in report["results"]:
+        print(f"{r['dataset']:<9}{r['name']:<34}{r['mode']:<10}{r['median'] * 1000:>10.3f}ms", file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="1,10,100", help="comma-separated scale factors, e.g. 1,10,100,1000")
+    parser.add_argument("--cold-repeat", type=int, default=3)
+    parser.add_argument("--warm-repeat", type=int, default=50)
+    parser.add_argument("--output", default="-", help="JSON output file ('-' for stdout)")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio reported as a regression")
+    parser.add_argument("--backend", choices=space_missions.BACKENDS, default="pandas",
+                        help="backend answering the query functions")
+    args = parser.parse_args()
+    space_missions.set_backend(args.backend)
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    report = run(scales, args.cold_repeat, args.warm_repeat)
+    _print_summary(report)
+
+    payload = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(payload)
+    else:
+        with open(args.output, "w") as fh:
+            fh.write(payload + "\n")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            regressions = compare(json.load(fh), report, args.threshold)
+        for record, ratio in regressions:
+            print(f"REGRESSION {record['dataset']} {record['name']} ({record['mode']}): {ratio:.2f}x slower",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
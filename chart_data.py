@@ -0,0 +1,145 @@
+"""
+Chart data for the dashboard, bounded by a point budget however many rows are selected.
+
+- ``timeline``: launches and failures per day, month or year. ``choose_bin``
+  picks the finest bin whose count over the selected year range fits the
+  budget; a finer bin chosen by hand is thinned with ``lttb``.
+- ``launch_points``: one point per priced launch, thinned with ``lttb`` over
+  the launch dates when there are more than the budget.
+- ``render_mode``: Plotly Express renders with WebGL (``scattergl``) above a
+  point threshold instead of SVG.
+- ``FigureCache``: built figures in a bounded LRU keyed on a hash of the
+  data they plot, so an unchanged chart is not rebuilt on a rerun.
+
+Because the figure cache is keyed on the plotted data rather than the sidebar
+filters, filter combinations that give the same chart data share one figure.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+POINT_BUDGET = 2000
+WEBGL_THRESHOLD = 1000
+
+# Bin name -> numpy datetime unit.
+BINS = {"day": "D", "month": "M", "year": "Y"}
+
+
+def lttb(x: np.ndarray, y: np.ndarray, budget: int) -> np.ndarray:
+    """Positions of at most ``budget`` points that keep the shape of the series (x ascending).
+
+    Largest-Triangle-Three-Buckets: the first and last points are kept, the
+    rest are split into ``budget - 2`` buckets, and from each bucket the point
+    forming the largest triangle with the previously kept point and the mean
+    of the next bucket is kept.
+    """
+    n = len(x)
+    if budget >= n or n <= 2:
+        return np.arange(n)
+    if budget < 3:
+        return np.array([0, n - 1])[:max(budget, 0)]
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, budget - 1).astype(np.int64)
+    kept = np.empty(budget, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(budget - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_lo, next_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[next_lo:max(next_hi, next_lo + 1)].mean()
+        next_y = y[next_lo:max(next_hi, next_lo + 1)].mean()
+        area = np.abs((x[a] - next_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y - y[a]))
+        a = lo + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def choose_bin(year_range, budget: int = POINT_BUDGET) -> str:
+    """The finest of day, month and year whose bins over ``year_range`` fit in ``budget``."""
+    years = int(year_range[1]) - int(year_range[0]) + 1
+    if years * 366 <= budget:
+        return "day"
+    if years * 12 <= budget:
+        return "month"
+    return "year"
+
+
+def timeline(dates: pd.Series, failed: np.ndarray, year_range, binning: str = None,
+             budget: int = POINT_BUDGET) -> pd.DataFrame:
+    """Launches and failures per bin over ``year_range``, empty bins included.
+
+    ``binning`` ("day", "month" or "year") defaults to ``choose_bin``; a finer
+    one whose series exceeds the budget is downsampled with ``lttb`` on the
+    launch counts.
+    """
+    unit = BINS[binning or choose_bin(year_range, budget)]
+    start = np.datetime64(f"{int(year_range[0]):04d}-01-01").astype(f"datetime64[{unit}]")
+    stop = np.datetime64(f"{int(year_range[1]) + 1:04d}-01-01").astype(f"datetime64[{unit}]")
+    bins = np.arange(start, stop)
+
+    values = dates.to_numpy(dtype="datetime64[us]")
+    dated = ~np.isnat(values)
+    slots = (values[dated].astype(f"datetime64[{unit}]") - start).astype(np.int64)
+    inside = (slots >= 0) & (slots < len(bins))
+    slots = slots[inside]
+    launches = np.bincount(slots, minlength=len(bins))
+    failures = np.bincount(slots, weights=np.asarray(failed)[dated][inside], minlength=len(bins)).astype(np.int64)
+
+    table = pd.DataFrame({"Date": bins.astype("datetime64[us]"), "Launches": launches, "Failures": failures})
+    if len(table) > budget:
+        table = table.iloc[lttb(bins.astype(np.int64), launches, budget)].reset_index(drop=True)
+    return table
+
+
+def launch_points(rows: pd.DataFrame, budget: int = POINT_BUDGET) -> pd.DataFrame:
+    """Dated, priced launches ordered by date, downsampled to ``budget`` with ``lttb`` on price."""
+    points = rows[rows["Date"].notna() & rows["Price"].notna()]
+    points = points.sort_values("Date", kind="stable").reset_index(drop=True)
+    if len(points) > budget:
+        keep = lttb(points["Date"].to_numpy().astype(np.int64), points["Price"].to_numpy(), budget)
+        points = points.iloc[keep].reset_index(drop=True)
+    return points
+
+
+def render_mode(points: int, threshold: int = WEBGL_THRESHOLD) -> str:
+    """Plotly Express ``render_mode`` for a trace of ``points`` points."""
+    return "webgl" if points > threshold else "svg"
+
+
+def data_key(data: pd.DataFrame) -> str:
+    """Content hash of a chart's data: columns, dtypes, index and values."""
+    digest = hashlib.sha1(repr([(str(c), str(t)) for c, t in data.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """Built figures keyed on (chart name, hash of the plotted data), least recently used evicted first.
+
+    Figures are shared between callers and must not be modified once built.
+    """
+
+    def __init__(self, cache_size: int = 128):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def figure(self, name: str, data: pd.DataFrame, build):
+        """The figure ``build(data)`` for chart ``name``, reused while ``data`` is unchanged."""
+        key = (name, data_key(data))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        figure = build(data)
+        with self._lock:
+            self._cache[key] = figure
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return figure
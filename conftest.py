@@ -0,0 +1,97 @@
+"""
+Shared pytest fixtures.
+"""
+
+import pytest
+
+import mission_data
+import space_missions
+
+
+def _shipped_lines():
+    with open(space_missions._DATA_PATH) as fh:
+        return fh.read().splitlines()
+
+
+class GrowingCsv:
+    """A temporary CSV holding rows of the shipped one, which tests append to or rewrite."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.header, *self.rows = _shipped_lines()
+
+    def write(self, rows: int):
+        """Rewrite the CSV with the first ``rows`` shipped rows."""
+        with open(self.path, "w") as fh:
+            fh.write("\n".join([self.header] + self.rows[:rows]) + "\n")
+
+    def append(self, lines):
+        with open(self.path, "a") as fh:
+            fh.write("\n".join(lines) + "\n")
+
+    def follow_appends_and_reloads(self, live_class, check):
+        """Drive a ``mission_dataset.LiveDerived`` through an append and a rewrite of the CSV.
+
+        The CSV starts with 4,000 rows, gets the rest appended, then is
+        rewritten to its first 100 rows. After each change
+        ``check(value, frame)`` receives the live value and the dataset's frame.
+        """
+        self.write(4_000)
+        dataset = space_missions.MissionDataset(self.path)
+        live = live_class(self.path)
+        dataset.index
+        live.current(dataset)
+
+        self.append(self.rows[4_000:])
+        dataset.index
+        check(live.current(dataset), dataset.frame)
+        assert live.version == dataset.version
+
+        self.write(100)
+        dataset.index
+        assert len(dataset.frame) == 100
+        check(live.current(dataset), dataset.frame)
+
+
+@pytest.fixture(params=space_missions.BACKENDS)
+def backend(request, monkeypatch):
+    """Run the test once per query backend of space_missions."""
+    monkeypatch.setattr(space_missions, "_BACKEND", request.param)
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def frame():
+    """The shipped CSV, parsed once; tests must not modify it."""
+    return mission_data.read_csv(space_missions._DATA_PATH)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """A copy of the shipped CSV in a temporary directory, so derived files are written there."""
+    path = tmp_path / "missions.csv"
+    with open(space_missions._DATA_PATH, "rb") as fh:
+        path.write_bytes(fh.read())
+    return str(path)
+
+
+@pytest.fixture
+def growing_csv(tmp_path):
+    """A ``GrowingCsv`` at ``tmp_path / "missions.csv"``; nothing is written until the test does."""
+    return GrowingCsv(tmp_path / "missions.csv")
+
+
+@pytest.fixture
+def split_csv(tmp_path):
+    """Return ``split(files)``, which writes the shipped CSV as ``files`` CSVs in file order.
+
+    ``split`` returns the directory holding them.
+    """
+    def split(files):
+        header, *rows = _shipped_lines()
+        size = -(-len(rows) // files)
+        for i in range(files):
+            (tmp_path / f"missions_{i:03d}.csv").write_text("\n".join([header] + rows[i * size:(i + 1) * size]) + "\n")
+        return tmp_path
+
+    return split
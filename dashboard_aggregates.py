@@ -0,0 +1,93 @@
+"""
+Every KPI and chart dataset shown by the dashboard, computed in one pass.
+
+``aggregate`` groups the filtered rows once by (year, company, mission status,
+rocket); all KPIs and chart tables are then derived from that grouped count
+table, which is far smaller than the rows themselves. Nothing here depends on
+Streamlit, so the numbers can be unit-tested directly.
+"""
+
+from dataclasses import dataclass
+
+import pandas as pd
+
+TOP_N = 10
+
+
+@dataclass
+class DashboardAggregates:
+    total: int
+    successes: int
+    success_rate: float
+    unique_companies: int
+    unique_rockets: int
+    yearly: pd.DataFrame  # Year, Missions
+    status_counts: pd.DataFrame  # Status, Count
+    top_companies: pd.DataFrame  # Company, Missions, Successes, Success Rate (%)
+    top_rockets: pd.DataFrame  # Rocket, Launches
+
+
+def _rate(successes: int, total: int) -> float:
+    return round(successes / total * 100, 2) if total > 0 else 0.0
+
+
+def _ranked(counts: pd.Series, label: str, value: str) -> pd.DataFrame:
+    """Counts sorted descending with ties broken alphabetically, as a two-column frame."""
+    table = counts.rename_axis(label).reset_index(name=value)
+    table[label] = table[label].astype("str")
+    return table.sort_values([value, label], ascending=[False, True], kind="stable").reset_index(drop=True)
+
+
+def aggregate_counts(counts: pd.DataFrame) -> DashboardAggregates:
+    """Derive every dashboard number from a table of ``Missions`` counts.
+
+    ``counts`` has one row per (Year, Company, MissionStatus, Rocket) group
+    present in the data and a ``Missions`` column with the group's row count.
+    """
+    missions = counts["Missions"]
+    success = counts["MissionStatus"] == "Success"
+    total = int(missions.sum())
+    successes = int(missions[success].sum())
+
+    yearly = missions.groupby(counts["Year"]).sum().reset_index()
+    yearly["Year"] = yearly["Year"].astype("Int64")
+
+    status_counts = _ranked(missions.groupby(counts["MissionStatus"]).sum(), "Status", "Count")
+
+    companies = pd.DataFrame({
+        "Missions": missions.groupby(counts["Company"]).sum(),
+        "Successes": missions.where(success, 0).groupby(counts["Company"]).sum(),
+    })
+    top = _ranked(companies["Missions"], "Company", "Missions").head(TOP_N)
+    top["Successes"] = companies["Successes"].reindex(top["Company"]).to_numpy()
+    top["Success Rate (%)"] = [_rate(int(s), int(n)) for s, n in zip(top["Successes"], top["Missions"])]
+
+    rockets = missions.groupby(counts["Rocket"]).sum()
+    top_rockets = _ranked(rockets, "Rocket", "Launches").head(TOP_N)
+
+    return DashboardAggregates(
+        total=total,
+        successes=successes,
+        success_rate=_rate(successes, total),
+        unique_companies=len(companies),
+        unique_rockets=len(rockets),
+        yearly=yearly,
+        status_counts=status_counts,
+        top_companies=top,
+        top_rockets=top_rockets,
+    )
+
+
+def group_counts(frame: pd.DataFrame) -> pd.DataFrame:
+    """The single grouped pass over the rows that ``aggregate_counts`` consumes."""
+    keys = [frame["Date"].dt.year.rename("Year"), frame["Company"], frame["MissionStatus"], frame["Rocket"]]
+    counts = frame.groupby(keys, observed=True, dropna=False).size()
+    counts = counts[counts > 0].rename("Missions").reset_index()
+    for col in ["Company", "MissionStatus", "Rocket"]:
+        counts[col] = counts[col].astype("str")
+    return counts
+
+
+def aggregate(frame: pd.DataFrame) -> DashboardAggregates:
+    """All KPI values and chart datasets for a (filtered) missions frame."""
+    return aggregate_counts(group_counts(frame))
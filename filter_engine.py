@@ -0,0 +1,137 @@
+"""
+Index-backed evaluation of the dashboard's sidebar filters.
+
+Row positions for every Company, MissionStatus and RocketStatus value and a
+year-sorted row order are computed once per dataset. A filter combination is
+answered by intersecting those index arrays, never by scanning or copying the
+whole frame, and the resulting row sets are memoized in a bounded LRU keyed
+by the normalized filter tuple.
+
+For the detail table, a full-frame sort order per column is also computed on
+first use, so a filtered row set can be sorted and paged with a single
+vectorized pass and only the visible page is ever materialized.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+FILTER_COLUMNS = ["Company", "MissionStatus", "RocketStatus"]
+
+
+class FilterEngine:
+    """Answers filter combinations over ``frame`` with precomputed row indexes."""
+
+    def __init__(self, frame: pd.DataFrame, cache_size: int = 256):
+        self.frame = frame
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._sort_orders = {}
+        self._lock = threading.Lock()
+
+        self._rows_by_value = {}
+        for col in FILTER_COLUMNS:
+            codes, uniques = pd.factorize(frame[col], sort=True)
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            self._rows_by_value[col] = {
+                str(value): order[bounds[i]:bounds[i + 1]] for i, value in enumerate(uniques)
+            }
+
+        years = frame["Date"].dt.year.to_numpy(dtype=float, na_value=np.nan)
+        dated = np.flatnonzero(~np.isnan(years))
+        self._year_order = dated[np.argsort(years[dated], kind="stable")]
+        self._year_keys = years[self._year_order].astype(np.int64)
+
+    def values(self, column: str) -> list:
+        """Sorted distinct values of a filter column."""
+        return sorted(self._rows_by_value[column])
+
+    @staticmethod
+    def key(year_range, companies=(), statuses=(), rocket_statuses=()) -> tuple:
+        """Normalized, hashable form of a filter selection."""
+        return (
+            (int(year_range[0]), int(year_range[1])),
+            tuple(sorted(set(companies))),
+            tuple(sorted(set(statuses))),
+            tuple(sorted(set(rocket_statuses))),
+        )
+
+    def rows(self, year_range, companies=(), statuses=(), rocket_statuses=()) -> np.ndarray:
+        """Ascending row positions matching the filters; empty selections mean "all"."""
+        key = self.key(year_range, companies, statuses, rocket_statuses)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        result = self._evaluate(key)
+        result.flags.writeable = False
+        with self._lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def view(self, year_range, companies=(), statuses=(), rocket_statuses=()) -> pd.DataFrame:
+        """The filtered rows of ``frame``, in their original order."""
+        return self.frame.iloc[self.rows(year_range, companies, statuses, rocket_statuses)]
+
+    def sort_order(self, column: str, ascending: bool = True) -> np.ndarray:
+        """Every row position ordered by ``column``: stable, missing values last."""
+        key = (column, ascending)
+        with self._lock:
+            order = self._sort_orders.get(key)
+        if order is None:
+            values = self.frame[column].reset_index(drop=True)
+            order = values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+            order.flags.writeable = False
+            with self._lock:
+                self._sort_orders[key] = order
+        return order
+
+    def sorted_rows(self, rows: np.ndarray, column: str = None, ascending: bool = True) -> np.ndarray:
+        """``rows`` reordered by ``column`` using its presorted order; unchanged if no column."""
+        if column is None:
+            return rows
+        order = self.sort_order(column, ascending)
+        selected = np.zeros(len(self.frame), dtype=bool)
+        selected[rows] = True
+        return order[selected[order]]
+
+    def page(self, rows: np.ndarray, page: int, page_size: int, column: str = None,
+             ascending: bool = True) -> pd.DataFrame:
+        """The ``page``-th (1-based) slice of ``rows`` after sorting by ``column``."""
+        start, stop = page_bounds(len(rows), page, page_size)
+        return self.frame.iloc[self.sorted_rows(rows, column, ascending)[start:stop]]
+
+    def _evaluate(self, key: tuple) -> np.ndarray:
+        (start, end), *selections = key
+        lo = np.searchsorted(self._year_keys, start, side="left")
+        hi = np.searchsorted(self._year_keys, end, side="right")
+        mask = np.zeros(len(self.frame), dtype=bool)
+        mask[self._year_order[lo:max(lo, hi)]] = True
+        for col, selected in zip(FILTER_COLUMNS, selections):
+            if not selected:
+                continue
+            index = self._rows_by_value[col]
+            allowed = np.zeros(len(self.frame), dtype=bool)
+            for value in selected:
+                if value in index:
+                    allowed[index[value]] = True
+            mask &= allowed
+        return np.flatnonzero(mask)
+
+
+def page_count(total: int, page_size: int) -> int:
+    """Number of pages needed for ``total`` rows; at least one."""
+    return max(1, -(-total // page_size))
+
+
+def page_bounds(total: int, page: int, page_size: int) -> tuple:
+    """Start/stop offsets of the 1-based ``page``, clamped to the available pages."""
+    page = min(max(page, 1), page_count(total, page_size))
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total)
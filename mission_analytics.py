@@ -0,0 +1,282 @@
+"""
+Trend analytics over launch years: rolling company success rates, cumulative
+launches per rocket family and launch-site utilization.
+
+Everything is derived from three count matrices with one row per year
+(every year from the first launch to the last, empty years included):
+launches and successes per company, launches per rocket family and
+launches per site. Rolling windows are differences of the cumulative sums
+down the year axis, so any window length is answered without regrouping the
+rows. The matrices are built in one pass of ``np.bincount`` per table, or
+chunk by chunk with ``chunk_size``, and cached next to the CSV as
+``<name>.analytics.parquet`` (their nonzero cells). ``LiveAnalytics`` keeps
+them in step with a ``mission_dataset.MissionDataset`` by adding the counts
+of appended rows instead of rebuilding.
+
+A rocket's family is its name up to the variant: "Falcon 9 Block 5" and
+"Falcon Heavy" are Falcon, "Soyuz 2.1a/Fregat" is Soyuz, "Titan IV(401)A"
+is Titan. ``FAMILY_PREFIXES`` names the families that the first word does
+not identify, such as Long March or H-II.
+
+    python mission_analytics.py [path/to/space_missions.csv]
+"""
+
+import functools
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+import mission_data
+import mission_dataset
+import mission_paths
+
+ANALYTICS_COLUMNS = ["Company", "Location", "Date", "Rocket", "MissionStatus"]
+ANALYTICS_SUFFIX = ".analytics.parquet"
+
+MATRICES = ["company_launches", "company_successes", "family_launches", "site_launches"]
+# Sidecar rows of this Matrix record the first and last year, which may have no counts.
+_SPAN = "span"
+
+# Rocket name prefix -> family, checked before taking the first word.
+FAMILY_PREFIXES = {
+    "Long March": "Long March",
+    "Space Shuttle": "Space Shuttle",
+    "Feng Bao": "Feng Bao",
+    "Black Arrow": "Black Arrow",
+    "New Shepard": "New Shepard",
+    "Super Stripy": "Super Stripy",
+    "Blue Scout": "Scout",
+    "Commercial Titan": "Titan",
+    "SM-65B Atlas": "Atlas",
+    "Mercury-Redstone": "Redstone",
+    "H-II": "H-II",
+    "H-I": "H-I",
+    "N-II": "N-II",
+    "N-I": "N-I",
+    "Mu-": "Mu",
+}
+
+# Words end at spaces, slashes and brackets, and at hyphens after a word of three letters or more.
+_FIRST_WORD = re.compile(r"[A-Za-z]{3,}(?=-)|[^\s/(]+")
+
+
+@functools.lru_cache(maxsize=None)
+def rocket_family(rocket: str) -> str:
+    """The family of a rocket model, e.g. "Falcon" for "Falcon 9 Block 5"."""
+    for prefix, family in FAMILY_PREFIXES.items():
+        if rocket.startswith(prefix):
+            return family
+    word = _FIRST_WORD.match(rocket.strip())
+    return word.group(0) if word else rocket
+
+
+def _year_counts(years: np.ndarray, labels: pd.Series, weights: np.ndarray = None) -> pd.DataFrame:
+    """Year x label matrix of row counts (or summed ``weights``) over the rows' years."""
+    codes, uniques = pd.factorize(labels.astype("str"), sort=True)
+    first = int(years.min()) if len(years) else 0
+    span = int(years.max()) - first + 1 if len(years) else 0
+    known = codes >= 0
+    slots = (years[known] - first) * len(uniques) + codes[known]
+    counts = np.bincount(slots, weights=None if weights is None else weights[known],
+                         minlength=span * len(uniques)).astype(np.int64)
+    return pd.DataFrame(counts.reshape(span, len(uniques)), index=pd.RangeIndex(first, first + span, name="Year"),
+                        columns=pd.Index(uniques, dtype="str"))
+
+
+def _add(a: pd.DataFrame, b: pd.DataFrame) -> pd.DataFrame:
+    """Sum of two year x label matrices over the union of their years and labels."""
+    if not len(a.index):
+        return b
+    if not len(b.index):
+        return a
+    years = pd.RangeIndex(min(a.index[0], b.index[0]), max(a.index[-1], b.index[-1]) + 1, name="Year")
+    labels = a.columns.union(b.columns)
+    return (a.reindex(index=years, columns=labels, fill_value=0)
+            + b.reindex(index=years, columns=labels, fill_value=0))
+
+
+class MissionAnalytics:
+    """The year x company, year x family and year x site count matrices and the analytics over them."""
+
+    def __init__(self, company_launches: pd.DataFrame, company_successes: pd.DataFrame,
+                 family_launches: pd.DataFrame, site_launches: pd.DataFrame):
+        self.company_launches = company_launches
+        self.company_successes = company_successes
+        self.family_launches = family_launches
+        self.site_launches = site_launches
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "MissionAnalytics":
+        """Matrices counting the dated rows of ``frame``."""
+        dated = frame[frame["Date"].notna()]
+        years = dated["Date"].dt.year.to_numpy(dtype=np.int64)
+        successes = (dated["MissionStatus"] == "Success").to_numpy(dtype=np.int64)
+        # Mapped per distinct rocket: Rocket is categorical.
+        families = dated["Rocket"].map(rocket_family, na_action="ignore")
+        return cls(
+            _year_counts(years, dated["Company"]),
+            _year_counts(years, dated["Company"], successes),
+            _year_counts(years, families),
+            _year_counts(years, dated["Location"]),
+        )
+
+    @classmethod
+    def from_cells(cls, cells: pd.DataFrame) -> "MissionAnalytics":
+        """Analytics from the (Matrix, Year, Label, Count) rows written by ``to_cells``."""
+        span = cells.loc[cells["Matrix"] == _SPAN, "Year"]
+        first, last = (int(span.min()), int(span.max())) if len(span) else (0, -1)
+        years = pd.RangeIndex(first, last + 1, name="Year")
+        matrices = []
+        for name in MATRICES:
+            part = cells[cells["Matrix"] == name]
+            labels = pd.Index(np.unique(part["Label"].to_numpy(dtype=object)), dtype="str")
+            counts = np.zeros((len(years), len(labels)), dtype=np.int64)
+            counts[part["Year"].to_numpy() - first, labels.get_indexer(part["Label"])] = part["Count"].to_numpy()
+            matrices.append(pd.DataFrame(counts, index=years, columns=labels))
+        # Companies without a success still have a column, as in from_frame.
+        matrices[1] = matrices[1].reindex(columns=matrices[0].columns, fill_value=0)
+        return cls(*matrices)
+
+    def to_cells(self) -> pd.DataFrame:
+        """The nonzero counts of every matrix as (Matrix, Year, Label, Count) rows, for the sidecar."""
+        years = self.years.to_numpy()
+        parts = [pd.DataFrame({"Matrix": _SPAN, "Year": years[[0, -1]] if len(years) else years,
+                               "Label": "", "Count": 0})]
+        for name in MATRICES:
+            matrix = getattr(self, name)
+            counts = matrix.to_numpy()
+            at_year, at_label = np.nonzero(counts)
+            parts.append(pd.DataFrame({"Matrix": name, "Year": years[at_year],
+                                       "Label": matrix.columns.to_numpy()[at_label],
+                                       "Count": counts[at_year, at_label]}))
+        cells = pd.concat(parts, ignore_index=True).astype({"Year": np.int64, "Label": "str", "Count": np.int64})
+        return cells.astype({"Matrix": pd.CategoricalDtype([_SPAN] + MATRICES)})
+
+    def merged(self, other: "MissionAnalytics") -> "MissionAnalytics":
+        """Analytics counting the rows of both."""
+        return MissionAnalytics(
+            _add(self.company_launches, other.company_launches),
+            # Aligned with company_launches, which has every company with a launch.
+            _add(self.company_successes, other.company_successes),
+            _add(self.family_launches, other.family_launches),
+            _add(self.site_launches, other.site_launches),
+        )
+
+    def appended(self, frame: pd.DataFrame) -> "MissionAnalytics":
+        """Analytics that also count the rows of ``frame``."""
+        return self.merged(MissionAnalytics.from_frame(frame))
+
+    @property
+    def years(self) -> pd.RangeIndex:
+        return self.company_launches.index
+
+    def rolling_success_rates(self, window: int, companies=None) -> pd.DataFrame:
+        """Year x company success rate (%) over the ``window`` years ending in each year.
+
+        NaN where the company had no launch in the window. ``companies``
+        selects and orders the columns; unknown names are left out.
+        """
+        if window < 1:
+            raise ValueError("window must be at least one year")
+        launches, successes = self.company_launches, self.company_successes
+        if companies is not None:
+            columns = [company for company in companies if company in launches.columns]
+            launches, successes = launches[columns], successes.reindex(columns=columns, fill_value=0)
+        in_window = _window_sums(launches, window)
+        succeeded = _window_sums(successes, window)
+        return (succeeded / in_window.where(in_window > 0) * 100).round(2)
+
+    def cumulative_family_launches(self, families=None) -> pd.DataFrame:
+        """Year x family launches up to and including each year."""
+        launches = self.family_launches
+        if families is not None:
+            launches = launches[[family for family in families if family in launches.columns]]
+        return launches.cumsum()
+
+    def site_utilization(self, share: bool = False) -> pd.DataFrame:
+        """Year x site launches, or with ``share`` each site's percentage of the year's launches."""
+        if not share:
+            return self.site_launches
+        totals = self.site_launches.sum(axis=1)
+        return (self.site_launches.div(totals.where(totals > 0), axis=0) * 100).round(2)
+
+
+def top_labels(matrix: pd.DataFrame, n: int, years=None) -> list:
+    """Labels of a year x label matrix with the most launches within ``years`` (inclusive), ties alphabetical."""
+    if years is not None:
+        matrix = matrix.loc[years[0]:years[1]]
+    totals = matrix.sum()
+    totals = totals[totals > 0].rename_axis("label").reset_index(name="launches")
+    ranked = totals.sort_values(["launches", "label"], ascending=[False, True], kind="stable")
+    return ranked["label"].head(n).tolist()
+
+
+def _window_sums(matrix: pd.DataFrame, window: int) -> pd.DataFrame:
+    """Sums over the last ``window`` rows, as differences of the cumulative sums."""
+    cumulative = matrix.to_numpy().cumsum(axis=0)
+    sums = cumulative.copy()
+    sums[window:] -= cumulative[:-window]
+    return pd.DataFrame(sums, index=matrix.index, columns=matrix.columns)
+
+
+def build_analytics_chunked(csv_path: str, chunk_size: int) -> MissionAnalytics:
+    """``MissionAnalytics.from_frame`` over a CSV read ``chunk_size`` rows at a time."""
+    analytics = MissionAnalytics.from_frame(mission_data.empty_table())
+    for chunk in mission_data.iter_chunks(csv_path, chunk_size, ANALYTICS_COLUMNS):
+        analytics = analytics.appended(chunk)
+    return analytics
+
+
+def _build_analytics(csv_path: str, chunk_size: int = None) -> MissionAnalytics:
+    if chunk_size:
+        return build_analytics_chunked(csv_path, chunk_size)
+    return MissionAnalytics.from_frame(mission_data.load_table(csv_path))
+
+
+def _load_cells(csv_path: str, chunk_size: int = None) -> pd.DataFrame:
+    return load_analytics(csv_path, chunk_size).to_cells()
+
+
+def load_analytics(csv_path: str, chunk_size: int = None, workers: int = None) -> MissionAnalytics:
+    """Load the cached analytics for ``csv_path``, rebuilding them if stale or missing.
+
+    For a directory or glob of CSVs, each file's analytics are loaded (or
+    built and cached) in a pool of ``workers`` processes and merged.
+    """
+    if mission_paths.is_multi_source(csv_path):
+        load = functools.partial(_load_cells, chunk_size=chunk_size)
+        parts = mission_data.parallel_map(load, mission_paths.resolve_sources(csv_path), workers)
+        empty = MissionAnalytics.from_frame(mission_data.empty_table())
+        return functools.reduce(MissionAnalytics.merged, map(MissionAnalytics.from_cells, parts), empty)
+    cells = mission_data.read_sidecar(csv_path, ANALYTICS_SUFFIX)
+    if cells is not None:
+        return MissionAnalytics.from_cells(cells)
+    signature = mission_data.source_signature(csv_path)
+    analytics = _build_analytics(csv_path, chunk_size)
+    if mission_data.pq is not None:
+        try:
+            mission_data.write_sidecar(csv_path, analytics.to_cells(), ANALYTICS_SUFFIX, signature)
+        except OSError:
+            pass
+    return analytics
+
+
+class LiveAnalytics(mission_dataset.LiveDerived):
+    """The analytics for a dataset's CSV, following the dataset's ``version`` (see ``LiveDerived``)."""
+
+    def load(self) -> MissionAnalytics:
+        return load_analytics(self.csv_path, self.chunk_size, self.workers)
+
+
+if __name__ == "__main__":
+    default = os.path.join(os.path.dirname(os.path.abspath(__file__)), "space_missions.csv")
+    analytics = load_analytics(sys.argv[1] if len(sys.argv) > 1 else default)
+    rates = analytics.rolling_success_rates(5, top_labels(analytics.company_launches, 5))
+    print("5-year success rate (%), top companies:")
+    print(rates.tail(5).to_string())
+    families = analytics.cumulative_family_launches(top_labels(analytics.family_launches, 5))
+    print("\nCumulative launches, top rocket families:")
+    print(families.tail(5).to_string())
@@ -0,0 +1,134 @@
+"""
+Pre-aggregated mission counts for instant dashboard rendering.
+
+The cube holds one row per (Year, Company, MissionStatus, RocketStatus,
+Rocket) combination present in the data, with its ``Missions`` count. Every
+sidebar filter is a predicate on one of those dimensions, so any filter
+combination is answered by slicing the cube (a few thousand cells) and
+feeding the slice to ``dashboard_aggregates.aggregate_counts``; the raw rows
+are only needed for the detail table.
+
+The cube is built once per CSV version and cached next to it as
+``<name>.cube.parquet``. For CSVs larger than memory it can be built from
+fixed-size chunks (``chunk_size``), merging per-chunk cells as it goes.
+A directory or glob of CSVs is handled per file in a process pool, merging
+the per-file cells. ``LiveCube`` keeps a cube in step with a
+``mission_dataset.MissionDataset``, merging the cells of appended rows
+instead of rebuilding.
+
+    python mission_cube.py [path/to/space_missions.csv]
+"""
+
+import functools
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+import mission_data
+import mission_dataset
+import mission_paths
+from dashboard_aggregates import DashboardAggregates, aggregate_counts
+
+DIMENSIONS = ["Year", "Company", "MissionStatus", "RocketStatus", "Rocket"]
+CUBE_COLUMNS = ["Company", "Date", "Rocket", "RocketStatus", "MissionStatus"]
+CUBE_SUFFIX = ".cube.parquet"
+
+
+def build_cube(frame: pd.DataFrame) -> pd.DataFrame:
+    """Group ``frame`` into cube cells; rows without a launch year are dropped."""
+    keys = [frame["Date"].dt.year.rename("Year")] + [frame[col] for col in DIMENSIONS[1:]]
+    counts = frame.groupby(keys, observed=True, dropna=False).size()
+    cells = counts[counts > 0].rename("Missions").reset_index()
+    cells = cells[cells["Year"].notna()].reset_index(drop=True)
+    cells["Year"] = cells["Year"].astype(np.int64)
+    for col in DIMENSIONS[1:]:
+        cells[col] = cells[col].astype("str")
+    cells["Missions"] = cells["Missions"].astype(np.int64)
+    return cells
+
+
+def merge_cells(*parts: pd.DataFrame) -> pd.DataFrame:
+    """Cells counting the rows of all inputs."""
+    merged = pd.concat(parts, ignore_index=True)
+    merged = merged.groupby(DIMENSIONS, sort=True, dropna=False)["Missions"].sum().reset_index()
+    merged["Missions"] = merged["Missions"].astype(np.int64)
+    return merged
+
+
+def build_cube_chunked(csv_path: str, chunk_size: int) -> pd.DataFrame:
+    """``build_cube`` over a CSV read ``chunk_size`` rows at a time."""
+    cells = None
+    for chunk in mission_data.iter_chunks(csv_path, chunk_size, CUBE_COLUMNS):
+        part = build_cube(chunk)
+        cells = part if cells is None else merge_cells(cells, part)
+    return cells if cells is not None else build_cube(mission_data.empty_table())
+
+
+class MissionCube:
+    """Slices cube cells by the dashboard's filters."""
+
+    def __init__(self, cells: pd.DataFrame):
+        self.cells = cells
+        self._years = cells["Year"].to_numpy()
+
+    def select(self, year_range, companies=(), statuses=(), rocket_statuses=()) -> pd.DataFrame:
+        """Cells matching the filters; empty selections mean "all"."""
+        mask = (self._years >= year_range[0]) & (self._years <= year_range[1])
+        for col, selected in (("Company", companies), ("MissionStatus", statuses),
+                              ("RocketStatus", rocket_statuses)):
+            if selected:
+                mask &= self.cells[col].isin(list(selected)).to_numpy()
+        return self.cells[mask]
+
+    def aggregates(self, year_range, companies=(), statuses=(), rocket_statuses=()) -> DashboardAggregates:
+        """Every dashboard KPI and chart dataset for the filter combination."""
+        return aggregate_counts(self.select(year_range, companies, statuses, rocket_statuses))
+
+    def appended(self, frame: pd.DataFrame) -> "MissionCube":
+        """A cube that also counts the rows of ``frame``."""
+        return MissionCube(merge_cells(self.cells, build_cube(frame)))
+
+
+def _load_cells(csv_path: str, chunk_size: int = None) -> pd.DataFrame:
+    return load_cube(csv_path, chunk_size).cells
+
+
+def load_cube(csv_path: str, chunk_size: int = None, workers: int = None) -> MissionCube:
+    """Load the cached cube for ``csv_path``, rebuilding it if stale or missing.
+
+    For a directory or glob of CSVs, each file's cube is loaded (or built and
+    cached) in a pool of ``workers`` processes and the cells are merged.
+    """
+    if mission_paths.is_multi_source(csv_path):
+        load = functools.partial(_load_cells, chunk_size=chunk_size)
+        parts = mission_data.parallel_map(load, mission_paths.resolve_sources(csv_path), workers)
+        return MissionCube(merge_cells(*parts) if parts else build_cube(mission_data.empty_table()))
+    cells = mission_data.read_sidecar(csv_path, CUBE_SUFFIX)
+    if cells is None:
+        signature = mission_data.source_signature(csv_path)
+        if chunk_size:
+            cells = build_cube_chunked(csv_path, chunk_size)
+        else:
+            cells = build_cube(mission_data.load_table(csv_path))
+        if mission_data.pq is not None:
+            try:
+                mission_data.write_sidecar(csv_path, cells, CUBE_SUFFIX, signature)
+            except OSError:
+                pass
+    return MissionCube(cells)
+
+
+class LiveCube(mission_dataset.LiveDerived):
+    """The cube for a dataset's CSV, following the dataset's ``version`` (see ``LiveDerived``)."""
+
+    def load(self) -> MissionCube:
+        return load_cube(self.csv_path, self.chunk_size, self.workers)
+
+
+if __name__ == "__main__":
+    default = os.path.join(os.path.dirname(os.path.abspath(__file__)), "space_missions.csv")
+    path = sys.argv[1] if len(sys.argv) > 1 else default
+    cube = load_cube(path)
+    print(f"{mission_paths.sidecar_path(path, CUBE_SUFFIX)}: {len(cube.cells):,} cells")
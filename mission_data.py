@@ -0,0 +1,202 @@
+"""
+Loading of the space missions table, with a typed columnar sidecar cache.
+
+Every loaded table goes through ``apply_schema``: ``Date`` becomes datetime64,
+``Price`` a float, and the highly repetitive text columns pandas categoricals,
+which cuts memory several-fold and makes ``==``/``isin`` compare integer codes.
+
+Parsing the quoted CSV and its ISO dates dominates cold start, so the parsed
+table is also written next to the CSV as ``<name>.parquet`` with the typed
+columns stored as-is. Later loads read the sidecar while it still matches the
+CSV it was built from and rebuild it when it is stale. Without pyarrow the CSV is always parsed directly.
+
+A data source may also be a directory or glob of CSVs in the same schema;
+``load_sources`` loads them in a process pool and concatenates the tables.
+
+    python mission_data.py [path/to/space_missions.csv]
+"""
+
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+import mission_paths
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = pq = None
+
+COLUMNS = ["Company", "Location", "Date", "Time", "Rocket", "Mission", "RocketStatus", "Price", "MissionStatus"]
+CATEGORY_COLUMNS = ["Company", "Location", "Rocket", "RocketStatus", "MissionStatus"]
+
+# Bump when apply_schema changes so sidecars written by older code are rebuilt.
+SCHEMA_VERSION = 2
+
+_SOURCE_KEY = b"space_missions_source"
+
+
+def source_signature(csv_path: str) -> dict:
+    """What a sidecar built from ``csv_path`` is stamped with: the CSV's mtime and size and the schema version.
+
+    Take it before reading the CSV, so that a sidecar built from rows read
+    while the file was changing is stamped as stale.
+    """
+    st = os.stat(csv_path)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "schema": SCHEMA_VERSION}
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert raw CSV columns to their typed in-memory representation, in place.
+
+    Only the columns present are converted, so column subsets work too.
+    """
+    if "Date" in df:
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    if "Price" in df and not pd.api.types.is_float_dtype(df["Price"]):
+        price = df["Price"].astype("str").str.replace(",", "", regex=False)
+        df["Price"] = pd.to_numeric(price, errors="coerce").astype("float64")
+    for col in CATEGORY_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def empty_table() -> pd.DataFrame:
+    """A zero-row table with the typed schema."""
+    return apply_schema(pd.DataFrame({col: pd.Series(dtype="str") for col in COLUMNS}))
+
+
+_RAW_DTYPES = {"Time": "str", "Price": "str"}
+
+
+def read_csv(csv_path: str) -> pd.DataFrame:
+    """Parse the missions CSV into the typed schema."""
+    return apply_schema(pd.read_csv(csv_path, dtype=_RAW_DTYPES))
+
+
+def read_rows(data: bytes) -> pd.DataFrame:
+    """Parse header-less CSV rows, such as lines appended to the file, into the typed schema."""
+    return apply_schema(pd.read_csv(io.BytesIO(data), names=COLUMNS, header=None, dtype=_RAW_DTYPES))
+
+
+def concat_tables(frames: list, ignore_index: bool = False) -> pd.DataFrame:
+    """The rows of ``frames`` in order, keeping categorical columns categorical.
+
+    Categories are unioned and kept sorted, so sorting by a categorical column
+    orders rows the same way as in a table loaded in one go.
+    """
+    if not frames:
+        return empty_table()
+    index = frames[0].index.append([frame.index for frame in frames[1:]])
+    if ignore_index:
+        index = pd.RangeIndex(len(index))
+    columns = {}
+    for col in frames[0].columns:
+        if col in CATEGORY_COLUMNS:
+            # Recodes integer codes instead of materializing the values.
+            union = union_categoricals([frame[col] for frame in frames], sort_categories=True)
+            columns[col] = pd.Series(union, index=index)
+        else:
+            columns[col] = pd.Series(pd.concat([frame[col] for frame in frames]).array, index=index)
+    return pd.DataFrame(columns, index=index)
+
+
+def iter_chunks(csv_path: str, chunk_size: int, columns: list = None):
+    """Yield the CSV as typed frames of at most ``chunk_size`` rows, reading only ``columns``.
+
+    Peak memory depends on ``chunk_size`` and the selected columns, not on
+    the file size, so callers can fold files larger than RAM into aggregates.
+    """
+    columns = columns or COLUMNS
+    dtypes = {col: dtype for col, dtype in _RAW_DTYPES.items() if col in columns}
+    with pd.read_csv(csv_path, usecols=columns, dtype=dtypes, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            yield apply_schema(chunk[[col for col in COLUMNS if col in columns]])
+
+
+def write_sidecar(csv_path: str, df: pd.DataFrame = None, suffix: str = ".parquet", signature: dict = None) -> str:
+    """Write the columnar cache for ``csv_path`` and return its path.
+
+    ``df`` defaults to the parsed CSV. A ``df`` built by the caller must come
+    with the ``source_signature`` taken before the CSV was read.
+    """
+    if pq is None:
+        raise RuntimeError("pyarrow is required to write the columnar cache")
+    if signature is None:
+        signature = source_signature(csv_path)
+    if df is None:
+        df = read_csv(csv_path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_SOURCE_KEY] = json.dumps(signature).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    path = mission_paths.sidecar_path(csv_path, suffix)
+    tmp_path = mission_paths.temp_path(path)
+    try:
+        pq.write_table(table, tmp_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_sidecar(csv_path: str, suffix: str = ".parquet"):
+    """Read the columnar cache for ``csv_path``, or return None if it is missing or stale."""
+    if pq is None:
+        return None
+    path = mission_paths.sidecar_path(csv_path, suffix)
+    try:
+        table = pq.read_table(path)
+        source = json.loads((table.schema.metadata or {}).get(_SOURCE_KEY, b"null"))
+        if source != source_signature(csv_path):
+            return None
+    except (OSError, ValueError, pa.ArrowException):
+        return None
+    return table.to_pandas()
+
+
+def load_table(csv_path: str) -> pd.DataFrame:
+    """Load the missions table, preferring a fresh sidecar and refreshing a stale one."""
+    df = read_sidecar(csv_path)
+    if df is not None:
+        return df
+    signature = source_signature(csv_path)
+    df = read_csv(csv_path)
+    if pq is not None:
+        try:
+            write_sidecar(csv_path, df, signature=signature)
+        except OSError:
+            pass
+    return df
+
+
+def parallel_map(fn, items: list, workers: int = None) -> list:
+    """``[fn(item) for item in items]`` spread over ``workers`` processes (default: every core).
+
+    ``fn`` must be picklable, i.e. a module-level function or a ``partial``
+    of one. With one worker or one item everything runs in this process.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(items))
+    if workers <= 1:
+        return [fn(item) for item in items]
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(fn, items))
+
+
+def load_sources(path: str, workers: int = None) -> pd.DataFrame:
+    """``load_table`` for every CSV behind ``path``, in parallel, concatenated in path order."""
+    return concat_tables(parallel_map(load_table, mission_paths.resolve_sources(path), workers), ignore_index=True)
+
+
+if __name__ == "__main__":
+    default = os.path.join(os.path.dirname(os.path.abspath(__file__)), "space_missions.csv")
+    print(write_sidecar(sys.argv[1] if len(sys.argv) > 1 else default))
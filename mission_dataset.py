@@ -0,0 +1,541 @@
+"""
+In-memory index and dataset behind the space_missions query functions.
+
+``MissionDataset`` loads the missions CSV (or a directory or glob of CSVs),
+keeps it fresh as the files change and builds a ``MissionIndex`` of
+pre-aggregated counts that answers every query in O(1) or O(log n). This is
+the pandas half of space_missions.py, which imports it on first data access
+only.
+"""
+
+import functools
+import threading
+import zlib
+
+import numpy as np
+import pandas as pd
+
+import mission_data
+import mission_mmap
+import mission_paths
+import mission_snapshot
+import mission_store
+import mission_timing
+
+
+# Columns the query functions need when the CSV is ingested chunk by chunk.
+QUERY_COLUMNS = ["Company", "Date", "Rocket", "Mission", "MissionStatus"]
+
+
+def _int_counts(counts: pd.Series) -> pd.Series:
+    counts = counts[counts > 0].astype(np.int64)
+    if not pd.api.types.is_integer_dtype(counts.index):
+        counts.index = counts.index.astype("str")
+    return counts
+
+
+def _add_counts(a: pd.Series, b: pd.Series) -> pd.Series:
+    return a.add(b, fill_value=0).astype(np.int64)
+
+
+class MissionCounts:
+    """Per-key counts behind MissionIndex that can be folded chunk by chunk.
+
+    ``a + b`` counts the rows of both inputs, so a file can be reduced one
+    chunk at a time with memory bounded by the number of distinct keys.
+    """
+
+    def __init__(self, company_missions, company_successes, rockets, statuses, years):
+        self.company_missions = company_missions
+        self.company_successes = company_successes
+        self.rockets = rockets
+        self.statuses = statuses
+        self.years = years
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "MissionCounts":
+        success = df["MissionStatus"] == "Success"
+        return cls(
+            company_missions=_int_counts(df.groupby("Company", observed=True).size()),
+            company_successes=_int_counts(success.groupby(df["Company"], observed=True).sum()),
+            rockets=_int_counts(df.groupby("Rocket", observed=True).size()),
+            statuses=_int_counts(df["MissionStatus"].value_counts()),
+            years=_int_counts(df["Date"].dropna().dt.year.astype(np.int64).value_counts()),
+        )
+
+    @classmethod
+    def sum(cls, parts: list) -> "MissionCounts":
+        """Counts of all ``parts`` in one pass, cheaper than folding many with ``+``."""
+        fields = ["company_missions", "company_successes", "rockets", "statuses", "years"]
+        if not parts:
+            return cls.from_frame(mission_data.empty_table())
+        return cls(**{
+            field: _int_counts(pd.concat([getattr(part, field) for part in parts]).groupby(level=0).sum())
+            for field in fields
+        })
+
+    def __add__(self, other: "MissionCounts") -> "MissionCounts":
+        return MissionCounts(
+            company_missions=_add_counts(self.company_missions, other.company_missions),
+            company_successes=_add_counts(self.company_successes, other.company_successes),
+            rockets=_add_counts(self.rockets, other.rockets),
+            statuses=_add_counts(self.statuses, other.statuses),
+            years=_add_counts(self.years, other.years),
+        )
+
+
+class MissionIndex:
+    """Aggregates precomputed once per load for O(1) lookups.
+
+    - ``company_counts``: company -> (mission count, success count), also as
+      the ``company_table`` frame for batch lookups
+    - ``rocket_counts``: rocket -> launch count
+    - ``status_counts``: mission status -> count, most frequent first
+    - ``year_counts``: missions per year from ``first_year`` to ``last_year``,
+      with ``year_prefix`` holding the running totals for range sums
+    - ``by_date``: ``Date`` and ``Mission`` of the rows with a valid date,
+      sorted by launch date and then by row, so missions launched on the same
+      day keep their CSV order, with
+      ``date_keys`` as the matching datetime64 array for ``searchsorted``
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._build(MissionCounts.from_frame(df), df.loc[df["Date"].notna(), ["Date", "Mission"]])
+
+    @classmethod
+    def from_parts(cls, counts: MissionCounts, dated: pd.DataFrame) -> "MissionIndex":
+        """Build from folded counts and the dated rows (at least ``Date`` and ``Mission``) in file order."""
+        index = cls.__new__(cls)
+        index._build(counts, dated)
+        return index
+
+    def appended(self, counts: MissionCounts, dated: pd.DataFrame) -> "MissionIndex":
+        """A new index that also covers appended rows, given their counts and dated rows.
+
+        The existing date order is reused: a tail launched on or after the last
+        indexed date is sorted on its own and concatenated, and only an
+        out-of-order tail re-sorts the whole ``by_date`` table.
+        """
+        tail = _date_order(dated[self.by_date.columns])
+        in_order = tail.empty or len(self.date_keys) == 0 or tail["Date"].iloc[0] >= self.date_keys[-1]
+        index = MissionIndex.__new__(MissionIndex)
+        index._build(self.counts + counts, mission_data.concat_tables([self.by_date, tail]), presorted=in_order)
+        return index
+
+    def _build(self, counts: MissionCounts, dated: pd.DataFrame, presorted: bool = False) -> None:
+        self.counts = counts
+        self.company_table = pd.DataFrame({
+            "missions": counts.company_missions,
+            "successes": counts.company_successes.reindex(counts.company_missions.index, fill_value=0),
+        }).astype(np.int64)
+        self.company_counts = {
+            company: (int(total), int(success))
+            for company, total, success in zip(
+                self.company_table.index, self.company_table["missions"], self.company_table["successes"]
+            )
+        }
+        self.top_companies = sorted(
+            ((company, count) for company, (count, _) in self.company_counts.items()),
+            key=lambda item: (-item[1], item[0]),
+        )
+
+        self.rocket_counts = {rocket: int(n) for rocket, n in counts.rockets.items()}
+        self.most_used_rocket = ""
+        if self.rocket_counts:
+            max_count = max(self.rocket_counts.values())
+            self.most_used_rocket = min(r for r, n in self.rocket_counts.items() if n == max_count)
+
+        self.status_counts = {
+            status: int(n) for status, n in sorted(counts.statuses.items(), key=lambda item: (-item[1], item[0]))
+        }
+
+        if len(counts.years):
+            self.first_year = int(counts.years.index.min())
+            self.last_year = int(counts.years.index.max())
+            self.year_counts = np.zeros(self.last_year - self.first_year + 1, dtype=np.int64)
+            self.year_counts[counts.years.index.to_numpy() - self.first_year] = counts.years.to_numpy()
+        else:
+            self.first_year, self.last_year = 0, -1
+            self.year_counts = np.zeros(0, dtype=np.int64)
+        self.year_prefix = np.concatenate(([0], np.cumsum(self.year_counts)))
+
+        self.by_date = dated if presorted else _date_order(dated)
+        self.date_keys = self.by_date["Date"].to_numpy()
+        self.missions_by_date = self.by_date["Mission"].to_numpy(dtype=object)
+
+    # Query methods, shared with mission_store.MissionStore so either can
+    # back the module-level functions.
+    def company_stats(self, company: str) -> tuple:
+        return self.company_counts.get(company, (0, 0))
+
+    def company_rows(self, companies) -> pd.DataFrame:
+        return self.company_table.reindex(list(companies), fill_value=0)
+
+    def top_company_counts(self, n: int) -> list:
+        return self.top_companies[:n]
+
+    def mission_status_counts(self) -> dict:
+        return dict(self.status_counts)
+
+    def missions_in_year(self, year: int) -> int:
+        if year < self.first_year or year > self.last_year:
+            return 0
+        return int(self.year_counts[year - self.first_year])
+
+    def missions_in_years(self, years) -> list:
+        offsets = np.array(years, dtype=object) - self.first_year
+        counts = np.zeros(len(offsets), dtype=np.int64)
+        inside = np.array([0 <= off < len(self.year_counts) for off in offsets], dtype=bool)
+        counts[inside] = self.year_counts[offsets[inside].astype(np.int64)]
+        return counts.tolist()
+
+    def missions_between(self, start_year: int, end_year: int) -> int:
+        """Number of missions launched from ``start_year`` to ``end_year`` inclusive."""
+        lo = min(max(start_year, self.first_year), self.last_year + 1) - self.first_year
+        hi = min(max(end_year + 1, self.first_year), self.last_year + 1) - self.first_year
+        if hi <= lo:
+            return 0
+        return int(self.year_prefix[hi] - self.year_prefix[lo])
+
+    def date_slice(self, start: pd.Timestamp, end: pd.Timestamp) -> slice:
+        """Positions in ``by_date`` of missions launched from ``start`` to ``end`` inclusive."""
+        lo = int(np.searchsorted(self.date_keys, start.to_datetime64(), side="left"))
+        hi = int(np.searchsorted(self.date_keys, end.to_datetime64(), side="right"))
+        return slice(lo, max(lo, hi))
+
+    def missions_in_dates(self, start: pd.Timestamp, end: pd.Timestamp) -> list:
+        return self.missions_by_date[self.date_slice(start, end)].tolist()
+
+    def iter_missions_in_dates(self, start: pd.Timestamp, end: pd.Timestamp, chunk_size: int):
+        positions = self.date_slice(start, end)
+        for lo in range(positions.start, positions.stop, chunk_size):
+            yield from self.missions_by_date[lo:min(lo + chunk_size, positions.stop)].tolist()
+
+    def missions_in_date_ranges(self, bounds) -> list:
+        """``missions_in_dates`` for each (start, end), with one vectorized search per bound."""
+        if not bounds:
+            return []
+        los = np.searchsorted(self.date_keys, [start.to_datetime64() for start, _ in bounds], side="left")
+        his = np.searchsorted(self.date_keys, [end.to_datetime64() for _, end in bounds], side="right")
+        return [self.missions_by_date[lo:max(lo, hi)].tolist() for lo, hi in zip(los, his)]
+
+
+def _date_order(dated: pd.DataFrame) -> pd.DataFrame:
+    """``dated`` by launch date, rows launched on the same date by position in the source (their index label)."""
+    return dated.iloc[np.lexsort((dated.index.to_numpy(), dated["Date"].to_numpy()))]
+
+
+def _checksum(fh, length: int, block_size: int = 1 << 20) -> int:
+    """CRC32 of the next ``length`` bytes of ``fh``."""
+    crc = 0
+    while length > 0:
+        block = fh.read(min(block_size, length))
+        if not block:
+            break
+        crc = zlib.crc32(block, crc)
+        length -= len(block)
+    return crc
+
+
+def _ingest_file(path: str, chunk_size: int = None) -> tuple:
+    """Parse and pre-aggregate one CSV: (kept rows, MissionCounts, row count).
+
+    The kept rows are the full table, or with ``chunk_size`` only the dated
+    ``Date``/``Mission`` pairs. Module-level so process pools can run it.
+    """
+    if not chunk_size:
+        df = mission_data.load_table(path)
+        return df, MissionCounts.from_frame(df), len(df)
+    empty = mission_data.empty_table()
+    counts = MissionCounts.from_frame(empty)
+    dated = [empty[["Date", "Mission"]]]
+    rows = 0
+    for chunk in mission_data.iter_chunks(path, chunk_size, QUERY_COLUMNS):
+        counts = counts + MissionCounts.from_frame(chunk)
+        dated.append(chunk.loc[chunk["Date"].notna(), ["Date", "Mission"]])
+        rows += len(chunk)
+    return pd.concat(dated, ignore_index=True), counts, rows
+
+
+class MissionDataset:
+    """Parsed missions table, loaded once and re-read when the CSV changes on disk.
+
+    Freshness is checked against the file's mtime and size on every access, so
+    editing the CSV takes effect on the next call without a manual reload.
+    The frame is shared between callers and must be treated as read-only.
+
+    Appends are ingested incrementally: the byte offset, row count and a CRC32
+    of the bytes already ingested are remembered, and when the file has grown
+    and that prefix is unchanged only the appended tail is parsed and folded
+    into the frame and index. A shrunk file or a changed prefix triggers a
+    full reload. ``version`` increases with every change, and
+    ``changes_since`` hands derived caches (see ``LiveDerived``) the rows
+    they have not seen yet.
+
+    With ``chunk_size`` set, the CSV is streamed in chunks of that many rows
+    and only ``QUERY_COLUMNS``, each chunk is folded into ``MissionCounts``,
+    and no full frame is kept: only the launch date and mission name of each
+    row are retained, for the date-range index. Results are identical to the
+    in-memory path.
+
+    ``path`` may also be a directory or glob of CSVs in the same schema. The
+    files are parsed and pre-aggregated concurrently by ``workers`` processes
+    (default: every core), then their counts and rows are merged in path
+    order. Any change to the set of files or to one of them reloads them all.
+
+    With ``shared`` set, the full table is attached from a memory-mapped
+    export next to the source (see mission_mmap.py) instead of being held
+    privately, so every process on the host shares one physical copy. Any
+    change to the source then re-exports and re-attaches the table rather
+    than appending a private tail to it. Ignored with ``chunk_size``, which
+    keeps no full table.
+
+    Every load or append also refreshes the JSON snapshot of the counts next
+    to the source (see mission_snapshot.py).
+    """
+
+    # Appended tails kept for ``appended_since``; older versions get None.
+    MAX_TAILS = 256
+
+    def __init__(self, path: str, chunk_size: int = None, workers: int = None, shared: bool = False):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.shared = shared
+        self._multi = mission_paths.is_multi_source(path)
+        self.version = 0
+        self.rows = 0
+        self._frame = None
+        self._index = None
+        self._signature = None
+        self._offset = None  # bytes ingested so far; None when appends can't be trusted
+        self._checksum = 0
+        self._ends_with_newline = True
+        self._tails = []  # (version, rows appended in that version)
+        self._store = None
+        self._store_signature = None
+        self._lock = threading.RLock()
+
+    def _stat_signature(self):
+        return mission_paths.stat_signature(self.path)
+
+    def _ensure_fresh(self) -> None:
+        signature = self._stat_signature()
+        if self._index is not None and signature == self._signature:
+            return
+        # Threads (Streamlit sessions, service workers) must not ingest the same tail twice.
+        with self._lock:
+            signature = self._stat_signature()
+            if self._index is not None and signature == self._signature:
+                return
+            if self._index is None or not self._append(signature):
+                self._load(signature)
+            self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        # Lets later processes answer the count queries without loading the table.
+        if self._signature is None:
+            return
+        try:
+            mission_snapshot.write(self.path, self._signature, self._index)
+        except OSError:
+            pass
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the table has been loaded in this process (fresh or not)."""
+        return self._index is not None
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        if self.chunk_size:
+            raise RuntimeError("the full table is not kept when loading in chunks")
+        self._ensure_fresh()
+        return self._frame
+
+    @property
+    def index(self) -> MissionIndex:
+        self._ensure_fresh()
+        return self._index
+
+    def appended_since(self, version: int):
+        """Frames of the rows appended after ``version``, oldest first.
+
+        Returns None when the table was fully reloaded since ``version`` (or
+        the tails are no longer kept), in which case callers must rebuild.
+        """
+        return self.changes_since(version)[1]
+
+    def changes_since(self, version: int) -> tuple:
+        """``(current version, appended_since(version))``, read together so no tail falls between them."""
+        with self._lock:
+            self._ensure_fresh()
+            if version == self.version:
+                return self.version, []
+            if not self._tails or version is None or version < self._tails[0][0] - 1 or version > self.version:
+                return self.version, None
+            return self.version, [tail for tail_version, tail in self._tails if tail_version > version]
+
+    @mission_timing.timed("MissionDataset.load")
+    def _load(self, signature) -> None:
+        if signature is None:
+            self._frame = mission_data.empty_table()
+            self._index = MissionIndex(self._frame)
+            self.rows = 0
+        elif self.shared and not self.chunk_size:
+            df = mission_mmap.load_table(self.path, self.workers)
+            self._frame = df
+            self._index = MissionIndex(df)
+            self.rows = len(df)
+        elif self._multi:
+            self._load_sources([path for path, _, _ in signature])
+        elif self.chunk_size:
+            dated, counts, self.rows = _ingest_file(self.path, self.chunk_size)
+            self._frame = None
+            self._index = MissionIndex.from_parts(counts, dated)
+        else:
+            df = mission_data.load_table(self.path)
+            self._frame = df
+            self._index = MissionIndex(df)
+            self.rows = len(df)
+        self._signature = signature
+        self._offset = None
+        self._tails = []
+        self.version += 1
+        # A mapped table is never appended to: the tail would be private memory.
+        if self.shared and not self.chunk_size:
+            return
+        # The file may have changed while it was being parsed; only trust the
+        # offset for appends if it still has the size that was loaded.
+        if signature is not None and not self._multi and self._stat_signature() == signature:
+            try:
+                with open(self.path, "rb") as fh:
+                    self._checksum = _checksum(fh, signature[1])
+                    fh.seek(max(signature[1] - 1, 0))
+                    self._ends_with_newline = fh.read(1) in (b"", b"\n")
+            except OSError:
+                return
+            self._offset = signature[1]
+
+    def _load_sources(self, paths: list) -> None:
+        ingest = functools.partial(_ingest_file, chunk_size=self.chunk_size)
+        parts = mission_data.parallel_map(ingest, paths, self.workers)
+        counts = MissionCounts.sum([part_counts for _, part_counts, _ in parts])
+        self.rows = sum(rows for _, _, rows in parts)
+        if self.chunk_size:
+            self._frame = None
+            empty = mission_data.empty_table()[["Date", "Mission"]]
+            dated = pd.concat([empty] + [dated for dated, _, _ in parts], ignore_index=True)
+        else:
+            self._frame = mission_data.concat_tables([df for df, _, _ in parts], ignore_index=True)
+            dated = self._frame.loc[self._frame["Date"].notna(), ["Date", "Mission"]]
+        self._index = MissionIndex.from_parts(counts, dated)
+
+    @mission_timing.timed("MissionDataset.append")
+    def _append(self, signature) -> bool:
+        """Ingest only the bytes added since the last load; False if a full reload is needed."""
+        if signature is None or self._offset is None or signature[1] <= self._offset:
+            return False
+        try:
+            with open(self.path, "rb") as fh:
+                if _checksum(fh, self._offset) != self._checksum:
+                    return False
+                data = fh.read(signature[1] - self._offset)
+        except OSError:
+            return False
+        if len(data) != signature[1] - self._offset:
+            return False
+        # Without a trailing newline the last ingested row may have been
+        # extended in place rather than followed by new rows.
+        if not self._ends_with_newline and data[:1] not in (b"\n", b"\r"):
+            return False
+
+        tail = mission_data.read_rows(data)
+        tail.index = pd.RangeIndex(self.rows, self.rows + len(tail))
+        self._signature = signature
+        self._offset += len(data)
+        self._checksum = zlib.crc32(data, self._checksum)
+        self._ends_with_newline = data.endswith(b"\n")
+        if tail.empty:
+            return True
+
+        dated = tail[tail["Date"].notna()]
+        self._index = self._index.appended(MissionCounts.from_frame(tail), dated)
+        if self._frame is not None:
+            self._frame = mission_data.concat_tables([self._frame, tail])
+        self.rows += len(tail)
+        self.version += 1
+        self._tails = (self._tails + [(self.version, tail)])[-self.MAX_TAILS:]
+        return True
+
+    def reload(self) -> pd.DataFrame:
+        """Force a re-read of the CSV regardless of its on-disk signature."""
+        with self._lock:
+            self._store_signature = None
+            self._load(self._stat_signature())
+            self._write_snapshot()
+            return self._frame
+
+    @property
+    def store(self):
+        """The SQLite store for the source, built or rebuilt next to it when stale.
+
+        When the source is missing there is nothing to store, and the (empty)
+        index answers instead; both implement the same query methods.
+        """
+        signature = self._stat_signature()
+        if signature is None:
+            return self.index
+        # Threads must not build the same store concurrently or use one that is being replaced.
+        with self._lock:
+            if self._store is None or signature != self._store_signature:
+                if self._store is not None:
+                    self._store.close()
+                self._store = mission_store.load_store(self.path, self.chunk_size)
+                self._store_signature = signature
+            return self._store
+
+    def clear(self) -> None:
+        """Drop the cached frame; the next access reads the CSV again."""
+        self._frame = None
+        self._index = None
+        self._signature = None
+        self._offset = None
+        self._tails = []
+        if self._store is not None:
+            self._store.close()
+        self._store = None
+        self._store_signature = None
+
+
+class LiveDerived:
+    """A structure derived from a dataset's source, following the dataset's ``version``.
+
+    Rows appended since it was built are added with the structure's
+    ``appended(frame)``; after a full reload of the dataset it is built again.
+    Subclasses implement ``load``.
+    """
+
+    def __init__(self, csv_path: str, chunk_size: int = None, workers: int = None):
+        self.csv_path = csv_path
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.version = None
+        self._value = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Build the structure from ``csv_path``."""
+        raise NotImplementedError
+
+    def current(self, dataset: MissionDataset):
+        """The structure matching the dataset's current version."""
+        with self._lock:
+            version, tails = dataset.changes_since(self.version)
+            if tails is None:
+                self._value = self.load()
+            else:
+                for tail in tails:
+                    self._value = self._value.appended(tail)
+            self.version = version
+            return self._value
@@ -0,0 +1,230 @@
+"""
+Memory-mapped export of the typed missions table, shared between processes.
+
+``write_mapped`` lays the columns of the typed table (see mission_data.py)
+out as flat arrays in one file next to the CSV, ``<name>.mmap``
+(``missions.mmap`` inside a source directory):
+
+- ``Price``: float64, missing as NaN
+- ``Date``: int64 microseconds since the epoch, missing as NaT (int64 min)
+- categorical columns: their integer codes, plus a string table of categories
+- ``Time`` and ``Mission``: a string table of their values
+
+A string table is the UTF-8 bytes of every value back to back, int64
+offsets into them and a validity bitmap. ``attach`` maps the file read-only
+and wraps the arrays in a DataFrame without copying them, so every process
+attached to the same file shares its pages through the OS page cache: N
+dashboard replicas on a host hold one physical copy of the table, and a
+warm start maps a file instead of parsing one. Without pyarrow the text
+columns are decoded into each process; everything else is still shared.
+
+The file records the signature of the CSVs it was built from and is rebuilt
+when they change. It is written to a temporary file and renamed into place,
+so processes still attached to the old file keep a valid mapping until they
+attach again.
+
+    python mission_mmap.py [path/to/space_missions.csv]
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+import pandas as pd
+
+import mission_data
+import mission_paths
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+
+MMAP_SUFFIX = ".mmap"
+
+# Bump when the file layout changes so files written by older code are rebuilt.
+MMAP_VERSION = 1
+
+_MAGIC = b"MISSMMAP"
+_PREFIX = struct.Struct("<8sQ")  # magic, header length
+_ALIGN = 64
+
+
+def mapped_path(path: str) -> str:
+    """Path of the mapped table for a CSV, directory or glob of CSVs."""
+    return mission_paths.derived_path(path, MMAP_SUFFIX)
+
+
+def _sources_signature(path: str) -> list:
+    return mission_paths.sources_signature(path, MMAP_VERSION, mission_data.SCHEMA_VERSION)
+
+
+def _read_sources(path: str, workers: int = None) -> pd.DataFrame:
+    if mission_paths.is_multi_source(path):
+        return mission_data.load_sources(path, workers)
+    return mission_data.load_table(path)
+
+
+def _string_table(values) -> tuple:
+    """(offsets, data, validity) arrays for a sequence of str values, missing as NaN/None."""
+    valid = pd.notna(np.asarray(values, dtype=object))
+    encoded = [value.encode() if ok else b"" for value, ok in zip(values, valid)]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return offsets, data, np.packbits(valid, bitorder="little")
+
+
+def _column_buffers(series: pd.Series) -> tuple:
+    """(column description, {buffer name: array}) for one typed column."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        offsets, data, _ = _string_table(dtype.categories.tolist())
+        buffers = {"codes": series.cat.codes.to_numpy(), "offsets": offsets, "data": data}
+        return {"kind": "category", "categories": len(dtype.categories)}, buffers
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return {"kind": "datetime", "dtype": str(dtype)}, {"values": series.to_numpy().view(np.int64)}
+    if pd.api.types.is_numeric_dtype(dtype):
+        return {"kind": "numeric"}, {"values": series.to_numpy()}
+    offsets, data, validity = _string_table(series.tolist())
+    return {"kind": "string"}, {"offsets": offsets, "data": data, "validity": validity}
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def write_mapped(path: str, df: pd.DataFrame = None, workers: int = None, signature: list = None) -> str:
+    """Export the typed table for ``path`` to its mapped file and return the file's path.
+
+    ``df`` defaults to the table loaded from the sources (through their
+    Parquet sidecars when fresh). A ``df`` loaded by the caller must come
+    with the sources' signature taken before they were read.
+    """
+    if signature is None:
+        signature = _sources_signature(path)
+    if df is None:
+        df = _read_sources(path, workers)
+
+    columns, arrays, offset = [], [], 0
+    for name in df.columns:
+        column, buffers = _column_buffers(df[name])
+        column["name"] = name
+        column["buffers"] = {}
+        for key, array in buffers.items():
+            array = np.ascontiguousarray(array)
+            column["buffers"][key] = [offset, array.dtype.str, len(array)]
+            arrays.append((offset, array))
+            offset = _aligned(offset + array.nbytes)
+        columns.append(column)
+    header = json.dumps({"source": signature, "rows": len(df), "columns": columns}).encode()
+    start = _aligned(_PREFIX.size + len(header))
+
+    file_path = mapped_path(path)
+    tmp_path = mission_paths.temp_path(file_path)
+    try:
+        with open(tmp_path, "wb") as fh:
+            fh.write(_PREFIX.pack(_MAGIC, len(header)) + header)
+            for array_offset, array in arrays:
+                fh.seek(start + array_offset)
+                fh.write(array.tobytes())
+            fh.truncate(start + offset)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, file_path)
+    return file_path
+
+
+def _strings(offsets: np.ndarray, data: np.ndarray, validity: np.ndarray, rows: int):
+    """A ``str`` array over a string table, zero-copy through pyarrow when available."""
+    valid = np.unpackbits(validity, count=rows, bitorder="little").astype(bool)
+    if pa is not None:
+        nulls = rows - int(valid.sum())
+        array = pa.LargeStringArray.from_buffers(
+            rows, pa.py_buffer(offsets), pa.py_buffer(data), pa.py_buffer(validity) if nulls else None, nulls
+        )
+        return pd.array(array, dtype="str")
+    raw = data.tobytes()
+    bounds = offsets.tolist()
+    values = [raw[bounds[i]:bounds[i + 1]].decode() if valid[i] else None for i in range(rows)]
+    return pd.array(values, dtype="str")
+
+
+def _category_labels(offsets: np.ndarray, data: np.ndarray) -> pd.Index:
+    raw = data.tobytes()
+    bounds = offsets.tolist()
+    return pd.Index([raw[a:b].decode() for a, b in zip(bounds, bounds[1:])], dtype="str")
+
+
+def attach(path: str, check: bool = True):
+    """Map the exported table for ``path`` read-only, or return None if it is missing or stale.
+
+    The returned frame's columns are views of the mapping and must be treated
+    as read-only. ``check=False`` skips the comparison with the sources.
+    """
+    file_path = mapped_path(path)
+    try:
+        with open(file_path, "rb") as fh:
+            magic, length = _PREFIX.unpack(fh.read(_PREFIX.size))
+            if magic != _MAGIC:
+                return None
+            header = json.loads(fh.read(length))
+            if check and header["source"] != _sources_signature(path):
+                return None
+            # Mapping the already-open file keeps header and data consistent
+            # even if the file is replaced in the meantime.
+            mapped = np.frombuffer(mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ), dtype=np.uint8)
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+
+    start = _aligned(_PREFIX.size + length)
+    rows = header["rows"]
+
+    def buffer(column, key):
+        offset, dtype, count = column["buffers"][key]
+        dtype = np.dtype(dtype)
+        return mapped[start + offset:start + offset + count * dtype.itemsize].view(dtype)
+
+    data = {}
+    for column in header["columns"]:
+        kind = column["kind"]
+        if kind == "category":
+            categories = _category_labels(buffer(column, "offsets"), buffer(column, "data"))
+            values = pd.Categorical.from_codes(
+                buffer(column, "codes"), dtype=pd.CategoricalDtype(categories), validate=False
+            )
+        elif kind == "datetime":
+            values = buffer(column, "values").view(column["dtype"])
+        elif kind == "numeric":
+            values = buffer(column, "values")
+        else:
+            values = _strings(buffer(column, "offsets"), buffer(column, "data"), buffer(column, "validity"), rows)
+        data[column["name"]] = pd.Series(values, copy=False)
+    return pd.DataFrame(data, copy=False)
+
+
+def load_table(path: str, workers: int = None) -> pd.DataFrame:
+    """Attach the mapped table for ``path``, exporting it first if it is missing or stale."""
+    df = attach(path)
+    if df is not None:
+        return df
+    signature = _sources_signature(path)
+    df = _read_sources(path, workers)
+    try:
+        write_mapped(path, df, signature=signature)
+    except OSError:
+        return df
+    # Attach even if the sources changed while exporting: the caller loaded
+    # them as of before the change, like any other load. If the export is
+    # already gone (removed or replaced by a corrupt file), keep the frame.
+    mapped = attach(path, check=False)
+    return mapped if mapped is not None else df
+
+
+if __name__ == "__main__":
+    default = os.path.join(os.path.dirname(os.path.abspath(__file__)), "space_missions.csv")
+    print(write_mapped(sys.argv[1] if len(sys.argv) > 1 else default))
@@ -0,0 +1,104 @@
+"""
+Locating the missions CSVs and the files derived from them.
+
+Only the standard library is imported here, so callers that merely check
+whether a cached file is still fresh (see mission_snapshot.py) never pay for
+importing pandas.
+"""
+
+import glob
+import os
+
+
+def sidecar_path(csv_path: str, suffix: str = ".parquet") -> str:
+    """Path of the columnar cache that belongs to ``csv_path``.
+
+    Derived tables (e.g. the dashboard cube) use their own ``suffix`` and the
+    same freshness check as the main table.
+    """
+    return os.path.splitext(csv_path)[0] + suffix
+
+
+def is_multi_source(path: str) -> bool:
+    """Whether ``path`` names a directory or glob of CSVs rather than a single file."""
+    return os.path.isdir(path) or glob.has_magic(path)
+
+
+def resolve_sources(path: str) -> list:
+    """CSV files behind ``path``: every ``*.csv`` in a directory, a glob's CSV matches, or the file itself.
+
+    Globs are filtered to ``.csv`` files so that sidecars written next to the
+    sources never count as sources themselves.
+    """
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, "*.csv")))
+    if glob.has_magic(path):
+        return sorted(p for p in glob.glob(path) if p.endswith(".csv") and os.path.isfile(p))
+    return [path]
+
+
+def derived_path(path: str, suffix: str) -> str:
+    """Path of a file derived from a CSV, directory or glob of CSVs.
+
+    A single CSV gets a sidecar (``<name><suffix>``); multi-file sources get
+    ``missions<suffix>`` in the directory holding them.
+    """
+    if os.path.isdir(path):
+        return os.path.join(path, "missions" + suffix)
+    if glob.has_magic(path):
+        return os.path.join(os.path.dirname(path), "missions" + suffix)
+    return sidecar_path(path, suffix)
+
+
+def _source_stats(path: str, missing_ok: bool):
+    """``(source, mtime_ns, size)`` for each CSV behind ``path``."""
+    for source in resolve_sources(path):
+        try:
+            st = os.stat(source)
+        except OSError:
+            if missing_ok:
+                continue
+            raise
+        yield source, st.st_mtime_ns, st.st_size
+
+
+def stat_signature(path: str):
+    """Cheap change detector for a source, compared on every access to cached data.
+
+    ``(mtime_ns, size)`` of a single CSV (None if it is missing), or a tuple
+    of ``(path, mtime_ns, size)`` for each CSV of a multi-file source.
+    """
+    if is_multi_source(path):
+        return tuple(_source_stats(path, missing_ok=True))
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def sources_signature(path: str, *versions) -> list:
+    """Signature stored in a derived file's header: ``[*versions, [[source, mtime_ns, size], ...]]``.
+
+    Unlike ``stat_signature`` it is JSON-ready and has the same shape for one
+    CSV or many. ``versions`` identify the file's layout, so a layout change
+    also invalidates it. Raises ``OSError`` if a source is missing.
+    """
+    return [*versions, [list(stats) for stats in _source_stats(path, missing_ok=False)]]
+
+
+def temp_path(path: str) -> str:
+    """A new, uniquely named empty file next to ``path``, to build ``path`` in before ``os.replace``.
+
+    Every builder gets its own file, so concurrent builders in any thread or
+    process never write to or delete each other's partial output.
+    """
+    # Imported here: only builders need it, and it is slow next to the rest of this module.
+    import tempfile
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".",
+                                    suffix=".tmp")
+    os.close(fd)
+    # mkstemp makes the file private; caches are read by every process on the host, as before.
+    os.chmod(tmp_path, 0o644)
+    return tmp_path
@@ -0,0 +1,276 @@
+"""
+Substring search over the Mission, Rocket and Location columns.
+
+The index has two levels. Postings map every distinct lowercased value of
+the searched columns to the rows it appears in. Over those distinct values,
+each indexed once however often it repeats, a trigram index maps every
+three-byte sequence of their UTF-8 text to the values containing it.
+Trigrams running past the end of a value are padded with NUL bytes, so
+every position of a value starts one and one- or two-character words are
+found by a range of trigrams instead of a scan.
+
+A query is split into words; a row matches when each word is a substring
+of at least one of its searched columns, case-insensitively. Each word's
+candidate values are the intersection of its trigrams' value lists,
+checked against the value text, and their rows are gathered into a mask.
+
+The postings are built once per CSV version and cached next to it as
+``<name>.search.parquet``; the trigram index is rebuilt from the distinct
+values when loaded. Like mission_cube.py, a directory or glob of CSVs is
+handled per file in a process pool, a CSV can be read in chunks, and
+``LiveSearch`` follows a ``mission_dataset.MissionDataset``, adding the
+postings of appended rows instead of rebuilding: only values not seen
+before are added to the trigram index.
+
+    python mission_search.py [path/to/space_missions.csv] [query]
+"""
+
+import functools
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+import mission_data
+import mission_dataset
+import mission_paths
+
+SEARCH_COLUMNS = ["Location", "Rocket", "Mission"]
+SEARCH_SUFFIX = ".search.parquet"
+
+
+def build_postings(frame: pd.DataFrame, start: int = 0) -> pd.DataFrame:
+    """(Text, Row) pairs: each lowercased searched value and the position of its row.
+
+    Rows are numbered from ``start``. The last row is always listed, with no
+    text if it has none, so the postings also record how many rows there are.
+    """
+    rows = np.arange(start, start + len(frame), dtype=np.int64)
+    parts = [pd.DataFrame({"Text": pd.Series([], dtype="str"), "Row": rows[:0]})]
+    for col in SEARCH_COLUMNS:
+        text = frame[col].astype("str").str.lower()
+        present = text.notna().to_numpy()
+        parts.append(pd.DataFrame({"Text": text.to_numpy()[present], "Row": rows[present]}))
+    if len(frame):
+        parts.append(pd.DataFrame({"Text": pd.Series([None], dtype="str"), "Row": rows[-1:]}))
+    postings = pd.concat(parts, ignore_index=True).drop_duplicates(ignore_index=True)
+    postings["Text"] = postings["Text"].astype("category")
+    return postings
+
+
+def merge_postings(*parts: pd.DataFrame) -> pd.DataFrame:
+    """Postings of all inputs, whose rows must already be numbered apart."""
+    merged = pd.concat([part.astype({"Text": "str"}) for part in parts], ignore_index=True)
+    merged["Text"] = merged["Text"].astype("category")
+    return merged
+
+
+def row_count(postings: pd.DataFrame) -> int:
+    return int(postings["Row"].max()) + 1 if len(postings) else 0
+
+
+def build_postings_chunked(csv_path: str, chunk_size: int) -> pd.DataFrame:
+    """``build_postings`` over a CSV read ``chunk_size`` rows at a time."""
+    parts, start = [build_postings(mission_data.empty_table())], 0
+    for chunk in mission_data.iter_chunks(csv_path, chunk_size, SEARCH_COLUMNS):
+        parts.append(build_postings(chunk, start))
+        start += len(chunk)
+    return merge_postings(*parts)
+
+
+def _starts(counts: np.ndarray) -> np.ndarray:
+    """Offsets of consecutive groups of ``counts`` items, with the total appended."""
+    starts = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=starts[1:])
+    return starts
+
+
+def _trigram_pairs(texts: np.ndarray, first: int) -> tuple:
+    """(UTF-8 buffer, end of each value in it, sorted distinct ``trigram << 32 | value id``) of ``texts``.
+
+    Value ids are numbered from ``first``.
+    """
+    # Every value followed by a NUL: b"apollo 11\0soyuz\0...". The byte after
+    # a value's last byte is then NUL, and the one after that is masked to NUL.
+    text = "".join(text + "\0" for text in texts).encode()
+    data = np.frombuffer(text + b"\0", dtype=np.uint8).astype(np.int64)
+    ends = np.flatnonzero(data[:-1] == 0) + 1
+    third = np.where(data[1:-1] == 0, 0, data[2:])
+    keys = data[:-2] << 16 | data[1:-1] << 8 | third
+    owners = np.cumsum(data[:-2] == 0) - (data[:-2] == 0) + first
+    inside = data[:-2] != 0
+    pairs = np.sort(keys[inside] << 32 | owners[inside])
+    pairs = pairs[np.concatenate([[True], pairs[1:] != pairs[:-1]])] if len(pairs) else pairs
+    return text, ends, pairs
+
+
+class SearchIndex:
+    """Answers word queries from postings with a trigram index over their distinct values."""
+
+    def __init__(self, postings: pd.DataFrame):
+        self.postings = postings
+        self.rows = row_count(postings)
+        codes = postings["Text"].cat.codes.to_numpy().astype(np.int64)
+        listed = codes >= 0
+        order = np.argsort(codes[listed], kind="stable")
+        self._value_codes = codes[listed][order]
+        self._value_rows = postings["Row"].to_numpy()[listed][order]
+        self._value_starts = _starts(np.bincount(self._value_codes, minlength=len(postings["Text"].cat.categories)))
+        self._text, ends, pairs = _trigram_pairs(postings["Text"].cat.categories.to_numpy(object), 0)
+        self._text_bounds = np.concatenate([[0], ends])
+        self._set_trigrams(pairs)
+
+    def _set_trigrams(self, pairs: np.ndarray) -> None:
+        grams = pairs >> 32
+        starts = np.flatnonzero(np.concatenate([[True], grams[1:] != grams[:-1]])) if len(grams) else grams
+        self._gram_keys = grams[starts]
+        self._gram_starts = np.append(starts, len(pairs))
+        self._gram_values = pairs & 0xFFFFFFFF
+
+    def _gram_range(self, lo: int, hi: int) -> np.ndarray:
+        """Values with a trigram in [lo, hi), possibly repeated."""
+        a, b = np.searchsorted(self._gram_keys, [lo, hi])
+        return self._gram_values[self._gram_starts[a]:self._gram_starts[b]]
+
+    def _matching_values(self, word: bytes) -> np.ndarray:
+        """Ids of the distinct values containing ``word``, possibly repeated."""
+        if len(word) < 3:
+            prefix = int.from_bytes(word, "big") << 8 * (3 - len(word))
+            return self._gram_range(prefix, prefix + (1 << 8 * (3 - len(word))))
+        lists = []
+        for i in range(len(word) - 2):
+            key = int.from_bytes(word[i:i + 3], "big")
+            values = self._gram_range(key, key + 1)
+            if not len(values):
+                return values
+            lists.append(values)
+        lists.sort(key=len)
+        found = functools.reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), lists)
+        if len(word) > 3:
+            bounds = self._text_bounds
+            found = found[[self._text.find(word, bounds[v], bounds[v + 1]) != -1 for v in found.tolist()]]
+        return found
+
+    def _value_mask(self, values: np.ndarray) -> np.ndarray:
+        """Boolean row mask of the rows holding any of ``values``."""
+        mask = np.zeros(self.rows, dtype=bool)
+        begins = self._value_starts[values]
+        counts = self._value_starts[values + 1] - begins
+        if counts.sum() * 4 > len(self._value_rows):
+            # Common values (a short word): one pass over every posting beats gathering.
+            selected = np.zeros(len(self._value_starts) - 1, dtype=bool)
+            selected[values] = True
+            mask[self._value_rows[selected[self._value_codes]]] = True
+            return mask
+        gather = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts - begins, counts)
+        mask[self._value_rows[gather]] = True
+        return mask
+
+    def search(self, query: str) -> np.ndarray:
+        """Ascending positions of the rows matching every word of ``query``; empty for no words."""
+        words = [word.encode() for word in query.lower().split()]
+        if not words:
+            return np.zeros(0, dtype=np.int64)
+        mask = None
+        for word in words:
+            found = self._value_mask(self._matching_values(word))
+            mask = found if mask is None else mask & found
+        result = np.flatnonzero(mask)
+        result.flags.writeable = False
+        return result
+
+    def appended(self, frame: pd.DataFrame) -> "SearchIndex":
+        """An index that also covers ``frame``, numbered after the rows already indexed.
+
+        Only the new postings are sorted, and only values not indexed before
+        get trigrams; both are merged into copies of the existing arrays.
+        """
+        tail = build_postings(frame, self.rows)
+        if not len(tail):
+            return self
+        categories = self.postings["Text"].cat.categories
+        known = len(categories)
+        incoming = tail["Text"].cat.categories
+        lookup = categories.get_indexer(incoming)
+        fresh = incoming[lookup < 0]
+        lookup[lookup < 0] = np.arange(known, known + len(fresh))
+        tail_codes = tail["Text"].cat.codes.to_numpy()
+        codes = np.where(tail_codes >= 0, lookup[tail_codes], -1)
+
+        index = SearchIndex.__new__(SearchIndex)
+        dtype = pd.CategoricalDtype(categories.append(fresh))
+        text = pd.concat([self.postings["Text"].cat.codes, pd.Series(codes)], ignore_index=True).to_numpy()
+        index.postings = pd.DataFrame({
+            "Text": pd.Categorical.from_codes(text, dtype=dtype, validate=False),
+            "Row": np.concatenate([self.postings["Row"].to_numpy(), tail["Row"].to_numpy()]),
+        })
+        index.rows = row_count(tail)
+
+        listed = codes >= 0
+        order = np.argsort(codes[listed], kind="stable")
+        new_codes, new_rows = codes[listed][order], tail["Row"].to_numpy()[listed][order]
+        at = np.searchsorted(self._value_codes, new_codes, side="right")
+        index._value_codes = np.insert(self._value_codes, at, new_codes)
+        index._value_rows = np.insert(self._value_rows, at, new_rows)
+        counts = np.bincount(new_codes, minlength=len(dtype.categories))
+        counts[:known] += np.diff(self._value_starts)
+        index._value_starts = _starts(counts)
+
+        fresh_text, ends, pairs = _trigram_pairs(fresh.to_numpy(object), known)
+        index._text = self._text + fresh_text
+        index._text_bounds = np.concatenate([self._text_bounds, self._text_bounds[-1] + ends])
+        old_pairs = np.repeat(self._gram_keys, np.diff(self._gram_starts)) << 32 | self._gram_values
+        index._set_trigrams(np.insert(old_pairs, np.searchsorted(old_pairs, pairs), pairs))
+        return index
+
+
+def _load_postings(csv_path: str, chunk_size: int = None) -> pd.DataFrame:
+    return load_search(csv_path, chunk_size).postings
+
+
+def load_search(csv_path: str, chunk_size: int = None, workers: int = None) -> SearchIndex:
+    """Load the cached postings for ``csv_path``, rebuilding them if stale or missing.
+
+    For a directory or glob of CSVs, each file's postings are loaded (or
+    built and cached) in a pool of ``workers`` processes and renumbered in
+    path order.
+    """
+    if mission_paths.is_multi_source(csv_path):
+        load = functools.partial(_load_postings, chunk_size=chunk_size)
+        parts, start = [build_postings(mission_data.empty_table())], 0
+        for part in mission_data.parallel_map(load, mission_paths.resolve_sources(csv_path), workers):
+            parts.append(part.assign(Row=part["Row"] + start))
+            start += row_count(part)
+        return SearchIndex(merge_postings(*parts))
+    postings = mission_data.read_sidecar(csv_path, SEARCH_SUFFIX)
+    if postings is None:
+        signature = mission_data.source_signature(csv_path)
+        if chunk_size:
+            postings = build_postings_chunked(csv_path, chunk_size)
+        else:
+            postings = build_postings(mission_data.load_table(csv_path))
+        if mission_data.pq is not None:
+            try:
+                mission_data.write_sidecar(csv_path, postings, SEARCH_SUFFIX, signature)
+            except OSError:
+                pass
+    return SearchIndex(postings)
+
+
+class LiveSearch(mission_dataset.LiveDerived):
+    """The search index for a dataset's CSV, following the dataset's ``version`` (see ``LiveDerived``)."""
+
+    def load(self) -> SearchIndex:
+        return load_search(self.csv_path, self.chunk_size, self.workers)
+
+
+if __name__ == "__main__":
+    default = os.path.join(os.path.dirname(os.path.abspath(__file__)), "space_missions.csv")
+    path = sys.argv[1] if len(sys.argv) > 1 else default
+    index = load_search(path)
+    if len(sys.argv) > 2:
+        print(f"{len(index.search(sys.argv[2])):,} rows match {sys.argv[2]!r}")
+    else:
+        values = len(index.postings["Text"].cat.categories)
+        print(f"{mission_paths.sidecar_path(path, SEARCH_SUFFIX)}: {values:,} values, {index.rows:,} rows")
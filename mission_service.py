@@ -0,0 +1,259 @@
+"""
+Read-only HTTP/JSON service for the space_missions query functions.
+
+One process keeps the dataset warm in memory and answers the eight
+functions and their batch forms over HTTP, so tools no longer import
+space_missions.py and pay the CSV load themselves. Built on asyncio streams
+only; there are no dependencies beyond the standard library and the data
+layer.
+
+    python mission_service.py --port 8765
+    curl 'http://localhost:8765/getSuccessRate?companyName=NASA'
+    curl 'http://localhost:8765/getMissionsByYears?years=1969&years=2020'
+    curl 'http://localhost:8765/getMissionsByDateRanges?ranges=1969-07-01,1969-07-31'
+
+Every endpoint is ``GET /<function name>`` with the function's parameters in
+the query string; batch parameters repeat. Responses are ``{"result": ...}``.
+
+Rendered responses are kept in an LRU keyed by the data version and the
+normalized request. Each response carries an ``ETag`` hashed from its body,
+so a client revalidating with ``If-None-Match`` gets ``304 Not Modified``
+until the answer changes, from this process, a restarted one or another
+replica. Queries run in a thread pool, so a slow query does not stall other
+connections. Malformed requests get 400 and unexpected failures 500, both
+with a JSON ``{"error": ...}`` body.
+"""
+
+import argparse
+import asyncio
+import datetime
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlsplit
+
+import space_missions
+
+logger = logging.getLogger("mission_service")
+
+
+def _date(value: str) -> str:
+    """``value`` if it is an ISO date or a date and time without a timezone, as the dataset's dates are."""
+    if datetime.datetime.fromisoformat(value).tzinfo is not None:
+        raise ValueError(f"expected a date without timezone, got {value!r}")
+    return value
+
+
+def _date_range(value: str) -> tuple:
+    start, sep, end = value.partition(",")
+    if not sep:
+        raise ValueError(f"expected 'start,end', got {value!r}")
+    return _date(start), _date(end)
+
+
+# name -> (function, [(parameter, converter, repeated)])
+ENDPOINTS = {
+    "getMissionCountByCompany": (space_missions.getMissionCountByCompany, [("companyName", str, False)]),
+    "getSuccessRate": (space_missions.getSuccessRate, [("companyName", str, False)]),
+    "getMissionsByDateRange": (
+        space_missions.getMissionsByDateRange, [("startDate", _date, False), ("endDate", _date, False)]
+    ),
+    "getTopCompaniesByMissionCount": (space_missions.getTopCompaniesByMissionCount, [("n", int, False)]),
+    "getMissionStatusCount": (space_missions.getMissionStatusCount, []),
+    "getMissionsByYear": (space_missions.getMissionsByYear, [("year", int, False)]),
+    "getMostUsedRocket": (space_missions.getMostUsedRocket, []),
+    "getAverageMissionsPerYear": (
+        space_missions.getAverageMissionsPerYear, [("startYear", int, False), ("endYear", int, False)]
+    ),
+    "getMissionCountsByCompany": (space_missions.getMissionCountsByCompany, [("companies", str, True)]),
+    "getSuccessRates": (space_missions.getSuccessRates, [("companies", str, True)]),
+    "getMissionsByYears": (space_missions.getMissionsByYears, [("years", int, True)]),
+    "getMissionsByDateRanges": (space_missions.getMissionsByDateRanges, [("ranges", _date_range, True)]),
+}
+
+_REASONS = {
+    200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def parse_arguments(name: str, query: str) -> list:
+    """Convert a query string into positional arguments for endpoint ``name``."""
+    _, params = ENDPOINTS[name]
+    pairs = parse_qsl(query, keep_blank_values=True)
+    known = {param for param, _, _ in params}
+    unknown = sorted({key for key, _ in pairs} - known)
+    if unknown:
+        raise BadRequest(f"unknown parameter(s): {', '.join(unknown)}")
+    args = []
+    for param, convert, repeated in params:
+        values = [value for key, value in pairs if key == param]
+        if not repeated and len(values) != 1:
+            raise BadRequest(f"expected exactly one {param!r}")
+        try:
+            converted = [convert(value) for value in values]
+        except ValueError as exc:
+            raise BadRequest(f"invalid {param!r}: {exc}") from None
+        args.append(converted if repeated else converted[0])
+    return args
+
+
+class MissionService:
+    """Answers requests against the shared space_missions dataset."""
+
+    def __init__(self, cache_size: int = 1024):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def data_version(self) -> int:
+        """Version of the warm dataset, after picking up any change to the CSV."""
+        dataset = space_missions.get_dataset()
+        dataset.index
+        return dataset.version
+
+    @staticmethod
+    def _request_key(name: str, query: str) -> str:
+        # Parameter order across names doesn't matter; order within a repeated one does.
+        pairs = parse_qsl(query, keep_blank_values=True)
+        return name + "?" + "&".join(f"{k}={v}" for k, v in sorted(pairs, key=lambda pair: pair[0]))
+
+    def _cached(self, key):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        return None
+
+    def _store(self, key, entry: tuple) -> None:
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def respond(self, method: str, target: str, headers: dict) -> tuple:
+        """(status, extra headers, body) for one request; blocking, so run it off the event loop."""
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, _json({"error": "only GET and HEAD are supported"})
+        url = urlsplit(target)
+        name = url.path.strip("/")
+        if name == "":
+            listing = {endpoint: [param for param, _, _ in params] for endpoint, (_, params) in ENDPOINTS.items()}
+            return 200, {}, _json({"endpoints": listing})
+        if name not in ENDPOINTS:
+            return 404, {}, _json({"error": f"unknown endpoint {name!r}"})
+
+        version = self.data_version()
+        key = (version, self._request_key(name, url.query))
+        cached = self._cached(key)
+        if cached is None:
+            try:
+                args = parse_arguments(name, url.query)
+            except BadRequest as exc:
+                return 400, {}, _json({"error": str(exc)})
+            body = _json({"result": ENDPOINTS[name][0](*args)})
+            cached = ('"%s"' % hashlib.sha1(body).hexdigest(), body)
+            self._store(key, cached)
+        etag, body = cached
+        extra = {"ETag": etag, "Cache-Control": "no-cache", "X-Data-Version": str(version)}
+        if etag in [tag.strip() for tag in headers.get("if-none-match", "").split(",")]:
+            return 304, extra, b""
+        return 200, extra, body
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one connection until it closes."""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await _write(writer, 400, {"Connection": "close"}, _json({"error": "malformed request"}))
+                    break
+                try:
+                    length = int(headers.get("content-length") or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    # The body cannot be skipped, so the connection is out of step.
+                    await _write(writer, 400, {"Connection": "close"}, _json({"error": "invalid Content-Length"}))
+                    break
+                if length:
+                    await reader.readexactly(length)
+
+                try:
+                    status, extra, body = await loop.run_in_executor(None, self.respond, method, target, headers)
+                except Exception:
+                    logger.exception("%s %s failed", method, target)
+                    status, extra, body = 500, {}, _json({"error": "internal server error"})
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                extra["Connection"] = "keep-alive" if keep_alive else "close"
+                await _write(writer, status, extra, body, head_only=method == "HEAD")
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def _json(payload) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+async def _write(writer, status: int, headers: dict, body: bytes, head_only: bool = False) -> None:
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}"]
+    if status != 304:
+        lines += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+    lines += [f"{key}: {value}" for key, value in headers.items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    if status != 304 and not head_only:
+        writer.write(body)
+    await writer.drain()
+
+
+async def start_server(host: str = "127.0.0.1", port: int = 8765, cache_size: int = 1024) -> asyncio.Server:
+    """Warm the dataset and start listening; ``port=0`` picks a free port."""
+    service = MissionService(cache_size)
+    await asyncio.get_running_loop().run_in_executor(None, service.data_version)
+    return await asyncio.start_server(service.handle, host, port)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cache-size", type=int, default=1024, help="responses kept in the LRU cache")
+    parser.add_argument("--data", help="missions CSV, directory or glob (default: the shipped CSV)")
+    args = parser.parse_args()
+    if args.data:
+        space_missions.set_data_path(args.data)
+
+    async def run():
+        server = await start_server(args.host, args.port, args.cache_size)
+        print(f"serving on {', '.join(str(sock.getsockname()) for sock in server.sockets)}")
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Pre-computed answers to the count queries of space_missions, as plain JSON.
+
+Whenever ``mission_dataset.MissionDataset`` loads or appends to the table it
+writes the aggregates behind the scalar count functions (per-company mission
+and success counts, the company ranking, status counts, the most used
+rocket and missions per year) to ``<name>.snapshot.json`` next to the
+source (``missions.snapshot.json`` inside a source directory), together
+with the source's signature.
+
+A process that has not loaded the table yet, such as a short CLI or cron
+job, answers those functions from the snapshot while the source still has
+that signature, importing neither pandas nor numpy. The date-range queries
+need the rows themselves and always go through the dataset. Only the
+standard library is imported here.
+"""
+
+import itertools
+import json
+import os
+import threading
+
+import mission_paths
+
+SNAPSHOT_SUFFIX = ".snapshot.json"
+
+# Bump when the snapshot's fields change so files written by older code are ignored.
+SNAPSHOT_VERSION = 1
+
+_cache = {}  # source path -> (signature, MissionSnapshot)
+_cache_lock = threading.Lock()
+
+
+def snapshot_path(path: str) -> str:
+    """Path of the snapshot for a CSV, directory or glob of CSVs."""
+    return mission_paths.derived_path(path, SNAPSHOT_SUFFIX)
+
+
+def _plain(signature):
+    """``mission_paths.stat_signature`` in its JSON form (tuples as lists)."""
+    if signature is None:
+        return None
+    return [list(item) if isinstance(item, tuple) else item for item in signature]
+
+
+def write(path: str, signature, index) -> str:
+    """Write the snapshot of ``index``, built from ``path`` as of ``signature``; return its path."""
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "source": _plain(signature),
+        "company_counts": {company: list(counts) for company, counts in index.company_counts.items()},
+        "top_companies": index.top_companies,
+        "status_counts": index.status_counts,
+        "most_used_rocket": index.most_used_rocket,
+        "first_year": index.first_year,
+        "year_counts": [int(n) for n in index.year_counts],
+    }
+    file_path = snapshot_path(path)
+    tmp_path = mission_paths.temp_path(file_path)
+    try:
+        with open(tmp_path, "w") as fh:
+            json.dump(data, fh, separators=(",", ":"))
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, file_path)
+    return file_path
+
+
+def load(path: str):
+    """The snapshot for ``path`` if it matches the source as it is now, else None."""
+    signature = _plain(mission_paths.stat_signature(path))
+    if signature is None:
+        return None
+    with _cache_lock:
+        cached = _cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    try:
+        with open(snapshot_path(path)) as fh:
+            data = json.load(fh)
+        if data["version"] != SNAPSHOT_VERSION or data["source"] != signature:
+            return None
+        snapshot = MissionSnapshot(data)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    with _cache_lock:
+        _cache[path] = (signature, snapshot)
+    return snapshot
+
+
+def discard(path: str) -> None:
+    """Delete the snapshot for ``path`` and forget it, so the next count query loads the table."""
+    with _cache_lock:
+        _cache.pop(path, None)
+    try:
+        os.remove(snapshot_path(path))
+    except FileNotFoundError:
+        pass
+
+
+class MissionSnapshot:
+    """The count queries of ``mission_dataset.MissionIndex``, answered from a snapshot."""
+
+    def __init__(self, data: dict):
+        self.company_counts = {company: tuple(counts) for company, counts in data["company_counts"].items()}
+        self.top_companies = [tuple(pair) for pair in data["top_companies"]]
+        self.status_counts = data["status_counts"]
+        self.most_used_rocket = data["most_used_rocket"]
+        self.year_counts = data["year_counts"]
+        self.first_year = data["first_year"]
+        self.last_year = self.first_year + len(self.year_counts) - 1
+        self.year_prefix = list(itertools.accumulate(self.year_counts, initial=0))
+
+    def company_stats(self, company: str) -> tuple:
+        return self.company_counts.get(company, (0, 0))
+
+    def top_company_counts(self, n: int) -> list:
+        return self.top_companies[:n]
+
+    def mission_status_counts(self) -> dict:
+        return dict(self.status_counts)
+
+    def missions_in_year(self, year: int) -> int:
+        if year < self.first_year or year > self.last_year:
+            return 0
+        return self.year_counts[year - self.first_year]
+
+    def missions_between(self, start_year: int, end_year: int) -> int:
+        """Number of missions launched from ``start_year`` to ``end_year`` inclusive."""
+        lo = min(max(start_year, self.first_year), self.last_year + 1) - self.first_year
+        hi = min(max(end_year + 1, self.first_year), self.last_year + 1) - self.first_year
+        if hi <= lo:
+            return 0
+        return self.year_prefix[hi] - self.year_prefix[lo]
@@ -0,0 +1,279 @@
+"""
+SQLite backend for the space_missions query functions.
+
+The missions CSV (or a directory or glob of CSVs) is loaded once into an
+indexed SQLite file next to it, ``<name>.sqlite`` (``missions.sqlite`` inside
+a source directory), and ``MissionStore`` answers the query functions with
+SQL against it. Every process opens the same file read-only, so dashboard and
+worker processes share one on-disk copy and keep no table in memory.
+
+The file records the signature of the CSVs it was built from and is rebuilt
+when they change, streaming the CSVs in chunks so building it needs little
+memory. Rows keep their file order as the ``row`` primary key, which breaks
+date ties the same way as the in-memory index.
+
+    python mission_store.py [path/to/space_missions.csv]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+import pandas as pd
+
+import mission_data
+import mission_paths
+
+STORE_SUFFIX = ".sqlite"
+
+# Bump when the table layout changes so stores written by older code are rebuilt.
+STORE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE missions (
+    row INTEGER PRIMARY KEY,
+    company TEXT,
+    location TEXT,
+    date TEXT,
+    year INTEGER,
+    time TEXT,
+    rocket TEXT,
+    mission TEXT,
+    rocket_status TEXT,
+    price REAL,
+    mission_status TEXT
+);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# Created after the bulk insert, which is much faster than maintaining them row by row.
+_INDEXES = """
+CREATE INDEX missions_company ON missions (company, mission_status);
+CREATE INDEX missions_rocket ON missions (rocket);
+CREATE INDEX missions_date ON missions (date);
+CREATE INDEX missions_year ON missions (year);
+"""
+
+_COLUMNS = {
+    "company": "Company",
+    "location": "Location",
+    "time": "Time",
+    "rocket": "Rocket",
+    "mission": "Mission",
+    "rocket_status": "RocketStatus",
+    "price": "Price",
+    "mission_status": "MissionStatus",
+}
+
+# SQLite integers are 64-bit; larger Python ints are clamped before binding.
+_INT_LIMIT = 2 ** 62
+
+# Host parameters per statement allowed by every SQLite build (older ones stop at 999).
+_PARAM_LIMIT = 999
+
+
+def store_path(path: str) -> str:
+    """Path of the SQLite store for a CSV, directory or glob of CSVs."""
+    return mission_paths.derived_path(path, STORE_SUFFIX)
+
+
+def _sources_signature(path: str) -> list:
+    return mission_paths.sources_signature(path, STORE_VERSION, mission_data.SCHEMA_VERSION)
+
+
+def _records(chunk: pd.DataFrame, start: int) -> list:
+    table = pd.DataFrame({"date": chunk["Date"].dt.strftime("%Y-%m-%d"),
+                          "year": chunk["Date"].dt.year.astype("Int64")})
+    for column, source in _COLUMNS.items():
+        table[column] = chunk[source]
+    table = table.astype(object)
+    table = table.where(table.notna(), None)
+    columns = ["company", "location", "date", "year", "time", "rocket", "mission", "rocket_status", "price",
+               "mission_status"]
+    return [(start + i, *values) for i, values in enumerate(table[columns].itertuples(index=False, name=None))]
+
+
+def build_store(path: str, chunk_size: int = 100_000) -> str:
+    """Load the CSVs behind ``path`` into a fresh SQLite store and return its path."""
+    signature = _sources_signature(path)
+    db_path = store_path(path)
+    tmp_path = mission_paths.temp_path(db_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + _SCHEMA)
+        rows = 0
+        for source, _, _ in signature[2]:
+            for chunk in mission_data.iter_chunks(source, chunk_size):
+                conn.executemany("INSERT INTO missions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 _records(chunk, rows))
+                rows += len(chunk)
+        conn.executescript(_INDEXES)
+        conn.execute("INSERT INTO meta VALUES ('source', ?)", (json.dumps(signature),))
+        conn.commit()
+    except BaseException:
+        conn.close()
+        os.remove(tmp_path)
+        raise
+    conn.close()
+    os.replace(tmp_path, db_path)
+    return db_path
+
+
+def _stored_signature(db_path: str):
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            (value,) = conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        finally:
+            conn.close()
+        return json.loads(value)
+    except (sqlite3.Error, TypeError, ValueError):
+        return None
+
+
+def load_store(path: str, chunk_size: int = None) -> "MissionStore":
+    """Open the store for ``path``, building it first if it is missing or stale."""
+    db_path = store_path(path)
+    if _stored_signature(db_path) != _sources_signature(path):
+        build_store(path, chunk_size or 100_000)
+    return MissionStore(db_path)
+
+
+def _clamp(value: int) -> int:
+    return max(-_INT_LIMIT, min(value, _INT_LIMIT))
+
+
+def _day(timestamp: pd.Timestamp, ceil: bool) -> str:
+    # Launch dates are whole days, so rounding the bound inward keeps the same rows.
+    day = timestamp.ceil("D") if ceil else timestamp.floor("D")
+    return day.strftime("%Y-%m-%d")
+
+
+class MissionStore:
+    """SQL answers to the query methods of ``mission_dataset.MissionIndex``.
+
+    Connections are read-only and opened per thread; ``close`` closes all of
+    them. Whole-table rankings
+    (status counts, top companies, most used rocket) are computed once per
+    store and then reused, since the file never changes under an open store.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._connections = {}  # thread ident -> connection
+        self._connections_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._memo = {}
+
+    def _execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        ident = threading.get_ident()
+        conn = self._connections.get(ident)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+            with self._connections_lock:
+                self._connections[ident] = conn
+        return conn.execute(sql, params)
+
+    def _memoized(self, key: str, sql: str) -> list:
+        with self._lock:
+            if key not in self._memo:
+                self._memo[key] = self._execute(sql).fetchall()
+            return self._memo[key]
+
+    def close(self) -> None:
+        """Close the connections of every thread; later queries open new ones.
+
+        Queries still running on other threads fail, so close a store only
+        once it is no longer in use.
+        """
+        with self._connections_lock:
+            connections, self._connections = self._connections, {}
+        for conn in connections.values():
+            conn.close()
+
+    def company_stats(self, company: str) -> tuple:
+        missions, successes = self._execute(
+            "SELECT COUNT(*), COALESCE(SUM(mission_status = 'Success'), 0) FROM missions WHERE company = ?",
+            (company,),
+        ).fetchone()
+        return int(missions), int(successes)
+
+    def company_rows(self, companies) -> pd.DataFrame:
+        companies = list(companies)
+        names = sorted({c for c in companies if c is not None})
+        found = {}
+        for i in range(0, len(names), _PARAM_LIMIT):
+            batch = names[i:i + _PARAM_LIMIT]
+            found.update((company, (int(missions), int(successes))) for company, missions, successes in self._execute(
+                "SELECT company, COUNT(*), COALESCE(SUM(mission_status = 'Success'), 0) FROM missions "
+                f"WHERE company IN ({', '.join('?' * len(batch))}) GROUP BY company",
+                batch,
+            ))
+        stats = [found.get(c, (0, 0)) for c in companies]
+        return pd.DataFrame(stats, columns=["missions", "successes"], index=companies, dtype="int64")
+
+    def top_company_counts(self, n: int) -> list:
+        ranking = self._memoized(
+            "companies",
+            "SELECT company, COUNT(*) AS n FROM missions WHERE company IS NOT NULL "
+            "GROUP BY company ORDER BY n DESC, company",
+        )
+        return [(company, int(count)) for company, count in ranking[:n]]
+
+    def mission_status_counts(self) -> dict:
+        ranking = self._memoized(
+            "statuses",
+            "SELECT mission_status, COUNT(*) AS n FROM missions WHERE mission_status IS NOT NULL "
+            "GROUP BY mission_status ORDER BY n DESC, mission_status",
+        )
+        return {status: int(count) for status, count in ranking}
+
+    @property
+    def most_used_rocket(self) -> str:
+        ranking = self._memoized(
+            "rocket",
+            "SELECT rocket, COUNT(*) AS n FROM missions WHERE rocket IS NOT NULL "
+            "GROUP BY rocket ORDER BY n DESC, rocket LIMIT 1",
+        )
+        return ranking[0][0] if ranking else ""
+
+    def missions_in_year(self, year: int) -> int:
+        if abs(year) >= _INT_LIMIT:
+            return 0
+        return int(self._execute("SELECT COUNT(*) FROM missions WHERE year = ?", (year,)).fetchone()[0])
+
+    def missions_in_years(self, years) -> list:
+        return [self.missions_in_year(year) for year in years]
+
+    def missions_between(self, start_year: int, end_year: int) -> int:
+        """Number of missions launched from ``start_year`` to ``end_year`` inclusive."""
+        return int(self._execute(
+            "SELECT COUNT(*) FROM missions WHERE year BETWEEN ? AND ?", (_clamp(start_year), _clamp(end_year))
+        ).fetchone()[0])
+
+    def _date_query(self, start: pd.Timestamp, end: pd.Timestamp) -> sqlite3.Cursor:
+        return self._execute(
+            "SELECT mission FROM missions WHERE date BETWEEN ? AND ? ORDER BY date, row",
+            (_day(start, ceil=True), _day(end, ceil=False)),
+        )
+
+    def missions_in_dates(self, start: pd.Timestamp, end: pd.Timestamp) -> list:
+        return [mission for (mission,) in self._date_query(start, end)]
+
+    def iter_missions_in_dates(self, start: pd.Timestamp, end: pd.Timestamp, chunk_size: int):
+        cursor = self._date_query(start, end)
+        while True:
+            batch = cursor.fetchmany(chunk_size)
+            if not batch:
+                return
+            yield from (mission for (mission,) in batch)
+
+    def missions_in_date_ranges(self, bounds) -> list:
+        return [self.missions_in_dates(start, end) for start, end in bounds]
+
+
+if __name__ == "__main__":
+    default = os.path.join(os.path.dirname(os.path.abspath(__file__)), "space_missions.csv")
+    print(build_store(sys.argv[1] if len(sys.argv) > 1 else default))
@@ -0,0 +1,236 @@
+"""
+Opt-in timing of the dashboard rerun pipeline and the space_missions functions.
+
+Set ``SPACE_MISSIONS_TIMING=1`` to enable. A rerun of app.py is one *run*:
+``start_run`` begins it, ``Run.stage`` marks where each stage of the script
+starts (closing the previous one), and ``Run.finish`` ends it. Functions
+wrapped with ``timed`` and blocks wrapped in ``span`` are recorded as spans
+inside whichever stage is running on the current thread, nested by depth,
+so a slow stage can be broken down by the calls made in it.
+
+Finished runs are kept in memory (the last ``SPACE_MISSIONS_TIMING_RUNS``,
+default 20) for the dashboard's debug panel and logged as one JSON object
+per line to ``SPACE_MISSIONS_TIMING_LOG`` (default: stderr) through the
+``mission_timing`` logger. Spans outside a run, e.g. in mission_service.py,
+are logged on their own and not kept.
+
+When disabled, ``start_run`` and ``span`` return shared no-op objects and a
+``timed`` function costs one flag check per call. pandas is only imported
+to build the panel's tables, so importing this module stays cheap.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+RUNS = int(os.environ.get("SPACE_MISSIONS_TIMING_RUNS", 0)) or 20
+
+_enabled = False
+_history = deque(maxlen=RUNS)
+_history_lock = threading.Lock()
+_local = threading.local()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(on: bool = True, log_path: str = None) -> None:
+    """Turn timing on or off; ``log_path`` appends the JSON records to a file instead of stderr."""
+    import logging
+
+    global _enabled
+    _enabled = on
+    logger = logging.getLogger("mission_timing")
+    if on and (log_path is not None or not logger.handlers):
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+        handler = logging.FileHandler(log_path) if log_path else logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def _log(record: dict) -> None:
+    # logging is imported on first use: it is slower to import than everything
+    # space_missions needs to answer a count from its snapshot.
+    import logging
+
+    logger = logging.getLogger("mission_timing")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(record, separators=(",", ":")))
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+class Run:
+    """The stages and spans of one rerun on the current thread."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.time()
+        self.stages = []
+        self.spans = []
+        self._start = time.perf_counter()
+        self._stage = None  # (name, start) of the running stage
+
+    def stage(self, name: str) -> None:
+        """Start stage ``name``, ending the current one."""
+        now = time.perf_counter()
+        self._end_stage(now)
+        self._stage = (name, now)
+
+    def _end_stage(self, now: float) -> None:
+        if self._stage is not None:
+            name, start = self._stage
+            self.stages.append({"name": name, "start_ms": _ms(start - self._start), "ms": _ms(now - start)})
+            self._stage = None
+
+    def _add_span(self, name: str, start: float, end: float, depth: int) -> None:
+        self.spans.append({
+            "name": name,
+            "stage": self._stage[0] if self._stage else None,
+            "depth": depth,
+            "start_ms": _ms(start - self._start),
+            "ms": _ms(end - start),
+        })
+
+    def finish(self) -> dict:
+        """End the run, keep it in the history and log it; returns its record."""
+        now = time.perf_counter()
+        self._end_stage(now)
+        if getattr(_local, "run", None) is self:
+            _local.run = None
+        record = {
+            "run": self.name,
+            "started": self.started,
+            "thread": threading.current_thread().name,
+            "total_ms": _ms(now - self._start),
+            "stages": self.stages,
+            "spans": self.spans,
+        }
+        with _history_lock:
+            _history.append(record)
+        _log(record)
+        return record
+
+
+class _NullRun:
+    def stage(self, name: str) -> None:
+        pass
+
+    def finish(self):
+        return None
+
+
+_NULL_RUN = _NullRun()
+
+
+def start_run(name: str = "app"):
+    """Begin a run on this thread, replacing any unfinished one (e.g. a rerun cut short)."""
+    if not _enabled:
+        return _NULL_RUN
+    run = Run(name)
+    _local.run = run
+    return run
+
+
+class _Span:
+    __slots__ = ("name", "_start", "_depth")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self._depth = getattr(_local, "depth", 0)
+        _local.depth = self._depth + 1
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        _local.depth = self._depth
+        run = getattr(_local, "run", None)
+        if run is not None:
+            run._add_span(self.name, self._start, end, self._depth)
+        else:
+            _log({"span": self.name, "started": time.time() - (end - self._start), "ms": _ms(end - self._start)})
+        return False
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str):
+    """Context manager recording the enclosed block as span ``name``."""
+    return _Span(name) if _enabled else _NULL_SPAN
+
+
+def timed(name: str = None):
+    """Decorator recording every call of the function as a span (default name: its qualified name)."""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def history() -> list:
+    """Records of the last finished runs, oldest first."""
+    with _history_lock:
+        return list(_history)
+
+
+def clear_history() -> None:
+    with _history_lock:
+        _history.clear()
+
+
+def stage_table(records: list = None):
+    """One row per run, newest first: total and per-stage milliseconds."""
+    import pandas as pd
+
+    records = history() if records is None else records
+    rows = []
+    for record in reversed(records):
+        row = {"started": pd.Timestamp(record["started"], unit="s").strftime("%H:%M:%S"),
+               "total": record["total_ms"]}
+        for stage in record["stages"]:
+            row[stage["name"]] = row.get(stage["name"], 0) + stage["ms"]
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def span_table(record: dict):
+    """Spans of one run summed by stage and name, slowest first."""
+    import pandas as pd
+
+    spans = pd.DataFrame(record["spans"], columns=["name", "stage", "depth", "start_ms", "ms"])
+    summary = spans.groupby(["stage", "name"], dropna=False, sort=False)["ms"].agg(calls="size", ms="sum")
+    return summary.sort_values("ms", ascending=False).reset_index()
+
+
+if os.environ.get("SPACE_MISSIONS_TIMING", "") not in ("", "0"):
+    enable(log_path=os.environ.get("SPACE_MISSIONS_TIMING_LOG"))
@@ -1,60 +1,208 @@
 """
 Space Missions Data Analysis Functions
 8 functions for programmatic grading.
+
+Importing this module is cheap: pandas and the dataset (mission_dataset.py)
+are only imported on first data access. Until then, the scalar count
+functions are answered from the JSON snapshot written by the last load of
+the same CSV (mission_snapshot.py) while it is still fresh, so a short job
+that only needs a count never imports pandas at all.
 """
 
+import importlib
 import os
-import pandas as pd
+import threading
+from typing import TYPE_CHECKING
+
+import mission_snapshot
+import mission_timing
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+    from mission_analytics import MissionAnalytics
+    from mission_dataset import MissionDataset, MissionIndex
+    from mission_search import SearchIndex
 
 _DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "space_missions.csv")
 
+# Arguments of the shared dataset, created on first access by get_dataset().
+_SOURCE = {
+    "path": os.environ.get("SPACE_MISSIONS_PATH", _DATA_PATH),
+    "chunk_size": int(os.environ.get("SPACE_MISSIONS_CHUNK_SIZE", 0)) or None,
+    "workers": int(os.environ.get("SPACE_MISSIONS_WORKERS", 0)) or None,
+    "shared": os.environ.get("SPACE_MISSIONS_MMAP", "") not in ("", "0"),
+}
+_DATASET = None
+_DATASET_LOCK = threading.Lock()
+_SEARCH = None  # mission_search.LiveSearch over the shared dataset's source
+_ANALYTICS = None  # mission_analytics.LiveAnalytics, likewise
+
+# Names that used to live here, now resolved lazily from the data layer.
+_LAZY_MODULES = ("mission_data", "mission_dataset", "mission_mmap", "mission_store")
+_LAZY_NAMES = ("MissionCounts", "MissionIndex", "MissionDataset", "QUERY_COLUMNS")
+
+
+def __getattr__(name: str):
+    if name in _LAZY_MODULES:
+        return importlib.import_module(name)
+    if name in _LAZY_NAMES:
+        return getattr(importlib.import_module("mission_dataset"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# "pandas" answers from the in-memory MissionIndex; "sqlite" from a shared
+# on-disk mission_store.MissionStore.
+BACKENDS = ("pandas", "sqlite")
+_BACKEND = os.environ.get("SPACE_MISSIONS_BACKEND", "pandas")
+
+
+def set_backend(name: str) -> None:
+    """Select the backend that answers the query functions: one of ``BACKENDS``."""
+    global _BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"unknown backend {name!r}; expected one of {BACKENDS}")
+    _BACKEND = name
+
+
+def set_data_path(path: str, chunk_size: int = None, workers: int = None, shared: bool = False) -> None:
+    """Point the shared dataset at another missions CSV, directory or glob, optionally ingested in chunks."""
+    global _ANALYTICS, _DATASET, _SEARCH, _SOURCE
+    _SOURCE = {"path": path, "chunk_size": chunk_size, "workers": workers, "shared": shared}
+    _DATASET = None
+    _SEARCH = None
+    _ANALYTICS = None
+
+
+def reload() -> "pd.DataFrame":
+    """Re-read the missions CSV into the shared cache and return the new frame."""
+    return get_dataset().reload()
+
+
+def clear_cache() -> None:
+    """Discard the shared cached dataset."""
+    if _DATASET is not None:
+        _DATASET.clear()
+
+
+def _load_data() -> "pd.DataFrame":
+    """Return the cached, parsed space missions data."""
+    return get_dataset().frame
+
+
+def get_dataset() -> "MissionDataset":
+    """Return the shared dataset, e.g. to follow its ``version`` in derived caches."""
+    global _DATASET
+    if _DATASET is None:
+        with _DATASET_LOCK:
+            if _DATASET is None:
+                from mission_dataset import MissionDataset
+
+                _DATASET = MissionDataset(**_SOURCE)
+    return _DATASET
+
+
+def get_index() -> "MissionIndex":
+    """Return the aggregate index of the cached dataset."""
+    return get_dataset().index
+
+
+def get_search() -> "SearchIndex":
+    """Return the text search index of the cached dataset, following its appends."""
+    global _SEARCH
+    dataset = get_dataset()
+    if _SEARCH is None:
+        with _DATASET_LOCK:
+            if _SEARCH is None:
+                from mission_search import LiveSearch
+
+                _SEARCH = LiveSearch(dataset.path, dataset.chunk_size, dataset.workers)
+    return _SEARCH.current(dataset)
+
+
+def get_analytics() -> "MissionAnalytics":
+    """Return the trend analytics (mission_analytics.py) of the cached dataset, following its appends."""
+    global _ANALYTICS
+    dataset = get_dataset()
+    if _ANALYTICS is None:
+        with _DATASET_LOCK:
+            if _ANALYTICS is None:
+                from mission_analytics import LiveAnalytics
+
+                _ANALYTICS = LiveAnalytics(dataset.path, dataset.chunk_size, dataset.workers)
+    return _ANALYTICS.current(dataset)
+
+
+def get_backend():
+    """Return the object answering the query functions for the selected backend."""
+    if _BACKEND == "sqlite":
+        return get_dataset().store
+    return get_dataset().index
+
 
-def _load_data() -> pd.DataFrame:
-    """Load and parse the space missions CSV data."""
-    if not os.path.exists(_DATA_PATH):
-        return pd.DataFrame(columns=["Company", "Location", "Date", "Time", "Rocket", "Mission", "RocketStatus", "Price", "MissionStatus"])
-    df = pd.read_csv(_DATA_PATH)
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-    return df
+def _count_backend():
+    """Backend for the scalar count functions: a fresh snapshot until the table is loaded here."""
+    if _BACKEND == "pandas" and (_DATASET is None or not _DATASET.loaded):
+        snapshot = mission_snapshot.load(_DATASET.path if _DATASET is not None else _SOURCE["path"])
+        if snapshot is not None:
+            return snapshot
+    return get_backend()
 
 
+@mission_timing.timed()
 def getMissionCountByCompany(companyName: str) -> int:
     """Returns the total number of missions for a given company."""
     if not isinstance(companyName, str):
         return 0
-    df = _load_data()
-    return int((df["Company"] == companyName).sum())
+    return _count_backend().company_stats(companyName)[0]
 
 
+@mission_timing.timed()
 def getSuccessRate(companyName: str) -> float:
     """Calculates the success rate for a given company as a percentage (0-100), rounded to 2 decimal places."""
     if not isinstance(companyName, str):
         return 0.0
-    df = _load_data()
-    company_missions = df[df["Company"] == companyName]
-    if company_missions.empty:
+    total, successes = _count_backend().company_stats(companyName)
+    if total == 0:
         return 0.0
-    successes = (company_missions["MissionStatus"] == "Success").sum()
-    return round(float(successes / len(company_missions) * 100), 2)
+    return round(float(successes / total * 100), 2)
 
 
-def getMissionsByDateRange(startDate: str, endDate: str) -> list:
-    """Returns mission names launched between startDate and endDate (inclusive), sorted chronologically."""
+def _date_bounds(startDate, endDate):
+    """Validate a date range and return it as (start, end) timestamps, or None."""
     if not isinstance(startDate, str) or not isinstance(endDate, str):
-        return []
+        return None
+    import pandas as pd
+
     try:
         start = pd.to_datetime(startDate)
         end = pd.to_datetime(endDate)
     except (ValueError, TypeError):
-        return []
+        return None
     if start > end:
+        return None
+    return start, end
+
+
+@mission_timing.timed()
+def getMissionsByDateRange(startDate: str, endDate: str) -> list:
+    """Returns mission names launched between startDate and endDate (inclusive), sorted chronologically."""
+    bounds = _date_bounds(startDate, endDate)
+    if bounds is None:
         return []
-    df = _load_data()
-    mask = (df["Date"] >= start) & (df["Date"] <= end)
-    filtered = df[mask].sort_values("Date")
-    return filtered["Mission"].tolist()
+    return get_backend().missions_in_dates(*bounds)
 
 
+def iterMissionsByDateRange(startDate: str, endDate: str, chunk_size: int = 10_000):
+    """Yields the same mission names as getMissionsByDateRange without building the full list."""
+    bounds = _date_bounds(startDate, endDate)
+    if bounds is None:
+        return
+    yield from get_backend().iter_missions_in_dates(*bounds, chunk_size)
+
+
+@mission_timing.timed()
 def getTopCompaniesByMissionCount(n: int) -> list:
     """Returns top N companies ranked by total number of missions.
     Returns list of tuples: [(companyName, missionCount), ...].
@@ -62,41 +210,32 @@ def getTopCompaniesByMissionCount(n: int) -> list:
     """
     if not isinstance(n, int) or n <= 0:
         return []
-    df = _load_data()
-    if df.empty:
-        return []
-    counts = df.groupby("Company").size().reset_index(name="count")
-    counts = counts.sort_values(["count", "Company"], ascending=[False, True])
-    return [(row["Company"], int(row["count"])) for _, row in counts.head(n).iterrows()]
+    return _count_backend().top_company_counts(n)
 
 
+@mission_timing.timed()
 def getMissionStatusCount() -> dict:
     """Returns the count of missions for each mission status."""
-    df = _load_data()
-    return {status: int(count) for status, count in df["MissionStatus"].value_counts().items()}
+    return _count_backend().mission_status_counts()
 
 
+@mission_timing.timed()
 def getMissionsByYear(year: int) -> int:
     """Returns the total number of missions launched in a specific year."""
     if not isinstance(year, int):
         return 0
-    df = _load_data()
-    return int((df["Date"].dt.year == year).sum())
+    return _count_backend().missions_in_year(year)
 
 
+@mission_timing.timed()
 def getMostUsedRocket() -> str:
     """Returns the name of the most frequently used rocket.
     If multiple rockets are tied, returns the first one alphabetically.
     """
-    df = _load_data()
-    if df.empty:
-        return ""
-    counts = df.groupby("Rocket").size().reset_index(name="count")
-    max_count = counts["count"].max()
-    top_rockets = counts[counts["count"] == max_count]
-    return str(top_rockets.sort_values("Rocket").iloc[0]["Rocket"])
+    return _count_backend().most_used_rocket
 
 
+@mission_timing.timed()
 def getAverageMissionsPerYear(startYear: int, endYear: int) -> float:
     """Calculates the average number of missions per year over a given range (inclusive), rounded to 2 decimal places."""
     if not isinstance(startYear, int) or not isinstance(endYear, int):
@@ -104,7 +243,75 @@ def getAverageMissionsPerYear(startYear: int, endYear: int) -> float:
     num_years = endYear - startYear + 1
     if num_years <= 0:
         return 0.0
-    df = _load_data()
-    mask = (df["Date"].dt.year >= startYear) & (df["Date"].dt.year <= endYear)
-    total_missions = int(mask.sum())
+    total_missions = _count_backend().missions_between(startYear, endYear)
     return round(float(total_missions / num_years), 2)
+
+
+@mission_timing.timed()
+def searchMissions(query: str) -> "np.ndarray":
+    """Returns the ascending row ids of missions whose Mission, Rocket or Location contains
+    every word of the query, case-insensitively. Row ids are positions in the dataset's rows,
+    so they can be intersected with other row selections; an empty query matches nothing.
+    """
+    if not isinstance(query, str):
+        query = ""
+    return get_search().search(query)
+
+
+# ---------------------------------------------------------------------------
+# Batch variants: answer a whole list of inputs in one pass over the index.
+# Results are aligned with the input and match the scalar functions exactly;
+# like them, they never raise: a malformed entry gets the scalar function's
+# empty answer, and an argument that is not a batch counts as an empty one.
+# ---------------------------------------------------------------------------
+def _batch(values) -> list:
+    if isinstance(values, (str, bytes)):
+        return []
+    try:
+        return list(values)
+    except TypeError:
+        return []
+
+
+def _range_bounds(entry):
+    try:
+        startDate, endDate = entry
+    except (TypeError, ValueError):
+        return None
+    return _date_bounds(startDate, endDate)
+
+
+def _company_rows(companies) -> "pd.DataFrame":
+    return get_backend().company_rows([c if isinstance(c, str) else None for c in _batch(companies)])
+
+
+@mission_timing.timed()
+def getMissionCountsByCompany(companies) -> list:
+    """Batch form of getMissionCountByCompany."""
+    return [int(n) for n in _company_rows(companies)["missions"]]
+
+
+@mission_timing.timed()
+def getSuccessRates(companies) -> list:
+    """Batch form of getSuccessRate."""
+    rows = _company_rows(companies)
+    totals = rows["missions"].to_numpy()
+    rates = (rows["successes"] / rows["missions"].clip(lower=1) * 100).to_numpy()
+    return [round(float(rate), 2) if total else 0.0 for rate, total in zip(rates, totals)]
+
+
+@mission_timing.timed()
+def getMissionsByYears(years) -> list:
+    """Batch form of getMissionsByYear."""
+    years = _batch(years)
+    valid = [isinstance(y, int) for y in years]
+    counts = iter(get_backend().missions_in_years([y for y, ok in zip(years, valid) if ok]))
+    return [next(counts) if ok else 0 for ok in valid]
+
+
+@mission_timing.timed()
+def getMissionsByDateRanges(ranges) -> list:
+    """Batch form of getMissionsByDateRange; ``ranges`` is a sequence of (startDate, endDate)."""
+    bounds = [_range_bounds(entry) for entry in _batch(ranges)]
+    found = iter(get_backend().missions_in_date_ranges([b for b in bounds if b is not None]))
+    return [next(found) if b is not None else [] for b in bounds]
@@ -0,0 +1,139 @@
+"""
+Synthetic ``space_missions.csv``-shaped data at arbitrary scale.
+
+``MissionModel.fit`` learns from the shipped CSV:
+
+- launches per year (the share of all missions that fall in each year),
+- per year, the joint distribution of launch profiles, i.e. (Company,
+  Location, Rocket, RocketStatus, Price, MissionStatus) combinations, so
+  company/rocket/site/status mixes and their correlations follow the era,
+- the distribution of launch times, including missing ones.
+
+``generate`` streams rows in chronological chunks of at most ``chunk_size``,
+so memory stays constant however many rows are requested, and the output is
+reproducible for a given seed and chunk size. Values are written exactly as
+they appear in the source (same columns, ``Price`` strings such as
+``"1,160.00"``, CSV quoting), so generated files load through the normal path.
+
+    python synthetic_missions.py out.csv --rows 5000000 --seed 42
+    python synthetic_missions.py out.parquet --rows 5000000 --format parquet
+"""
+
+import argparse
+import calendar
+import os
+
+import numpy as np
+import pandas as pd
+
+import mission_data
+
+PROFILE_COLUMNS = ["Company", "Location", "Rocket", "RocketStatus", "Price", "MissionStatus"]
+DEFAULT_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "space_missions.csv")
+
+
+class MissionModel:
+    """Empirical distributions fitted from a missions CSV."""
+
+    def __init__(self, years, year_weights, profiles, profile_weights, times, time_weights):
+        self.years = years
+        self.year_weights = year_weights
+        self.profiles = profiles  # year -> DataFrame of PROFILE_COLUMNS
+        self.profile_weights = profile_weights  # year -> probabilities aligned with profiles[year]
+        self.times = times
+        self.time_weights = time_weights
+
+    @classmethod
+    def fit(cls, csv_path: str = DEFAULT_SOURCE) -> "MissionModel":
+        raw = pd.read_csv(csv_path, dtype="str", keep_default_na=False)
+        year = pd.to_datetime(raw["Date"], errors="coerce").dt.year
+        raw = raw[year.notna()]
+        year = year[year.notna()].astype(int)
+
+        year_counts = year.value_counts().sort_index()
+        profiles, profile_weights = {}, {}
+        for y, group in raw.groupby(year):
+            counts = group.groupby(PROFILE_COLUMNS, sort=True).size()
+            profiles[int(y)] = counts.index.to_frame(index=False)
+            profile_weights[int(y)] = (counts / counts.sum()).to_numpy()
+
+        time_counts = raw["Time"].value_counts().sort_index()
+        return cls(
+            years=year_counts.index.to_numpy(dtype=int),
+            year_weights=(year_counts / year_counts.sum()).to_numpy(),
+            profiles=profiles,
+            profile_weights=profile_weights,
+            times=time_counts.index.to_numpy(dtype=object),
+            time_weights=(time_counts / time_counts.sum()).to_numpy(),
+        )
+
+    def generate(self, rows: int, seed: int = 0, chunk_size: int = 100_000):
+        """Yield DataFrames of at most ``chunk_size`` rows, ``rows`` in total, in date order."""
+        rng = np.random.default_rng(seed)
+        year_rows = rng.multinomial(rows, self.year_weights)
+        serial = 0
+        for year, n_year in zip(self.years, year_rows):
+            if n_year == 0:
+                continue
+            days = 366 if calendar.isleap(int(year)) else 365
+            # Cumulative launches per day; row i of the year falls on the day
+            # whose cumulative count first exceeds i.
+            day_ends = np.cumsum(rng.multinomial(n_year, np.full(days, 1 / days)))
+            first_day = np.datetime64(f"{int(year)}-01-01")
+            profiles = self.profiles[int(year)]
+            for start in range(0, n_year, chunk_size):
+                stop = min(start + chunk_size, n_year)
+                day = np.searchsorted(day_ends, np.arange(start, stop), side="right")
+                picks = rng.choice(len(profiles), size=stop - start, p=self.profile_weights[int(year)])
+                chunk = profiles.iloc[picks].reset_index(drop=True)
+                chunk.insert(2, "Date", np.datetime_as_string(first_day + day, unit="D"))
+                chunk.insert(3, "Time", rng.choice(self.times, size=stop - start, p=self.time_weights))
+                chunk.insert(5, "Mission", [f"Synthetic-{i}" for i in range(serial, serial + stop - start)])
+                serial += stop - start
+                yield chunk[mission_data.COLUMNS]
+
+
+def write_csv(path: str, rows: int, seed: int = 0, chunk_size: int = 100_000, model: MissionModel = None) -> None:
+    """Stream ``rows`` synthetic missions to a CSV with the source's schema and quoting."""
+    model = model or MissionModel.fit()
+    with open(path, "w", newline="") as fh:
+        fh.write(",".join(mission_data.COLUMNS) + "\n")
+        for chunk in model.generate(rows, seed, chunk_size):
+            chunk.to_csv(fh, header=False, index=False)
+
+
+def write_parquet(path: str, rows: int, seed: int = 0, chunk_size: int = 100_000, model: MissionModel = None) -> None:
+    """Stream ``rows`` synthetic missions to Parquet, one row group per chunk, in the typed schema."""
+    if mission_data.pq is None:
+        raise RuntimeError("pyarrow is required to write Parquet output")
+    pa, pq = mission_data.pa, mission_data.pq
+    model = model or MissionModel.fit()
+    writer = None
+    try:
+        for chunk in model.generate(rows, seed, chunk_size):
+            chunk = mission_data.apply_schema(chunk.replace("", None))
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output")
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--source", default=DEFAULT_SOURCE, help="CSV to fit the distributions from")
+    args = parser.parse_args()
+
+    writer = write_parquet if args.format == "parquet" else write_csv
+    writer(args.output, args.rows, args.seed, args.chunk_size, MissionModel.fit(args.source))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Tests for chart_data.py: downsampling, binning, render mode and the figure cache.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import chart_data
+
+
+class TestLttb:
+    def test_short_series_kept(self):
+        assert chart_data.lttb(np.arange(5), np.arange(5), 10).tolist() == [0, 1, 2, 3, 4]
+
+    def test_budget_and_order(self):
+        x = np.arange(10_000)
+        y = np.random.default_rng(0).normal(size=len(x))
+        kept = chart_data.lttb(x, y, 500)
+        assert len(kept) == 500
+        assert kept[0] == 0 and kept[-1] == len(x) - 1
+        assert np.all(np.diff(kept) > 0)
+
+    def test_keeps_spikes(self):
+        y = np.zeros(10_000)
+        y[[1234, 7777]] = [50, -50]
+        kept = chart_data.lttb(np.arange(len(y)), y, 100)
+        assert {1234, 7777} <= set(kept.tolist())
+
+
+class TestBinning:
+    @pytest.mark.parametrize("year_range, expected", [
+        ((2020, 2022), "day"),
+        ((2010, 2022), "month"),
+        ((1957, 2022), "month"),
+        ((1800, 2022), "year"),
+    ])
+    def test_choose_bin(self, year_range, expected):
+        assert chart_data.choose_bin(year_range, 2000) == expected
+
+    @pytest.mark.parametrize("binning", ["day", "month", "year"])
+    def test_counts_match_rows(self, frame, binning):
+        selected = frame[frame["Date"].dt.year.between(2015, 2019)]
+        failed = (selected["MissionStatus"] != "Success").to_numpy()
+        table = chart_data.timeline(selected["Date"], failed, (2015, 2019), binning, budget=10_000)
+        assert len(table) == {"day": 1826, "month": 60, "year": 5}[binning]
+        assert table["Launches"].sum() == len(selected)
+        assert table["Failures"].sum() == failed.sum()
+        assert table["Date"].is_monotonic_increasing
+
+    def test_empty_bins_filled(self, frame):
+        table = chart_data.timeline(frame["Date"].iloc[:0], np.zeros(0, dtype=bool), (2030, 2031), "month")
+        assert len(table) == 24 and table["Launches"].sum() == 0
+
+    def test_forced_bin_downsampled(self, frame):
+        failed = (frame["MissionStatus"] != "Success").to_numpy()
+        table = chart_data.timeline(frame["Date"], failed, (1957, 2022), "day", budget=1000)
+        assert len(table) == 1000
+
+
+class TestPoints:
+    def test_priced_and_sorted(self, frame):
+        points = chart_data.launch_points(frame)
+        assert len(points) == (frame["Date"].notna() & frame["Price"].notna()).sum()
+        assert points["Date"].is_monotonic_increasing
+
+    def test_downsampled(self, frame):
+        points = chart_data.launch_points(frame, budget=100)
+        assert len(points) == 100
+        assert points["Price"].max() == frame["Price"].max()
+
+    def test_render_mode(self):
+        assert chart_data.render_mode(1000, 1000) == "svg"
+        assert chart_data.render_mode(1001, 1000) == "webgl"
+
+
+class TestFigureCache:
+    def test_rebuilt_only_on_change(self):
+        cache = chart_data.FigureCache()
+        builds = []
+        data = pd.DataFrame({"Year": [2020, 2021], "Missions": [3, 4]})
+
+        def build(d):
+            builds.append(d)
+            return object()
+
+        first = cache.figure("yearly", data, build)
+        assert cache.figure("yearly", data.copy(), build) is first
+        assert cache.figure("other", data, build) is not first
+        assert cache.figure("yearly", data.assign(Missions=[3, 5]), build) is not first
+        assert cache.figure("yearly", data.set_axis(["a", "b"]), build) is not first
+        assert len(builds) == 4
+
+    def test_bounded(self):
+        cache = chart_data.FigureCache(cache_size=2)
+        for n in range(3):
+            cache.figure("chart", pd.DataFrame({"n": [n]}), lambda d: d)
+        assert len(cache._cache) == 2
@@ -0,0 +1,84 @@
+"""
+Tests for dashboard_aggregates.py against the row-level computations the
+dashboard used to run directly on the filtered frame.
+"""
+
+import pandas as pd
+import pytest
+
+import mission_data
+from dashboard_aggregates import aggregate
+from filter_engine import FilterEngine
+from space_missions import _DATA_PATH
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return FilterEngine(mission_data.read_csv(_DATA_PATH))
+
+
+FILTERS = [
+    ((1957, 2022), (), (), ()),
+    ((1965, 1975), (), (), ()),
+    ((1957, 2022), ("SpaceX", "NASA", "CASC"), (), ()),
+    ((2000, 2022), (), ("Failure",), ("Active",)),
+    ((2030, 2040), (), (), ()),
+]
+
+
+def _row_level(filtered: pd.DataFrame) -> dict:
+    total = len(filtered)
+    successes = int((filtered["MissionStatus"] == "Success").sum())
+    company_counts = filtered["Company"].astype("str").value_counts()
+    return {
+        "total": total,
+        "successes": successes,
+        "unique_companies": filtered["Company"].nunique(),
+        "unique_rockets": filtered["Rocket"].nunique(),
+        "yearly": filtered.groupby(filtered["Date"].dt.year).size().to_dict(),
+        "status": filtered["MissionStatus"].astype("str").value_counts().to_dict(),
+        "companies": company_counts.to_dict(),
+        "rockets": filtered["Rocket"].astype("str").value_counts().to_dict(),
+    }
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_matches_row_level_results(engine, filters):
+    filtered = engine.view(*filters)
+    expected = _row_level(filtered)
+    agg = aggregate(filtered)
+
+    assert agg.total == expected["total"]
+    assert agg.successes == expected["successes"]
+    assert agg.success_rate == (round(agg.successes / agg.total * 100, 2) if agg.total else 0.0)
+    assert agg.unique_companies == expected["unique_companies"]
+    assert agg.unique_rockets == expected["unique_rockets"]
+    assert dict(zip(agg.yearly["Year"], agg.yearly["Missions"])) == expected["yearly"]
+    assert dict(zip(agg.status_counts["Status"], agg.status_counts["Count"])) == expected["status"]
+    for company, missions in zip(agg.top_companies["Company"], agg.top_companies["Missions"]):
+        assert expected["companies"][company] == missions
+    for rocket, launches in zip(agg.top_rockets["Rocket"], agg.top_rockets["Launches"]):
+        assert expected["rockets"][rocket] == launches
+
+
+def test_top_companies_success_rates(engine):
+    filtered = engine.view((1957, 2022))
+    agg = aggregate(filtered)
+    assert len(agg.top_companies) == 10
+    for company, rate in zip(agg.top_companies["Company"], agg.top_companies["Success Rate (%)"]):
+        rows = filtered[filtered["Company"] == company]
+        assert rate == round(int((rows["MissionStatus"] == "Success").sum()) / len(rows) * 100, 2)
+
+
+def test_rankings_descending_with_alphabetical_ties(engine):
+    agg = aggregate(engine.view((1957, 2022)))
+    ranked = list(zip(-agg.top_rockets["Launches"], agg.top_rockets["Rocket"]))
+    assert ranked == sorted(ranked)
+    assert agg.top_rockets["Rocket"].iloc[0] == "Cosmos-3M (11K65M)"
+
+
+def test_empty_selection(engine):
+    agg = aggregate(engine.view((2030, 2040)))
+    assert agg.total == 0
+    assert agg.success_rate == 0.0
+    assert agg.yearly.empty and agg.top_companies.empty and agg.top_rockets.empty
@@ -0,0 +1,106 @@
+"""
+Tests for filter_engine.py: index-based filtering must match boolean masks.
+"""
+
+import numpy as np
+import pytest
+
+import mission_data
+from filter_engine import FilterEngine, page_bounds, page_count
+from space_missions import _DATA_PATH
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return mission_data.read_csv(_DATA_PATH)
+
+
+@pytest.fixture
+def engine(frame):
+    return FilterEngine(frame, cache_size=4)
+
+
+def _mask_filter(df, year_range, companies=(), statuses=(), rocket_statuses=()):
+    year = df["Date"].dt.year
+    mask = (year >= year_range[0]) & (year <= year_range[1])
+    if companies:
+        mask &= df["Company"].isin(companies)
+    if statuses:
+        mask &= df["MissionStatus"].isin(statuses)
+    if rocket_statuses:
+        mask &= df["RocketStatus"].isin(rocket_statuses)
+    return np.flatnonzero(mask.to_numpy())
+
+
+CASES = [
+    ((1957, 2022), (), (), ()),
+    ((1960, 1970), (), (), ()),
+    ((1957, 2022), ("SpaceX", "NASA"), (), ()),
+    ((1990, 2010), ("CASC",), ("Success",), ()),
+    ((1957, 2022), (), ("Failure", "Partial Failure"), ("Active",)),
+    ((2000, 2005), ("RVSN USSR",), (), ()),
+    ((1957, 2022), ("NoSuchCompany",), (), ()),
+    ((2030, 2040), (), (), ()),
+]
+
+
+class TestFilterEngine:
+    @pytest.mark.parametrize("year_range,companies,statuses,rocket_statuses", CASES)
+    def test_matches_boolean_masks(self, frame, engine, year_range, companies, statuses, rocket_statuses):
+        expected = _mask_filter(frame, year_range, companies, statuses, rocket_statuses)
+        np.testing.assert_array_equal(engine.rows(year_range, companies, statuses, rocket_statuses), expected)
+
+    def test_view_preserves_row_order(self, frame, engine):
+        view = engine.view((1957, 2022), ["SpaceX"])
+        assert view.index.is_monotonic_increasing
+        assert (view["Company"] == "SpaceX").all()
+
+    def test_result_is_memoized(self, engine):
+        first = engine.rows((1990, 2000), ["NASA", "CASC"])
+        assert engine.rows((1990, 2000), ["CASC", "NASA"]) is first
+
+    def test_cache_is_bounded(self, engine):
+        for year in range(1960, 1970):
+            engine.rows((year, year))
+        assert len(engine._cache) == engine.cache_size
+
+    def test_results_are_read_only(self, engine):
+        with pytest.raises(ValueError):
+            engine.rows((1957, 2022))[0] = 1
+
+    def test_values(self, engine):
+        assert engine.values("RocketStatus") == ["Active", "Retired"]
+        assert {"Success", "Failure"} <= set(engine.values("MissionStatus"))
+
+
+class TestPagination:
+    @pytest.mark.parametrize("column", ["Date", "Company", "Price", "Mission"])
+    @pytest.mark.parametrize("ascending", [True, False])
+    def test_sorted_rows_match_sort_values(self, frame, engine, column, ascending):
+        rows = engine.rows((1980, 2000), statuses=["Success"])
+        expected = (
+            frame.iloc[rows].reset_index(drop=True)[column]
+            .sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+        )
+        np.testing.assert_array_equal(engine.sorted_rows(rows, column, ascending), rows[expected])
+
+    def test_unsorted_keeps_row_order(self, engine):
+        rows = engine.rows((1957, 2022))
+        assert engine.sorted_rows(rows) is rows
+
+    def test_page_slices(self, frame, engine):
+        rows = engine.rows((1957, 2022), ["NASA"])
+        page = engine.page(rows, 2, 50, "Date", ascending=False)
+        full = frame.iloc[engine.sorted_rows(rows, "Date", ascending=False)]
+        assert page.equals(full.iloc[50:100])
+
+    def test_page_is_clamped(self, engine):
+        rows = engine.rows((1957, 2022), ["NASA"])
+        assert engine.page(rows, 10_000, 50).equals(engine.page(rows, page_count(len(rows), 50), 50))
+        assert len(engine.page(rows, 0, 50)) == 50
+
+    def test_page_count_and_bounds(self):
+        assert page_count(0, 50) == 1
+        assert page_count(101, 50) == 3
+        assert page_bounds(101, 3, 50) == (100, 101)
+        assert page_bounds(0, 1, 50) == (0, 0)
@@ -0,0 +1,135 @@
+"""
+Tests for mission_analytics.py: matrix-derived analytics must equal groupbys
+over the rows, and appended or merged matrices must equal a full build.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import mission_data
+import mission_paths
+import space_missions
+from mission_analytics import (ANALYTICS_SUFFIX, MATRICES, LiveAnalytics, MissionAnalytics, build_analytics_chunked,
+                               load_analytics, rocket_family, top_labels)
+from space_missions import _DATA_PATH
+
+
+@pytest.fixture(scope="module")
+def analytics(frame):
+    return MissionAnalytics.from_frame(frame)
+
+
+def _assert_same(a, b):
+    for matrix in ["company_launches", "company_successes", "family_launches", "site_launches"]:
+        pd.testing.assert_frame_equal(getattr(a, matrix), getattr(b, matrix), check_names=False)
+
+
+@pytest.mark.parametrize("rocket, family", [
+    ("Falcon 9 Block 5", "Falcon"),
+    ("Falcon Heavy", "Falcon"),
+    ("Soyuz 2.1a/Fregat-M", "Soyuz"),
+    ("Titan IV(401)A", "Titan"),
+    ("Commercial Titan III", "Titan"),
+    ("Long March 2C/YZ-1S", "Long March"),
+    ("Atlas-E/F Agena D", "Atlas"),
+    ("Cosmos-3M (11K65M)", "Cosmos"),
+    ("H-IIA 202", "H-II"),
+    ("Space Shuttle Atlantis", "Space Shuttle"),
+    ("PSLV-XL", "PSLV"),
+    ("SS-520", "SS-520"),
+    ("Electron", "Electron"),
+])
+def test_rocket_family(rocket, family):
+    assert rocket_family(rocket) == family
+
+
+class TestMatrices:
+    def test_company_counts(self, frame, analytics):
+        dated = frame[frame["Date"].notna()]
+        expected = dated.groupby([dated["Date"].dt.year, dated["Company"].astype("str")]).size()
+        launches = analytics.company_launches.stack()
+        assert launches[launches > 0].to_dict() == expected.to_dict()
+        assert analytics.company_successes.to_numpy().sum() == (dated["MissionStatus"] == "Success").sum()
+
+    def test_every_year_present(self, frame, analytics):
+        years = frame["Date"].dt.year
+        assert list(analytics.years) == list(range(int(years.min()), int(years.max()) + 1))
+
+    def test_family_totals(self, frame, analytics):
+        families = frame["Rocket"].astype("str").map(rocket_family).value_counts()
+        assert analytics.family_launches.sum().to_dict() == families.to_dict()
+
+
+class TestAnalytics:
+    @pytest.mark.parametrize("window", [1, 3, 5, 100])
+    def test_rolling_success_rates(self, frame, analytics, window):
+        rates = analytics.rolling_success_rates(window, ["SpaceX", "NASA", "Nobody"])
+        assert list(rates.columns) == ["SpaceX", "NASA"]
+        for company in rates.columns:
+            rows = frame[frame["Company"] == company]
+            years = rows["Date"].dt.year
+            for year in [1985, 2010, 2020, 2022]:
+                in_window = rows[(years > year - window) & (years <= year)]
+                expected = (in_window["MissionStatus"] == "Success").mean() * 100 if len(in_window) else np.nan
+                np.testing.assert_allclose(rates.loc[year, company], round(expected, 2))
+
+    def test_rolling_window_must_be_positive(self, analytics):
+        with pytest.raises(ValueError):
+            analytics.rolling_success_rates(0)
+
+    def test_cumulative_family_launches(self, frame, analytics):
+        cumulative = analytics.cumulative_family_launches(["Falcon"])["Falcon"]
+        falcon = frame[frame["Rocket"].astype("str").str.startswith("Falcon")]
+        assert cumulative.loc[2015] == (falcon["Date"].dt.year <= 2015).sum()
+        assert cumulative.is_monotonic_increasing
+
+    def test_site_utilization(self, frame, analytics):
+        share = analytics.site_utilization(share=True)
+        assert np.allclose(share.loc[2020].sum(), 100, atol=0.1)
+        counts = analytics.site_utilization()
+        assert counts.loc[2020].sum() == (frame["Date"].dt.year == 2020).sum()
+
+    def test_top_labels(self, analytics):
+        assert top_labels(analytics.company_launches, 2) == ["RVSN USSR", "CASC"]
+        assert top_labels(analytics.company_launches, 1, (2018, 2022)) == ["CASC"]
+
+
+class TestIncremental:
+    def test_appended_matches_full_build(self, frame, analytics):
+        _assert_same(MissionAnalytics.from_frame(frame.iloc[:4000]).appended(frame.iloc[4000:]), analytics)
+
+    @pytest.mark.parametrize("chunk_size", [500, 10_000])
+    def test_chunked_matches_full_build(self, analytics, chunk_size):
+        _assert_same(build_analytics_chunked(_DATA_PATH, chunk_size), analytics)
+
+    def test_directory_of_csvs(self, analytics, split_csv):
+        _assert_same(load_analytics(str(split_csv(5)), workers=2), analytics)
+
+    def test_live_follows_appends_and_reloads(self, growing_csv):
+        def check(live, frame):
+            _assert_same(live, MissionAnalytics.from_frame(frame))
+
+        growing_csv.follow_appends_and_reloads(LiveAnalytics, check)
+
+    def test_sidecar_written_and_reused(self, analytics, csv_path, monkeypatch):
+        _assert_same(load_analytics(csv_path), analytics)
+        assert os.path.exists(mission_paths.sidecar_path(csv_path, ANALYTICS_SUFFIX))
+        monkeypatch.setattr(mission_data, "load_table", None)
+        cached = load_analytics(csv_path)
+        for matrix in MATRICES:
+            pd.testing.assert_frame_equal(getattr(cached, matrix), getattr(analytics, matrix))
+
+    def test_chunked_build_cached(self, analytics, csv_path, monkeypatch):
+        monkeypatch.setattr(mission_data, "load_table", None)
+        _assert_same(load_analytics(csv_path, chunk_size=700), analytics)
+        assert os.path.exists(mission_paths.sidecar_path(csv_path, ANALYTICS_SUFFIX))
+
+    def test_cells_round_trip_empty(self):
+        empty = MissionAnalytics.from_frame(mission_data.empty_table())
+        _assert_same(MissionAnalytics.from_cells(empty.to_cells()), empty)
+
+    def test_shared_dataset(self, analytics):
+        _assert_same(space_missions.get_analytics(), analytics)
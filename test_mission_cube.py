@@ -0,0 +1,102 @@
+"""
+Tests for mission_cube.py: cube-derived dashboard numbers must equal the
+row-level results for every filter combination.
+"""
+
+import itertools
+import os
+import random
+
+import pandas as pd
+import pytest
+
+import mission_paths
+from dashboard_aggregates import aggregate
+from filter_engine import FilterEngine
+from mission_cube import CUBE_SUFFIX, LiveCube, MissionCube, build_cube, build_cube_chunked, load_cube
+from space_missions import _DATA_PATH
+
+
+@pytest.fixture(scope="module")
+def engine(frame):
+    return FilterEngine(frame)
+
+
+@pytest.fixture(scope="module")
+def cube(frame):
+    return MissionCube(build_cube(frame))
+
+
+def _assert_same(cube_agg, row_agg):
+    for field in ["total", "successes", "success_rate", "unique_companies", "unique_rockets"]:
+        assert getattr(cube_agg, field) == getattr(row_agg, field), field
+    for field in ["yearly", "status_counts", "top_companies", "top_rockets"]:
+        pd.testing.assert_frame_equal(
+            getattr(cube_agg, field).reset_index(drop=True),
+            getattr(row_agg, field).reset_index(drop=True),
+            check_dtype=False,
+        )
+
+
+def _random_filters(n, seed=0):
+    rng = random.Random(seed)
+    companies = ["RVSN USSR", "CASC", "SpaceX", "NASA", "Arianespace", "ULA", "ISRO", "AMBA"]
+    statuses = ["Success", "Failure", "Partial Failure", "Prelaunch Failure"]
+    for _ in range(n):
+        start = rng.randint(1957, 2022)
+        yield (
+            (start, rng.randint(start, 2022)),
+            tuple(rng.sample(companies, rng.randint(0, 3))),
+            tuple(rng.sample(statuses, rng.randint(0, 2))),
+            tuple(rng.sample(["Active", "Retired"], rng.randint(0, 1))),
+        )
+
+
+class TestMissionCube:
+    def test_much_smaller_than_rows(self, frame, cube):
+        assert len(cube.cells) < len(frame) / 2
+
+    def test_total_matches_dated_rows(self, frame, cube):
+        assert cube.cells["Missions"].sum() == frame["Date"].notna().sum()
+
+    def test_unfiltered_matches_rows(self, engine, cube):
+        _assert_same(cube.aggregates((1957, 2022)), aggregate(engine.view((1957, 2022))))
+
+    @pytest.mark.parametrize("filters", list(_random_filters(40)))
+    def test_filtered_matches_rows(self, engine, cube, filters):
+        _assert_same(cube.aggregates(*filters), aggregate(engine.view(*filters)))
+
+    def test_every_single_year(self, engine, cube):
+        for year in itertools.chain(range(1957, 2023), [1900, 2100]):
+            assert cube.aggregates((year, year)).total == len(engine.rows((year, year)))
+
+
+class TestCubeCache:
+    def test_load_writes_and_reuses_sidecar(self, csv_path):
+        first = load_cube(csv_path)
+        assert os.path.exists(mission_paths.sidecar_path(csv_path, CUBE_SUFFIX))
+        pd.testing.assert_frame_equal(load_cube(csv_path).cells, first.cells)
+
+    def test_stale_cube_is_rebuilt(self, csv_path):
+        before = load_cube(csv_path).aggregates((2022, 2022)).total
+        with open(csv_path, "a") as fh:
+            fh.write('\nSpaceX,"LC-39A, Kennedy Space Center, Florida, USA",2022-12-30,,Falcon 9 Block 5,Extra,Active,67,Success\n')
+        assert load_cube(csv_path).aggregates((2022, 2022)).total == before + 1
+
+
+class TestChunkedCube:
+    @pytest.mark.parametrize("chunk_size", [500, 1_000, 10_000])
+    def test_matches_in_memory_build(self, frame, chunk_size):
+        pd.testing.assert_frame_equal(build_cube_chunked(_DATA_PATH, chunk_size), build_cube(frame))
+
+
+class TestLiveCube:
+    def test_follows_appends_and_reloads(self, growing_csv):
+        def check(cube, frame):
+            pd.testing.assert_frame_equal(cube.cells, build_cube(frame))
+            assert cube.aggregates((1900, 2100)).total == len(frame)
+
+        growing_csv.follow_appends_and_reloads(LiveCube, check)
+
+    def test_directory_of_csvs(self, frame, split_csv):
+        pd.testing.assert_frame_equal(load_cube(str(split_csv(5)), workers=2).cells, build_cube(frame))
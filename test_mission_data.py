@@ -0,0 +1,169 @@
+"""
+Tests for mission_data.py: CSV parsing and the columnar sidecar cache.
+"""
+
+import io
+import os
+
+import pandas as pd
+import pytest
+
+import mission_data
+import mission_paths
+
+pytest.importorskip("pyarrow")
+
+_CSV = (
+    "Company,Location,Date,Time,Rocket,Mission,RocketStatus,Price,MissionStatus\n"
+    'Acme,"Pad 1, Somewhere",2001-01-01,10:00:00,Rocket A,M1,Active,"1,160.00",Success\n'
+    'Acme,"Pad 1, Somewhere",2001-06-01,,Rocket A,M2,Retired,,Failure\n'
+)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "missions.csv"
+    path.write_text(_CSV)
+    return str(path)
+
+
+class TestSchema:
+    def test_category_columns(self, csv_path):
+        df = mission_data.read_csv(csv_path)
+        for col in mission_data.CATEGORY_COLUMNS:
+            assert isinstance(df[col].dtype, pd.CategoricalDtype)
+
+    def test_price_is_numeric(self, csv_path):
+        price = mission_data.read_csv(csv_path)["Price"]
+        assert price.dtype == "float64"
+        assert price.iloc[0] == 1160.0
+        assert pd.isna(price.iloc[1])
+
+    def test_date_is_datetime(self, csv_path):
+        assert pd.api.types.is_datetime64_dtype(mission_data.read_csv(csv_path)["Date"])
+
+    def test_empty_table_has_schema(self):
+        df = mission_data.empty_table()
+        assert list(df.columns) == mission_data.COLUMNS
+        assert df["Price"].dtype == "float64"
+        assert isinstance(df["Company"].dtype, pd.CategoricalDtype)
+
+
+class TestSidecar:
+    def test_load_writes_sidecar(self, csv_path):
+        mission_data.load_table(csv_path)
+        assert os.path.exists(mission_paths.sidecar_path(csv_path))
+
+    def test_sidecar_matches_csv(self, csv_path):
+        mission_data.write_sidecar(csv_path)
+        pd.testing.assert_frame_equal(mission_data.read_sidecar(csv_path), mission_data.read_csv(csv_path))
+
+    def test_shipped_csv_round_trip(self, tmp_path):
+        source = os.path.join(os.path.dirname(os.path.abspath(__file__)), "space_missions.csv")
+        path = tmp_path / "space_missions.csv"
+        path.write_bytes(open(source, "rb").read())
+        mission_data.write_sidecar(str(path))
+        pd.testing.assert_frame_equal(mission_data.read_sidecar(str(path)), mission_data.read_csv(str(path)))
+
+    def test_stale_sidecar_is_ignored_and_rebuilt(self, csv_path):
+        mission_data.write_sidecar(csv_path)
+        with open(csv_path, "a") as fh:
+            fh.write('Acme,"Pad 1, Somewhere",2002-01-01,10:00:00,Rocket B,M3,Active,,Success\n')
+        assert mission_data.read_sidecar(csv_path) is None
+        assert len(mission_data.load_table(csv_path)) == 3
+        assert len(mission_data.read_sidecar(csv_path)) == 3
+
+    def test_sidecar_of_changing_csv_is_stale(self, csv_path, monkeypatch):
+        read_csv = mission_data.read_csv
+
+        def read_then_append(path):
+            df = read_csv(path)
+            with open(path, "a") as fh:
+                fh.write('Acme,"Pad 1, Somewhere",2002-01-01,10:00:00,Rocket B,M3,Active,,Success\n')
+            return df
+
+        monkeypatch.setattr(mission_data, "read_csv", read_then_append)
+        assert len(mission_data.load_table(csv_path)) == 2
+        assert mission_data.read_sidecar(csv_path) is None
+
+    def test_no_temp_files_left(self, csv_path):
+        mission_data.write_sidecar(csv_path)
+        mission_data.write_sidecar(csv_path)
+        assert not [name for name in os.listdir(os.path.dirname(csv_path)) if name.endswith(".tmp")]
+
+    def test_sidecar_keeps_schema(self, csv_path):
+        mission_data.write_sidecar(csv_path)
+        df = mission_data.read_sidecar(csv_path)
+        assert isinstance(df["Rocket"].dtype, pd.CategoricalDtype)
+        assert df["Price"].dtype == "float64"
+
+    def test_missing_sidecar(self, csv_path):
+        assert mission_data.read_sidecar(csv_path) is None
+
+    def test_corrupt_sidecar_falls_back_to_csv(self, csv_path):
+        with open(mission_paths.sidecar_path(csv_path), "wb") as fh:
+            fh.write(b"not parquet")
+        assert len(mission_data.load_table(csv_path)) == 2
+
+
+class TestIterChunks:
+    def test_chunks_concatenate_to_full_read(self):
+        source = os.path.join(os.path.dirname(os.path.abspath(__file__)), "space_missions.csv")
+        columns = ["Company", "Date", "Mission", "Price"]
+        chunks = list(mission_data.iter_chunks(source, 1_000, columns))
+        assert max(len(chunk) for chunk in chunks) == 1_000
+        combined = pd.concat(chunks, ignore_index=True)
+        full = mission_data.read_csv(source)[columns]
+        pd.testing.assert_series_equal(combined["Date"], full["Date"])
+        pd.testing.assert_series_equal(combined["Price"], full["Price"])
+        assert combined["Company"].astype("str").tolist() == full["Company"].astype("str").tolist()
+
+    def test_only_requested_columns(self, csv_path):
+        (chunk,) = mission_data.iter_chunks(csv_path, 10, ["Mission", "Date"])
+        assert list(chunk.columns) == ["Date", "Mission"]
+
+
+class TestConcatTables:
+    def test_appended_rows_match_full_read(self, csv_path):
+        head, _, tail = _CSV.rpartition('Acme,"Pad 1, Somewhere",2001-06-01')
+        tail = 'Zeta,"Pad 1, Somewhere",2001-06-01' + tail
+        base = mission_data.apply_schema(pd.read_csv(io.StringIO(head), dtype=mission_data._RAW_DTYPES))
+        rows = mission_data.read_rows(tail.encode())
+        rows.index = pd.RangeIndex(len(base), len(base) + len(rows))
+        combined = mission_data.concat_tables([base, rows])
+        with open(csv_path, "w") as fh:
+            fh.write(head + tail)
+        pd.testing.assert_frame_equal(combined, mission_data.read_csv(csv_path))
+        assert list(combined["Company"].cat.categories) == ["Acme", "Zeta"]
+
+
+class TestSources:
+    @pytest.fixture
+    def source_dir(self, tmp_path):
+        source = tmp_path / "sources"
+        source.mkdir()
+        header, *rows = _CSV.splitlines(keepends=True)
+        for i, row in enumerate(rows):
+            (source / f"part_{i}.csv").write_text(header + row)
+        (source / "notes.txt").write_text("not a source")
+        return source
+
+    def test_resolve_directory_and_glob(self, source_dir):
+        expected = [str(source_dir / "part_0.csv"), str(source_dir / "part_1.csv")]
+        assert mission_paths.resolve_sources(str(source_dir)) == expected
+        assert mission_paths.resolve_sources(str(source_dir / "part_*")) == expected
+        assert mission_paths.is_multi_source(str(source_dir / "part_*"))
+        assert not mission_paths.is_multi_source(expected[0])
+        assert mission_paths.resolve_sources(expected[0]) == expected[:1]
+
+    def test_sidecars_are_not_sources(self, source_dir):
+        mission_data.load_sources(str(source_dir / "*"), workers=1)
+        assert len(mission_paths.resolve_sources(str(source_dir / "*"))) == 2
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_load_sources_matches_single_file(self, source_dir, csv_path, workers):
+        combined = mission_data.load_sources(str(source_dir), workers)
+        pd.testing.assert_frame_equal(combined, mission_data.read_csv(csv_path))
+
+    def test_empty_directory(self, tmp_path):
+        assert mission_data.load_sources(str(tmp_path)).empty
@@ -0,0 +1,99 @@
+"""
+Tests for mission_mmap.py: the exported file and the zero-copy attach.
+"""
+
+import mmap
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import mission_data
+import mission_mmap
+
+pytest.importorskip("pyarrow")
+
+_CSV_HEADER = "Company,Location,Date,Time,Rocket,Mission,RocketStatus,Price,MissionStatus\n"
+
+
+def _mapping(array: np.ndarray):
+    """The mmap an array is a view of, or None."""
+    while isinstance(array, np.ndarray):
+        array = array.base
+    return array.obj if isinstance(array, memoryview) and isinstance(array.obj, mmap.mmap) else None
+
+
+class TestExport:
+    def test_round_trip(self, csv_path):
+        mission_mmap.write_mapped(csv_path)
+        pd.testing.assert_frame_equal(mission_mmap.attach(csv_path), mission_data.read_csv(csv_path))
+
+    def test_missing_values(self, tmp_path):
+        path = tmp_path / "missions.csv"
+        path.write_text(
+            _CSV_HEADER
+            + 'Acme,"Pad 1",2001-01-01,10:00:00,Rocket A,Mé 1,Active,"1,160.00",Success\n'
+            + ',,,,,,,,\n'
+            + 'Acme,"Pad 1",not a date,,Rocket A,,Active,,Failure\n'
+        )
+        mission_mmap.write_mapped(str(path))
+        pd.testing.assert_frame_equal(mission_mmap.attach(str(path)), mission_data.read_csv(str(path)))
+
+    def test_empty_table(self, tmp_path):
+        path = tmp_path / "missions.csv"
+        path.write_text(_CSV_HEADER)
+        mission_mmap.write_mapped(str(path))
+        attached = mission_mmap.attach(str(path))
+        assert attached.empty
+        assert list(attached.columns) == mission_data.COLUMNS
+
+    def test_directory_source(self, tmp_path):
+        (tmp_path / "a.csv").write_text(_CSV_HEADER + 'Acme,"Pad 1",2001-01-01,,Rocket A,M1,Active,,Success\n')
+        (tmp_path / "b.csv").write_text(_CSV_HEADER + 'Apex,"Pad 2",2002-01-01,,Rocket B,M2,Active,,Failure\n')
+        df = mission_mmap.load_table(str(tmp_path), workers=1)
+        assert mission_mmap.mapped_path(str(tmp_path)) == str(tmp_path / "missions.mmap")
+        assert df["Mission"].tolist() == ["M1", "M2"]
+        assert df["Company"].cat.categories.tolist() == ["Acme", "Apex"]
+
+
+class TestAttach:
+    def test_columns_are_views_of_the_file(self, csv_path):
+        df = mission_mmap.load_table(csv_path)
+        mapping = _mapping(df["Price"].to_numpy())
+        assert mapping is not None
+        assert _mapping(df["Date"].to_numpy()) is mapping
+        assert _mapping(df["Company"].array.codes) is mapping
+        start = np.frombuffer(mapping, dtype=np.uint8).ctypes.data
+        for buffer in df["Mission"].array._pa_array.chunks[0].buffers()[1:]:
+            assert start <= buffer.address < start + len(mapping)
+
+    def test_read_only(self, csv_path):
+        df = mission_mmap.load_table(csv_path)
+        with pytest.raises(ValueError):
+            df["Price"].to_numpy()[0] = 1.0
+
+    def test_stale_file_is_rebuilt(self, csv_path):
+        mission_mmap.load_table(csv_path)
+        with open(csv_path, "a") as fh:
+            fh.write('\nAcme,"Pad 1",2030-01-01,,Rocket A,M1,Active,,Success\n')
+        assert mission_mmap.attach(csv_path) is None
+        assert mission_mmap.load_table(csv_path)["Company"].iloc[-1] == "Acme"
+        assert mission_mmap.attach(csv_path) is not None
+
+    def test_survives_replacement(self, csv_path):
+        df = mission_mmap.load_table(csv_path)
+        expected = df["Mission"].tolist()
+        with open(csv_path, "a") as fh:
+            fh.write('\nAcme,"Pad 1",2030-01-01,,Rocket A,M1,Active,,Success\n')
+        mission_mmap.load_table(csv_path)
+        assert df["Mission"].tolist() == expected
+
+    def test_corrupt_file_is_ignored(self, csv_path):
+        with open(mission_mmap.mapped_path(csv_path), "wb") as fh:
+            fh.write(b"not a table")
+        assert mission_mmap.attach(csv_path) is None
+        assert len(mission_mmap.load_table(csv_path)) == 4630
+
+    def test_vanished_export_keeps_loaded_frame(self, csv_path, monkeypatch):
+        monkeypatch.setattr(mission_mmap, "attach", lambda path, check=True: None)
+        pd.testing.assert_frame_equal(mission_mmap.load_table(csv_path), mission_data.read_csv(csv_path))
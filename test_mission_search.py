@@ -0,0 +1,116 @@
+"""
+Tests for mission_search.py: index answers must equal a case-insensitive
+substring scan of the Mission, Rocket and Location columns.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import mission_paths
+import space_missions
+from filter_engine import FilterEngine
+from mission_search import (SEARCH_COLUMNS, SEARCH_SUFFIX, LiveSearch, SearchIndex, build_postings,
+                            build_postings_chunked, load_search)
+from space_missions import _DATA_PATH
+
+
+@pytest.fixture(scope="module")
+def index(frame):
+    return SearchIndex(build_postings(frame))
+
+
+def _scan(frame, query):
+    mask = np.ones(len(frame), dtype=bool)
+    for word in query.lower().split():
+        found = np.zeros(len(frame), dtype=bool)
+        for col in SEARCH_COLUMNS:
+            found |= frame[col].astype("str").str.lower().str.contains(word, regex=False).fillna(False).to_numpy()
+        mask &= found
+    return np.flatnonzero(mask)
+
+
+QUERIES = ["apollo", "Falcon 9", "kennedy lc-39a", "a", "ss", "9", "USSR vostok", "baikonur soyuz", "zzz", "é"]
+
+
+class TestSearchIndex:
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_matches_scan(self, frame, index, query):
+        np.testing.assert_array_equal(index.search(query), _scan(frame, query))
+
+    def test_empty_query(self, index):
+        assert len(index.search("")) == 0
+        assert len(index.search("   ")) == 0
+
+    def test_result_is_read_only(self, index):
+        assert not index.search("apollo").flags.writeable
+
+    def test_row_count_without_text(self, frame):
+        tail = frame.iloc[:3].copy()
+        for col in SEARCH_COLUMNS:
+            tail[col] = None
+        assert SearchIndex(build_postings(tail)).rows == 3
+
+    def test_appended(self, frame, index):
+        appended = SearchIndex(build_postings(frame.iloc[:4000])).appended(frame.iloc[4000:])
+        assert appended.rows == len(frame)
+        for query in QUERIES:
+            np.testing.assert_array_equal(appended.search(query), index.search(query))
+
+    def test_appended_in_small_tails(self, frame, index):
+        appended = SearchIndex(build_postings(frame.iloc[:4000]))
+        for start in range(4000, len(frame), 97):
+            appended = appended.appended(frame.iloc[start:start + 97])
+        assert appended.appended(frame.iloc[:0]) is appended
+        for query in QUERIES:
+            np.testing.assert_array_equal(appended.search(query), index.search(query))
+
+    def test_appended_new_values(self, frame):
+        tail = frame.iloc[:2].copy()
+        tail["Mission"] = ["Zyx Qwv", "Éclair"]
+        appended = SearchIndex(build_postings(frame.iloc[:100])).appended(tail)
+        assert appended.search("zyx").tolist() == [100]
+        assert appended.search("éc").tolist() == [101]
+        assert appended.search("zyx").tolist() == SearchIndex(appended.postings).search("zyx").tolist()
+
+
+class TestSearchCache:
+    def test_load_writes_and_reuses_sidecar(self, csv_path):
+        first = load_search(csv_path)
+        assert os.path.exists(mission_paths.sidecar_path(csv_path, SEARCH_SUFFIX))
+        np.testing.assert_array_equal(load_search(csv_path).search("apollo"), first.search("apollo"))
+
+    @pytest.mark.parametrize("chunk_size", [97, 999, 10_000])
+    def test_chunked_matches_in_memory_build(self, index, chunk_size):
+        chunked = SearchIndex(build_postings_chunked(_DATA_PATH, chunk_size))
+        for query in QUERIES:
+            np.testing.assert_array_equal(chunked.search(query), index.search(query))
+
+    def test_directory_of_csvs(self, index, split_csv):
+        merged = load_search(str(split_csv(5)), workers=2)
+        assert merged.rows == index.rows
+        for query in QUERIES:
+            np.testing.assert_array_equal(merged.search(query), index.search(query))
+
+
+class TestLiveSearch:
+    def test_follows_appends_and_reloads(self, growing_csv):
+        def check(index, frame):
+            assert index.rows == len(frame)
+            np.testing.assert_array_equal(index.search("falcon"), _scan(frame, "falcon"))
+
+        growing_csv.follow_appends_and_reloads(LiveSearch, check)
+
+
+class TestSearchMissions:
+    def test_rows_of_shared_dataset(self):
+        rows = space_missions.searchMissions("apollo 11")
+        assert space_missions.get_dataset().frame.iloc[rows]["Mission"].tolist() == ["Apollo 11"]
+
+    def test_intersects_with_filters(self, frame):
+        rows = np.intersect1d(FilterEngine(frame).rows((1969, 1969)), space_missions.searchMissions("apollo"))
+        assert frame.iloc[rows]["Mission"].tolist() == ["Apollo 9", "Apollo 10", "Apollo 11", "Apollo 12"]
+
+    def test_invalid_query(self):
+        assert len(space_missions.searchMissions(None)) == 0
@@ -0,0 +1,166 @@
+"""
+Tests for mission_service.py, through a local asyncio HTTP client.
+"""
+
+import asyncio
+import json
+from urllib.parse import quote
+
+import pytest
+
+import mission_service
+import space_missions
+from mission_service import MissionService, start_server
+
+_CSV_HEADER = "Company,Location,Date,Time,Rocket,Mission,RocketStatus,Price,MissionStatus\n"
+
+
+async def _request(port, target, headers=None, method="GET"):
+    """Send one request on a new connection; return (status, headers, parsed JSON or None)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    lines = [f"{method} {target} HTTP/1.1", "Host: localhost", "Connection: close"]
+    lines += [f"{key}: {value}" for key, value in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+    raw = await reader.read()
+    writer.close()
+    head, _, body = raw.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode().split("\r\n")
+    response_headers = {k.lower(): v.strip() for k, _, v in (line.partition(":") for line in header_lines)}
+    return int(status_line.split()[1]), response_headers, json.loads(body) if body else None
+
+
+def _serve(test, cache_size=1024):
+    """Run ``await test(port)`` against a fresh server on a free port."""
+    async def run():
+        server = await start_server(port=0, cache_size=cache_size)
+        async with server:
+            return await test(server.sockets[0].getsockname()[1])
+    return asyncio.run(run())
+
+
+class TestEndpoints:
+    @pytest.mark.parametrize("target, expected", [
+        ("/getMissionCountByCompany?companyName=NASA", lambda: space_missions.getMissionCountByCompany("NASA")),
+        ("/getSuccessRate?companyName=" + quote("RVSN USSR"), lambda: space_missions.getSuccessRate("RVSN USSR")),
+        ("/getMissionsByDateRange?startDate=1957-10-01&endDate=1957-12-31",
+         lambda: space_missions.getMissionsByDateRange("1957-10-01", "1957-12-31")),
+        ("/getTopCompaniesByMissionCount?n=3",
+         lambda: [list(pair) for pair in space_missions.getTopCompaniesByMissionCount(3)]),
+        ("/getMissionStatusCount", space_missions.getMissionStatusCount),
+        ("/getMissionsByYear?year=2020", lambda: space_missions.getMissionsByYear(2020)),
+        ("/getMostUsedRocket", space_missions.getMostUsedRocket),
+        ("/getAverageMissionsPerYear?startYear=2010&endYear=2020",
+         lambda: space_missions.getAverageMissionsPerYear(2010, 2020)),
+        ("/getMissionCountsByCompany?companies=NASA&companies=SpaceX&companies=Nope",
+         lambda: space_missions.getMissionCountsByCompany(["NASA", "SpaceX", "Nope"])),
+        ("/getSuccessRates?companies=NASA&companies=SpaceX",
+         lambda: space_missions.getSuccessRates(["NASA", "SpaceX"])),
+        ("/getMissionsByYears?years=1957&years=2020", lambda: space_missions.getMissionsByYears([1957, 2020])),
+        ("/getMissionsByDateRanges?ranges=1957-10-01,1957-10-31&ranges=1969-07-16,1969-07-16",
+         lambda: space_missions.getMissionsByDateRanges([("1957-10-01", "1957-10-31"), ("1969-07-16", "1969-07-16")])),
+    ])
+    def test_matches_function(self, target, expected):
+        status, _, payload = _serve(lambda port: _request(port, target))
+        assert status == 200
+        assert payload["result"] == expected()
+
+    @pytest.mark.parametrize("target, status", [
+        ("/getMissionsByYear", 400),
+        ("/getMissionsByYear?year=abc", 400),
+        ("/getMissionsByYear?year=1&year=2", 400),
+        ("/getMissionsByYear?year=2020&extra=1", 400),
+        ("/getMissionsByDateRanges?ranges=1957-10-01", 400),
+        ("/getMissionsByDateRange?startDate=2020-01-01&endDate=" + quote("2020-01-05T00:00:00+02:00"), 400),
+        ("/getMissionsByDateRange?startDate=2020-01-01&endDate=soon", 400),
+        ("/getMissionsByDateRanges?ranges=2020-01-01," + quote("2020-01-05Z"), 400),
+        ("/nope", 404),
+    ])
+    def test_errors(self, target, status):
+        assert _serve(lambda port: _request(port, target))[0] == status
+
+    def test_internal_error(self, monkeypatch):
+        def fail():
+            raise RuntimeError("boom")
+        monkeypatch.setitem(mission_service.ENDPOINTS, "getMostUsedRocket", (fail, []))
+        status, _, payload = _serve(lambda port: _request(port, "/getMostUsedRocket"))
+        assert (status, payload) == (500, {"error": "internal server error"})
+
+    @pytest.mark.parametrize("length", ["abc", "-1"])
+    def test_invalid_content_length(self, length):
+        status, headers, _ = _serve(lambda port: _request(port, "/getMostUsedRocket", {"Content-Length": length}))
+        assert (status, headers["connection"]) == (400, "close")
+
+    def test_post_not_allowed(self):
+        assert _serve(lambda port: _request(port, "/getMostUsedRocket", method="POST"))[0] == 405
+
+    def test_index_lists_endpoints(self):
+        payload = _serve(lambda port: _request(port, "/"))[2]
+        assert payload["endpoints"]["getAverageMissionsPerYear"] == ["startYear", "endYear"]
+
+
+class TestCaching:
+    def test_etag_revalidation(self):
+        async def test(port):
+            _, headers, _ = await _request(port, "/getMostUsedRocket")
+            status, again, payload = await _request(port, "/getMostUsedRocket", {"If-None-Match": headers["etag"]})
+            return status, again["etag"] == headers["etag"], payload
+        assert _serve(test) == (304, True, None)
+
+    def test_etag_changes_with_data(self, tmp_path, monkeypatch):
+        path = tmp_path / "missions.csv"
+        path.write_text(_CSV_HEADER + 'Acme,"Pad 1",2001-01-01,,Rocket A,M1,Active,,Success\n')
+        monkeypatch.setattr(space_missions, "_DATASET", space_missions.MissionDataset(str(path)))
+
+        async def test(port):
+            target = "/getMissionCountByCompany?companyName=Acme"
+            _, headers, first = await _request(port, target)
+            with open(path, "a") as fh:
+                fh.write('Acme,"Pad 1",2002-01-01,,Rocket A,M2,Active,,Success\n')
+            status, _, second = await _request(port, target, {"If-None-Match": headers["etag"]})
+            return first["result"], status, second["result"]
+        assert _serve(test) == (1, 200, 2)
+
+    def test_etag_survives_restart(self):
+        target = "/getMissionsByYear?year=2020"
+        _, first, _ = MissionService().respond("GET", target, {})
+        restarted = MissionService()
+        restarted.data_version = lambda: 99  # a new process counts its own versions
+        status, second, _ = restarted.respond("GET", target, {"if-none-match": first["ETag"]})
+        assert (status, second["ETag"]) == (304, first["ETag"])
+
+    def test_parameter_order_shares_cache_entry(self):
+        service = MissionService()
+        _, first, _ = service.respond("GET", "/getAverageMissionsPerYear?startYear=2000&endYear=2010", {})
+        _, second, _ = service.respond("GET", "/getAverageMissionsPerYear?endYear=2010&startYear=2000", {})
+        assert first["ETag"] == second["ETag"]
+        assert len(service._cache) == 1
+
+    def test_lru_eviction(self):
+        service = MissionService(cache_size=2)
+        for year in (2000, 2001, 2000, 2002):
+            service.respond("GET", f"/getMissionsByYear?year={year}", {})
+        assert [key for _, key in service._cache] == ["getMissionsByYear?year=2000", "getMissionsByYear?year=2002"]
+
+
+class TestConnections:
+    def test_keep_alive(self):
+        async def test(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            statuses = []
+            for target in ("/getMostUsedRocket", "/getMissionsByYear?year=2020"):
+                writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = int(next(line.split(":")[1] for line in head.decode().split("\r\n")
+                                  if line.lower().startswith("content-length")))
+                await reader.readexactly(length)
+                statuses.append(int(head.split()[1]))
+            writer.close()
+            return statuses
+        assert _serve(test) == [200, 200]
+
+    def test_concurrent_requests(self):
+        async def test(port):
+            targets = [f"/getMissionsByYear?year={year}" for year in range(1957, 2023)]
+            responses = await asyncio.gather(*(_request(port, target) for target in targets))
+            return [payload["result"] for _, _, payload in responses]
+        assert _serve(test) == [space_missions.getMissionsByYear(year) for year in range(1957, 2023)]
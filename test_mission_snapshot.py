@@ -0,0 +1,105 @@
+"""
+Tests for mission_snapshot.py and the pandas-free start of space_missions.py.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import mission_snapshot
+import space_missions
+from mission_dataset import MissionDataset
+
+_CSV_HEADER = "Company,Location,Date,Time,Rocket,Mission,RocketStatus,Price,MissionStatus\n"
+
+
+@pytest.fixture
+def pandas_backend(monkeypatch):
+    monkeypatch.setattr(space_missions, "_BACKEND", "pandas")
+
+
+class TestSnapshot:
+    def test_written_on_load(self, csv_path):
+        index = MissionDataset(csv_path).index
+        snapshot = mission_snapshot.load(csv_path)
+        assert os.path.exists(mission_snapshot.snapshot_path(csv_path))
+        assert snapshot.company_counts == index.company_counts
+        assert snapshot.top_company_counts(5) == index.top_company_counts(5)
+        assert list(snapshot.mission_status_counts().items()) == list(index.mission_status_counts().items())
+        assert snapshot.most_used_rocket == index.most_used_rocket
+        for year in (1956, 1957, 2000, 2022, 2023):
+            assert snapshot.missions_in_year(year) == index.missions_in_year(year)
+        for start, end in [(1900, 3000), (2000, 2010), (2010, 2000), (2021, 2021)]:
+            assert snapshot.missions_between(start, end) == index.missions_between(start, end)
+
+    def test_stale_until_reloaded(self, csv_path):
+        dataset = MissionDataset(csv_path)
+        dataset.index
+        with open(csv_path, "a") as fh:
+            fh.write('\nAcme,"Pad 1",2030-01-01,,Rocket A,M1,Active,,Success\n')
+        assert mission_snapshot.load(csv_path) is None
+        dataset.index
+        assert mission_snapshot.load(csv_path).company_stats("Acme") == (1, 1)
+
+    def test_directory_source(self, tmp_path):
+        (tmp_path / "a.csv").write_text(_CSV_HEADER + 'Acme,"Pad 1",2001-01-01,,Rocket A,M1,Active,,Success\n')
+        (tmp_path / "b.csv").write_text(_CSV_HEADER + 'Acme,"Pad 1",2002-01-01,,Rocket A,M2,Active,,Failure\n')
+        MissionDataset(str(tmp_path), workers=1).index
+        assert mission_snapshot.snapshot_path(str(tmp_path)) == str(tmp_path / "missions.snapshot.json")
+        assert mission_snapshot.load(str(tmp_path)).missions_between(2001, 2002) == 2
+
+    def test_failed_write_leaves_no_temp_file(self, csv_path, monkeypatch):
+        index = MissionDataset(csv_path).index
+
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(mission_snapshot.json, "dump", fail)
+        with pytest.raises(OSError):
+            mission_snapshot.write(csv_path, (0, 0), index)
+        assert not [name for name in os.listdir(os.path.dirname(csv_path)) if name.endswith(".tmp")]
+
+    def test_discard(self, csv_path):
+        MissionDataset(csv_path).index
+        assert mission_snapshot.load(csv_path) is not None
+        mission_snapshot.discard(csv_path)
+        assert not os.path.exists(mission_snapshot.snapshot_path(csv_path))
+        assert mission_snapshot.load(csv_path) is None
+        mission_snapshot.discard(csv_path)
+
+    def test_corrupt_or_old_snapshot_ignored(self, csv_path):
+        MissionDataset(csv_path).index
+        path = mission_snapshot.snapshot_path(csv_path)
+        data = json.load(open(path))
+        data["version"] = mission_snapshot.SNAPSHOT_VERSION - 1
+        json.dump(data, open(path, "w"))
+        assert mission_snapshot.load(csv_path) is None
+        open(path, "w").write("{")
+        assert mission_snapshot.load(csv_path) is None
+
+
+class TestLazyStart:
+    def test_counts_answered_before_load(self, csv_path, monkeypatch, pandas_backend):
+        MissionDataset(csv_path).index
+        dataset = MissionDataset(csv_path)
+        monkeypatch.setattr(space_missions, "_DATASET", dataset)
+        assert space_missions.getMissionCountByCompany("RVSN USSR") == 1777
+        assert space_missions.getAverageMissionsPerYear(2000, 2010) == 46.55
+        assert not dataset.loaded
+        assert space_missions.getMissionsByDateRange("1957-10-01", "1957-10-31") == ["Sputnik-1"]
+        assert dataset.loaded
+
+    def test_fresh_process_skips_pandas(self, csv_path):
+        MissionDataset(csv_path).index
+        script = (
+            "import sys, space_missions;"
+            "print(space_missions.getMissionCountByCompany('NASA'), space_missions.getMostUsedRocket(),"
+            " 'pandas' in sys.modules, sep='|')"
+        )
+        env = dict(os.environ, SPACE_MISSIONS_PATH=csv_path, SPACE_MISSIONS_BACKEND="pandas")
+        result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(space_missions.__file__)), check=True)
+        assert result.stdout.strip().split("|") == ["203", "Cosmos-3M (11K65M)", "False"]
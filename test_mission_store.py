@@ -0,0 +1,153 @@
+"""
+Tests for mission_store.py: the SQLite file itself. The query functions are
+covered against this backend by test_space_missions.py.
+"""
+
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+import pytest
+
+import mission_store
+from space_missions import MissionDataset
+
+_CSV_HEADER = "Company,Location,Date,Time,Rocket,Mission,RocketStatus,Price,MissionStatus\n"
+
+
+class _Worker(threading.Thread):
+    """Runs ``fn`` on a new thread, keeping its result or exception."""
+
+    def __init__(self, fn):
+        super().__init__()
+        self.fn, self.result, self.error = fn, None, None
+        self.start()
+
+    def run(self):
+        try:
+            self.result = self.fn()
+        except Exception as exc:
+            self.error = exc
+
+
+def _plan(store, sql, params):
+    return " ".join(row[-1] for row in store._execute("EXPLAIN QUERY PLAN " + sql, params))
+
+
+class TestBuild:
+    def test_store_next_to_csv(self, csv_path):
+        store = mission_store.load_store(csv_path)
+        assert store.db_path == os.path.splitext(csv_path)[0] + ".sqlite"
+        assert store._execute("SELECT COUNT(*) FROM missions").fetchone()[0] == 4630
+
+    def test_chunked_build_matches(self, csv_path):
+        store = mission_store.load_store(csv_path, chunk_size=333)
+        assert store.mission_status_counts()["Success"] == 4162
+        assert store._execute("SELECT MAX(row) FROM missions").fetchone()[0] == 4629
+
+    def test_reused_until_stale(self, csv_path):
+        db_path = mission_store.build_store(csv_path)
+        mtime = os.stat(db_path).st_mtime_ns
+        mission_store.load_store(csv_path)
+        assert os.stat(db_path).st_mtime_ns == mtime
+        with open(csv_path, "a") as fh:
+            fh.write('\nAcme,"Pad 1",2030-01-01,,Rocket A,M1,Active,,Success\n')
+        assert mission_store.load_store(csv_path).company_stats("Acme") == (1, 1)
+
+    def test_concurrent_builds(self, csv_path):
+        barrier = threading.Barrier(4)
+
+        def build():
+            barrier.wait()
+            return mission_store.build_store(csv_path)
+
+        threads = [_Worker(build) for _ in range(4)]
+        for thread in threads:
+            thread.join()
+        assert [thread.error for thread in threads] == [None] * 4
+        assert mission_store.load_store(csv_path).company_stats("SpaceX")[0] == 182
+        assert not [name for name in os.listdir(os.path.dirname(csv_path)) if name.endswith(".tmp")]
+
+    def test_concurrent_first_use(self, csv_path):
+        dataset = MissionDataset(csv_path)
+        barrier = threading.Barrier(8)
+
+        def first_call():
+            barrier.wait()
+            return dataset.store.company_stats("SpaceX")[0]
+
+        threads = [_Worker(first_call) for _ in range(8)]
+        for thread in threads:
+            thread.join()
+        assert [(thread.error, thread.result) for thread in threads] == [(None, 182)] * 8
+
+    def test_directory_source(self, tmp_path):
+        (tmp_path / "a.csv").write_text(_CSV_HEADER + 'Acme,"Pad 1",2001-01-01,,Rocket A,M1,Active,,Success\n')
+        (tmp_path / "b.csv").write_text(_CSV_HEADER + 'Acme,"Pad 1",2001-01-01,,Rocket A,M2,Active,,Failure\n')
+        store = mission_store.load_store(str(tmp_path))
+        assert store.db_path == str(tmp_path / "missions.sqlite")
+        assert store.company_stats("Acme") == (2, 1)
+        day = pd.Timestamp("2001-01-01")
+        assert store.missions_in_dates(day, day) == ["M1", "M2"]
+
+    def test_store_is_read_only(self, csv_path):
+        store = mission_store.load_store(csv_path)
+        with pytest.raises(sqlite3.OperationalError):
+            store._execute("DELETE FROM missions")
+
+
+class TestQueries:
+    def test_lookups_use_indexes(self, csv_path):
+        store = mission_store.load_store(csv_path)
+        assert "missions_company" in _plan(store, "SELECT COUNT(*) FROM missions WHERE company = ?", ("NASA",))
+        assert "missions_year" in _plan(store, "SELECT COUNT(*) FROM missions WHERE year = ?", (2020,))
+        assert "missions_date" in _plan(
+            store, "SELECT mission FROM missions WHERE date BETWEEN ? AND ? ORDER BY date, row",
+            ("2000-01-01", "2000-12-31"),
+        )
+        assert "missions_rocket" in _plan(store, "SELECT rocket, COUNT(*) FROM missions GROUP BY rocket", ())
+
+    def test_connection_per_thread(self, csv_path):
+        store = mission_store.load_store(csv_path)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(store.missions_in_year(2020))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [store.missions_in_year(2020)] * 4
+
+    def test_company_rows_in_one_query(self, csv_path):
+        store = mission_store.load_store(csv_path)
+        companies = ["SpaceX", None, "Nobody", "NASA", "SpaceX"]
+        store._execute("SELECT 1")
+        statements = []
+        store._connections[threading.get_ident()].set_trace_callback(statements.append)
+        rows = store.company_rows(companies)
+        assert len(statements) == 1
+        assert [tuple(row) for row in rows.to_numpy()] == [
+            store.company_stats(c) if c is not None else (0, 0) for c in companies
+        ]
+
+    def test_company_rows_beyond_parameter_limit(self, csv_path):
+        store = mission_store.load_store(csv_path)
+        companies = [f"Company {i}" for i in range(mission_store._PARAM_LIMIT * 2)] + ["RVSN USSR"]
+        rows = store.company_rows(companies)
+        assert rows["missions"].iloc[-1] == 1777
+        assert rows["missions"].iloc[:-1].sum() == 0
+
+    def test_close_closes_every_thread(self, csv_path):
+        store = mission_store.load_store(csv_path)
+        # The barrier keeps all three threads alive, so none reuses another's thread id.
+        barrier = threading.Barrier(3)
+        workers = [_Worker(lambda: (store.missions_in_year(2020), barrier.wait())[0]) for _ in range(3)]
+        for worker in workers:
+            worker.join()
+        connections = list(store._connections.values())
+        assert len(connections) == 3
+        store.close()
+        for conn in connections:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+        assert store.missions_in_year(2020) == workers[0].result
@@ -0,0 +1,114 @@
+"""
+Tests for mission_timing.py: runs, stages, spans and the JSON log.
+"""
+
+import json
+import logging
+import threading
+
+import pytest
+
+import mission_timing
+import space_missions
+
+logger = logging.getLogger("mission_timing")
+
+
+@pytest.fixture
+def timing(monkeypatch):
+    monkeypatch.setattr(mission_timing, "_enabled", True)
+    mission_timing.clear_history()
+    yield mission_timing
+    mission_timing.clear_history()
+
+
+class TestDisabled:
+    def test_no_ops(self):
+        assert not mission_timing.enabled()
+        run = mission_timing.start_run()
+        run.stage("load")
+        with mission_timing.span("block"):
+            pass
+        assert run.finish() is None
+        assert mission_timing.start_run() is run
+        assert mission_timing.history() == []
+
+    def test_timed_passes_through(self):
+        assert space_missions.getMissionCountByCompany("RVSN USSR") == 1777
+        assert space_missions.getMissionCountByCompany.__name__ == "getMissionCountByCompany"
+
+
+class TestRuns:
+    def test_stages_and_spans(self, timing):
+        run = timing.start_run("app")
+        run.stage("load")
+        space_missions.get_index()
+        run.stage("query")
+        with timing.span("outer"):
+            space_missions.getSuccessRate("NASA")
+        record = run.finish()
+        assert [stage["name"] for stage in record["stages"]] == ["load", "query"]
+        spans = {span["name"]: span for span in record["spans"]}
+        assert spans["getSuccessRate"]["stage"] == "query"
+        assert spans["getSuccessRate"]["depth"] == 1
+        assert spans["outer"]["depth"] == 0
+        assert record["total_ms"] >= sum(stage["ms"] for stage in record["stages"])
+        assert timing.history() == [record]
+
+    def test_history_is_bounded(self, timing):
+        for i in range(timing.RUNS + 5):
+            timing.start_run(f"run{i}").finish()
+        names = [record["run"] for record in timing.history()]
+        assert len(names) == timing.RUNS
+        assert names[-1] == f"run{timing.RUNS + 4}"
+
+    def test_tables(self, timing):
+        for _ in range(2):
+            run = timing.start_run()
+            run.stage("query")
+            space_missions.getMissionsByYear(2020)
+            space_missions.getMissionsByYear(2021)
+            record = run.finish()
+        stages = timing.stage_table()
+        assert len(stages) == 2
+        assert list(stages.columns) == ["started", "total", "query"]
+        calls = timing.span_table(record)
+        assert calls.iloc[0][["stage", "name", "calls"]].tolist() == ["query", "getMissionsByYear", 2]
+
+    def test_runs_are_per_thread(self, timing):
+        run = timing.start_run()
+        thread = threading.Thread(target=space_missions.getMostUsedRocket)
+        thread.start()
+        thread.join()
+        assert run.finish()["spans"] == []
+
+
+class TestLog:
+    def test_run_logged_as_json(self, timing, caplog):
+        caplog.set_level(logging.INFO, logger="mission_timing")
+        propagate, logger.propagate = logger.propagate, True
+        try:
+            run = timing.start_run("app")
+            run.stage("load")
+            run.finish()
+            space_missions.getMostUsedRocket()
+        finally:
+            logger.propagate = propagate
+        run_record, span_record = [json.loads(message) for message in caplog.messages]
+        assert run_record["run"] == "app"
+        assert run_record["stages"][0]["name"] == "load"
+        assert span_record["span"] == "getMostUsedRocket"
+
+    def test_log_file(self, timing, tmp_path):
+        path = tmp_path / "timing.jsonl"
+        handlers = list(logger.handlers)
+        timing.enable(log_path=str(path))
+        try:
+            timing.start_run("app").finish()
+        finally:
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+                handler.close()
+            for handler in handlers:
+                logger.addHandler(handler)
+        assert json.loads(path.read_text().splitlines()[0])["run"] == "app"
@@ -3,7 +3,11 @@ Tests for space_missions.py grading functions.
 Covers: return types, expected outputs, edge cases, and input validation.
 """
 
+import os
+
+import pandas as pd
 import pytest
+import space_missions
 from space_missions import (
     getMissionCountByCompany,
     getSuccessRate,
@@ -15,6 +19,9 @@ from space_missions import (
     getAverageMissionsPerYear,
 )
 
+# Every test runs against both the in-memory and the SQLite backend.
+pytestmark = pytest.mark.usefixtures("backend")
+
 
 # ============================================================
 # Function 1: getMissionCountByCompany
@@ -274,3 +281,373 @@ class TestGetAverageMissionsPerYear:
 
     def test_invalid_type_float(self):
         assert getAverageMissionsPerYear(2010.5, 2020.5) == 0.0
+
+
+# ============================================================
+# Dataset cache
+# ============================================================
+_CSV_HEADER = "Company,Location,Date,Time,Rocket,Mission,RocketStatus,Price,MissionStatus\n"
+
+
+@pytest.fixture
+def small_dataset(tmp_path, monkeypatch):
+    path = tmp_path / "missions.csv"
+    path.write_text(
+        _CSV_HEADER
+        + 'Acme,"Pad 1, Somewhere",2001-01-01,10:00:00,Rocket A,M1,Active,,Success\n'
+        + 'Acme,"Pad 1, Somewhere",2001-06-01,10:00:00,Rocket A,M2,Active,,Failure\n'
+    )
+    dataset = space_missions.MissionDataset(str(path))
+    monkeypatch.setattr(space_missions, "_DATASET", dataset)
+    return path
+
+
+class TestDatasetCache:
+    def test_frame_is_reused(self):
+        assert space_missions._load_data() is space_missions._load_data()
+
+    def test_results_unchanged_across_calls(self):
+        assert getMissionCountByCompany("RVSN USSR") == 1777
+        assert getMissionCountByCompany("RVSN USSR") == 1777
+
+    def test_edit_invalidates_cache(self, small_dataset):
+        assert getMissionCountByCompany("Acme") == 2
+        with open(small_dataset, "a") as fh:
+            fh.write('Acme,"Pad 1, Somewhere",2002-01-01,10:00:00,Rocket B,M3,Active,,Success\n')
+        assert getMissionCountByCompany("Acme") == 3
+
+    def test_reload_returns_fresh_frame(self, small_dataset):
+        first = space_missions._load_data()
+        assert space_missions.reload() is not first
+        assert len(space_missions._load_data()) == 2
+
+    def test_clear_cache(self, small_dataset):
+        first = space_missions._load_data()
+        space_missions.clear_cache()
+        assert space_missions._load_data() is not first
+
+    def test_missing_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(space_missions, "_DATASET", space_missions.MissionDataset(str(tmp_path / "nope.csv")))
+        assert getMissionCountByCompany("Acme") == 0
+        assert getMissionsByYear(2001) == 0
+
+    def test_set_data_path(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(space_missions, "_DATASET", space_missions._DATASET)
+        path = tmp_path / "missions.csv"
+        path.write_text(_CSV_HEADER + 'Acme,"Pad 1, Somewhere",2001-01-01,,Rocket A,M1,Active,,Success\n')
+        space_missions.set_data_path(str(path))
+        assert getMissionCountByCompany("Acme") == 1
+
+
+# ============================================================
+# Aggregate index
+# ============================================================
+class TestMissionIndex:
+    def test_year_bounds(self):
+        index = space_missions.get_index()
+        assert index.first_year == 1957
+        assert index.missions_in_year(1957) == 3
+
+    def test_range_sum_matches_per_year(self):
+        index = space_missions.get_index()
+        expected = sum(getMissionsByYear(y) for y in range(1990, 2001))
+        assert index.missions_between(1990, 2000) == expected
+
+    def test_range_sum_clamps_to_data(self):
+        index = space_missions.get_index()
+        total = sum(count for count, _ in index.company_counts.values())
+        assert index.missions_between(1900, 3000) == total
+        assert index.missions_between(1900, 1950) == 0
+        assert index.missions_between(2990, 3000) == 0
+
+    def test_company_counts(self):
+        total, successes = space_missions.get_index().company_counts["RVSN USSR"]
+        assert total == 1777
+        assert 0 < successes <= total
+
+    def test_rocket_counts(self):
+        index = space_missions.get_index()
+        assert max(index.rocket_counts.values()) == index.rocket_counts[getMostUsedRocket()]
+
+
+# ============================================================
+# Date index
+# ============================================================
+class TestDateIndex:
+    def test_ties_keep_file_order(self, small_dataset):
+        with open(small_dataset, "a") as fh:
+            fh.write('Acme,"Pad 1, Somewhere",2001-06-01,09:00:00,Rocket B,M0,Active,,Success\n')
+        assert getMissionsByDateRange("2001-01-01", "2001-12-31") == ["M1", "M2", "M0"]
+
+    def test_out_of_order_tail_ties_keep_file_order(self, small_dataset):
+        getMissionsByDateRange("2001-01-01", "2001-12-31")
+        with open(small_dataset, "a") as fh:
+            fh.write('Acme,"Pad 1, Somewhere",2001-01-01,09:00:00,Rocket B,M0,Active,,Success\n')
+        assert getMissionsByDateRange("2001-01-01", "2001-12-31") == ["M1", "M0", "M2"]
+
+    def test_matches_stable_scan_of_csv(self):
+        df = pd.read_csv(space_missions._DATA_PATH)
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+        ranges = [("1957-01-01", "2022-12-31")] + [(f"{year}-01-01", f"{year}-12-31") for year in range(1957, 2023)]
+        for start, end in ranges:
+            selected = df[(df["Date"] >= pd.Timestamp(start)) & (df["Date"] <= pd.Timestamp(end))]
+            expected = selected.sort_values("Date", kind="stable")["Mission"].tolist()
+            assert getMissionsByDateRange(start, end) == expected
+            assert list(space_missions.iterMissionsByDateRange(start, end, chunk_size=64)) == expected
+        assert space_missions.getMissionsByDateRanges(ranges) == [getMissionsByDateRange(*r) for r in ranges]
+
+    def test_iterator_matches_list(self):
+        expected = getMissionsByDateRange("1960-01-01", "1975-12-31")
+        assert list(space_missions.iterMissionsByDateRange("1960-01-01", "1975-12-31", chunk_size=50)) == expected
+
+    def test_iterator_invalid_range(self):
+        assert list(space_missions.iterMissionsByDateRange("2020-12-31", "2020-01-01")) == []
+        assert list(space_missions.iterMissionsByDateRange(None, "2020-01-01")) == []
+
+    def test_full_range_covers_dated_rows(self):
+        result = getMissionsByDateRange("1900-01-01", "2100-01-01")
+        assert len(result) == len(space_missions.get_index().by_date)
+
+
+# ============================================================
+# Batch variants
+# ============================================================
+class TestBatchFunctions:
+    COMPANIES = ["RVSN USSR", "NASA", "SpaceX", "NonExistentCompany", "", "nasa", None, 123, "NASA"]
+
+    def test_mission_counts_match_scalar(self):
+        expected = [getMissionCountByCompany(c) for c in self.COMPANIES]
+        assert space_missions.getMissionCountsByCompany(self.COMPANIES) == expected
+
+    def test_success_rates_match_scalar(self):
+        result = space_missions.getSuccessRates(self.COMPANIES)
+        assert result == [getSuccessRate(c) for c in self.COMPANIES]
+        assert all(isinstance(rate, float) for rate in result)
+
+    def test_missions_by_years_match_scalar(self):
+        years = [1957, 1900, 3000, 2020, "2020", 2020.5, None]
+        result = space_missions.getMissionsByYears(years)
+        assert result == [getMissionsByYear(y) for y in years]
+        assert all(isinstance(count, int) for count in result)
+
+    def test_date_ranges_match_scalar(self):
+        ranges = [
+            ("1957-10-01", "1957-12-31"),
+            ("1957-10-04", "1957-10-04"),
+            ("2020-12-31", "2020-01-01"),
+            ("abc", "xyz"),
+            (None, None),
+            ("1990-01-01", "1995-06-30"),
+        ]
+        assert space_missions.getMissionsByDateRanges(ranges) == [getMissionsByDateRange(*r) for r in ranges]
+
+    def test_malformed_date_range_entries(self):
+        ranges = [None, ("2020-01-01",), ("1957-10-01", "1957-12-31", "x"), 5, "ab", ("1957-10-04", "1957-10-04")]
+        assert space_missions.getMissionsByDateRanges(ranges) == [[], [], [], [], [], ["Sputnik-1"]]
+
+    @pytest.mark.parametrize("batch", [None, 5, "NASA", b"NASA"])
+    def test_non_batch_argument_is_empty(self, batch):
+        assert space_missions.getMissionCountsByCompany(batch) == []
+        assert space_missions.getSuccessRates(batch) == []
+        assert space_missions.getMissionsByYears(batch) == []
+        assert space_missions.getMissionsByDateRanges(batch) == []
+
+    def test_generator_batches(self):
+        assert space_missions.getMissionCountsByCompany(c for c in ["NASA"]) == [getMissionCountByCompany("NASA")]
+        assert space_missions.getMissionsByYears(y for y in [2020]) == [getMissionsByYear(2020)]
+
+    def test_empty_batches(self):
+        assert space_missions.getMissionCountsByCompany([]) == []
+        assert space_missions.getSuccessRates([]) == []
+        assert space_missions.getMissionsByYears([]) == []
+        assert space_missions.getMissionsByDateRanges([]) == []
+
+
+# ============================================================
+# Chunked ingestion
+# ============================================================
+@pytest.fixture
+def chunked_dataset(monkeypatch):
+    monkeypatch.setattr(space_missions, "_DATASET", space_missions.MissionDataset(space_missions._DATA_PATH, chunk_size=97))
+
+
+class TestChunkedIngestion:
+    def test_index_matches_in_memory(self, chunked_dataset):
+        chunked = space_missions.get_index()
+        full = space_missions.MissionIndex(space_missions.mission_data.read_csv(space_missions._DATA_PATH))
+        assert chunked.company_counts == full.company_counts
+        assert chunked.rocket_counts == full.rocket_counts
+        assert list(chunked.status_counts.items()) == list(full.status_counts.items())
+        assert chunked.top_companies == full.top_companies
+        assert (chunked.first_year, chunked.last_year) == (full.first_year, full.last_year)
+        assert chunked.year_counts.tolist() == full.year_counts.tolist()
+        assert chunked.missions_by_date.tolist() == full.missions_by_date.tolist()
+
+    def test_functions_match_in_memory(self, chunked_dataset):
+        chunked = [
+            getMissionCountByCompany("RVSN USSR"),
+            getSuccessRate("NASA"),
+            getMissionsByDateRange("1960-01-01", "1961-12-31"),
+            getTopCompaniesByMissionCount(5),
+            getMissionStatusCount(),
+            getMissionsByYear(1957),
+            getMostUsedRocket(),
+            getAverageMissionsPerYear(2000, 2010),
+        ]
+        space_missions.set_data_path(space_missions._DATA_PATH)
+        assert chunked == [
+            getMissionCountByCompany("RVSN USSR"),
+            getSuccessRate("NASA"),
+            getMissionsByDateRange("1960-01-01", "1961-12-31"),
+            getTopCompaniesByMissionCount(5),
+            getMissionStatusCount(),
+            getMissionsByYear(1957),
+            getMostUsedRocket(),
+            getAverageMissionsPerYear(2000, 2010),
+        ]
+
+    def test_full_frame_not_kept(self, chunked_dataset):
+        with pytest.raises(RuntimeError):
+            space_missions._load_data()
+
+    def test_missing_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(space_missions, "_DATASET", space_missions.MissionDataset(str(tmp_path / "nope.csv"), 10))
+        assert getMostUsedRocket() == ""
+
+
+class TestIncrementalAppend:
+    def test_only_tail_is_parsed(self, small_dataset, monkeypatch):
+        assert getMissionCountByCompany("Acme") == 2
+        space_missions.get_index()
+        loads = []
+        monkeypatch.setattr(space_missions.mission_data, "load_table", lambda path: loads.append(path))
+        with open(small_dataset, "a") as fh:
+            fh.write('Acme,"Pad 1, Somewhere",2002-01-01,10:00:00,Rocket B,M3,Active,,Success\n')
+        assert getMissionCountByCompany("Acme") == 3
+        assert getSuccessRate("Acme") == 66.67
+        assert getMissionsByYear(2002) == 1
+        assert space_missions.get_index().company_counts["Acme"] == (3, 2)
+        assert loads == []
+        assert space_missions.get_dataset().rows == 3
+
+    @pytest.mark.parametrize("chunk_size", [None, 97])
+    def test_matches_full_load(self, growing_csv, monkeypatch, chunk_size):
+        growing_csv.write(3000)
+        path, rest = growing_csv.path, growing_csv.rows[3000:]
+        dataset = space_missions.MissionDataset(path, chunk_size)
+        monkeypatch.setattr(space_missions, "_DATASET", dataset)
+        get_index = space_missions.get_index
+        get_index()
+        # Out-of-order dates in the second tail force a re-sort of the date index.
+        for part in (rest[:500], rest[500:][::-1]):
+            growing_csv.append(part)
+            get_index()
+        appended = get_index()
+        full = space_missions.MissionIndex(space_missions.mission_data.read_csv(path))
+        assert dataset.version == 3
+        assert appended.company_counts == full.company_counts
+        assert appended.rocket_counts == full.rocket_counts
+        assert list(appended.status_counts.items()) == list(full.status_counts.items())
+        assert appended.year_counts.tolist() == full.year_counts.tolist()
+        assert appended.missions_by_date.tolist() == full.missions_by_date.tolist()
+        if chunk_size is None:
+            pd.testing.assert_frame_equal(dataset.frame, space_missions.mission_data.read_csv(str(path)))
+
+    def test_shrunk_file_is_reloaded(self, small_dataset):
+        assert getMissionCountByCompany("Acme") == 2
+        small_dataset.write_text(_CSV_HEADER + 'Acme,"Pad 1",2001-01-01,10:00:00,Rocket A,M1,Active,,Success\n')
+        assert getMissionCountByCompany("Acme") == 1
+
+    def test_edited_prefix_is_reloaded(self, small_dataset):
+        assert getMissionCountByCompany("Acme") == 2
+        text = small_dataset.read_text().replace("Acme,", "Apex,", 1)
+        small_dataset.write_text(text + 'Acme,"Pad 1",2003-01-01,10:00:00,Rocket A,M3,Active,,Success\n')
+        assert getMissionCountByCompany("Acme") == 2
+        assert getMissionCountByCompany("Apex") == 1
+
+    def test_extended_last_line_is_reloaded(self, small_dataset):
+        small_dataset.write_text(small_dataset.read_text().rstrip("\n").replace(",Failure", ",Fail"))
+        assert getMissionStatusCount() == {"Success": 1, "Fail": 1}
+        with open(small_dataset, "a") as fh:
+            fh.write("ure\n")
+        assert getMissionStatusCount() == {"Success": 1, "Failure": 1}
+
+    def test_appended_since(self, small_dataset):
+        dataset = space_missions.get_dataset()
+        dataset.index
+        version = dataset.version
+        assert dataset.appended_since(version) == []
+        with open(small_dataset, "a") as fh:
+            fh.write('Acme,"Pad 1",2002-01-01,10:00:00,Rocket B,M3,Active,,Success\n')
+        tails = dataset.appended_since(version)
+        assert [tail["Mission"].tolist() for tail in tails] == [["M3"]]
+        assert tails[0].index.tolist() == [2]
+        dataset.reload()
+        assert dataset.appended_since(version) is None
+
+    def test_changes_since(self, small_dataset):
+        dataset = space_missions.get_dataset()
+        dataset.index
+        version = dataset.version
+        assert dataset.changes_since(version) == (version, [])
+        with open(small_dataset, "a") as fh:
+            fh.write('Acme,"Pad 1",2002-01-01,10:00:00,Rocket B,M3,Active,,Success\n')
+        new_version, tails = dataset.changes_since(version)
+        assert new_version == dataset.version == version + 1
+        assert [tail["Mission"].tolist() for tail in tails] == [["M3"]]
+        assert dataset.changes_since(None) == (new_version, None)
+
+
+class TestMultiFileIngestion:
+    @pytest.mark.parametrize("chunk_size, workers", [(None, 1), (None, 2), (97, 2)])
+    def test_matches_single_file(self, split_csv, monkeypatch, chunk_size, workers):
+        source = split_csv(7)
+        dataset = space_missions.MissionDataset(str(source), chunk_size, workers)
+        monkeypatch.setattr(space_missions, "_DATASET", dataset)
+        merged = space_missions.get_index()
+        full = space_missions.MissionIndex(space_missions.mission_data.read_csv(space_missions._DATA_PATH))
+        assert dataset.rows == 4630
+        assert merged.company_counts == full.company_counts
+        assert merged.rocket_counts == full.rocket_counts
+        assert list(merged.status_counts.items()) == list(full.status_counts.items())
+        assert merged.year_counts.tolist() == full.year_counts.tolist()
+        assert merged.missions_by_date.tolist() == full.missions_by_date.tolist()
+        if chunk_size is None:
+            frame = space_missions._load_data()
+            pd.testing.assert_frame_equal(frame, space_missions.mission_data.read_csv(space_missions._DATA_PATH))
+
+    def test_glob_and_new_file(self, split_csv, monkeypatch):
+        source = split_csv(3)
+        monkeypatch.setattr(space_missions, "_DATASET", space_missions.MissionDataset(str(source / "*.csv"), workers=1))
+        before = getMissionCountByCompany("Acme")
+        (source / "missions_new.csv").write_text(
+            _CSV_HEADER + 'Acme,"Pad 1",2030-01-01,10:00:00,Rocket A,M1,Active,,Success\n'
+        )
+        assert getMissionCountByCompany("Acme") == before + 1
+        assert getMissionsByYear(2030) == 1
+
+    def test_empty_directory(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(space_missions, "_DATASET", space_missions.MissionDataset(str(tmp_path)))
+        assert getMissionStatusCount() == {}
+        assert space_missions._load_data().empty
+
+
+class TestSharedDataset:
+    def test_matches_private_frame(self, csv_path, monkeypatch):
+        dataset = space_missions.MissionDataset(csv_path, shared=True)
+        monkeypatch.setattr(space_missions, "_DATASET", dataset)
+        pd.testing.assert_frame_equal(dataset.frame, space_missions.mission_data.read_csv(csv_path))
+        assert os.path.exists(space_missions.mission_mmap.mapped_path(csv_path))
+        assert getMissionCountByCompany("RVSN USSR") == 1777
+        assert getMissionsByDateRange("1957-10-01", "1957-12-31") == ["Sputnik-1", "Sputnik-2", "Vanguard TV3"]
+
+    def test_append_reexports(self, small_dataset, monkeypatch):
+        dataset = space_missions.MissionDataset(str(small_dataset), shared=True)
+        monkeypatch.setattr(space_missions, "_DATASET", dataset)
+        assert getMissionCountByCompany("Acme") == 2
+        with open(small_dataset, "a") as fh:
+            fh.write('Acme,"Pad 1",2002-01-01,10:00:00,Rocket B,M3,Active,,Success\n')
+        assert getMissionCountByCompany("Acme") == 3
+        assert dataset.frame["Mission"].tolist() == ["M1", "M2", "M3"]
+        assert dataset.appended_since(dataset.version - 1) is None
+        assert space_missions.mission_mmap.attach(str(small_dataset)) is not None
@@ -0,0 +1,83 @@
+"""
+Tests for synthetic_missions.py: schema, reproducibility, chunking and fitted distributions.
+"""
+
+import pandas as pd
+import pytest
+
+import mission_data
+from space_missions import _DATA_PATH
+from synthetic_missions import MissionModel, write_csv, write_parquet
+
+
+@pytest.fixture(scope="module")
+def model():
+    return MissionModel.fit(_DATA_PATH)
+
+
+@pytest.fixture(scope="module")
+def source():
+    return mission_data.read_csv(_DATA_PATH)
+
+
+@pytest.fixture(scope="module")
+def generated(model, tmp_path_factory):
+    path = tmp_path_factory.mktemp("synthetic") / "missions.csv"
+    write_csv(str(path), 100_000, seed=0, chunk_size=25_000, model=model)
+    return mission_data.read_csv(str(path))
+
+
+class TestGenerate:
+    def test_chunks_are_bounded(self, model):
+        sizes = [len(chunk) for chunk in model.generate(10_000, seed=1, chunk_size=700)]
+        assert max(sizes) <= 700
+        assert sum(sizes) == 10_000
+
+    def test_same_seed_same_rows(self, model):
+        first = pd.concat(model.generate(2_000, seed=7, chunk_size=500))
+        second = pd.concat(model.generate(2_000, seed=7, chunk_size=500))
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_different_seed_differs(self, model):
+        first = pd.concat(model.generate(2_000, seed=1))
+        second = pd.concat(model.generate(2_000, seed=2))
+        assert not first.equals(second)
+
+    def test_columns_and_date_order(self, model):
+        rows = pd.concat(model.generate(5_000, seed=3, chunk_size=999))
+        assert list(rows.columns) == mission_data.COLUMNS
+        assert rows["Date"].is_monotonic_increasing
+        assert rows["Mission"].is_unique
+
+
+class TestDistributions:
+    def test_loads_through_normal_path(self, generated, source):
+        assert len(generated) == 100_000
+        assert list(generated.columns) == list(source.columns)
+        assert generated["Date"].notna().all()
+
+    @pytest.mark.parametrize("column", ["Company", "Rocket", "Location", "MissionStatus", "RocketStatus"])
+    def test_marginals_close_to_source(self, generated, source, column):
+        real = source[column].astype("str").value_counts(normalize=True)
+        synthetic = generated[column].astype("str").value_counts(normalize=True)
+        assert set(synthetic.index) <= set(real.index)
+        diff = real.subtract(synthetic, fill_value=0).abs().sum() / 2
+        assert diff < 0.03
+
+    def test_launches_per_year_close_to_source(self, generated, source):
+        real = source["Date"].dt.year.value_counts(normalize=True)
+        synthetic = generated["Date"].dt.year.value_counts(normalize=True)
+        assert real.subtract(synthetic, fill_value=0).abs().sum() / 2 < 0.03
+
+    def test_missing_prices_kept(self, generated, source):
+        assert abs(generated["Price"].isna().mean() - source["Price"].isna().mean()) < 0.02
+
+
+def test_parquet_output(model, tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "missions.parquet"
+    write_parquet(str(path), 3_000, seed=0, chunk_size=1_000, model=model)
+    df = pd.read_parquet(path)
+    assert len(df) == 3_000
+    assert df["Price"].dtype == "float64"
+    assert pd.api.types.is_datetime64_dtype(df["Date"])